@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: blocking RPCClient vs AsyncRPCClient.
+
+Runs N eth_getBalance calls against a local stand-in JSON-RPC server that adds a
+fixed latency to every response, and reports calls per second for each client.
+
+Usage: python benchmarks/bench_async_rpc.py [--calls 500] [--latency 0.02] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.async_rpc_client import AsyncRPCClient
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+
+ADDRESS = '0x1234567890123456789012345678901234567890'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    wbufsize = 65536  # Send headers and body in one segment (avoids Nagle/delayed-ACK stalls)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.server.latency)
+        results = {'eth_chainId': '0xaa36a7', 'eth_getBalance': '0x1bc16d674ec80000'}
+        data = json.dumps({"jsonrpc": "2.0", "id": request['id'], "result": results.get(request['method'])}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Must be set before listen() or concurrent connects get dropped
+
+
+def bench_sync(url: str, calls: int) -> float:
+    # Measure the transport, not the throttle
+    client = RPCClient(rpc_url=url, chain_id=11155111, rate_limiter=NullRateLimiter())
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.get_balance(ADDRESS, 'wei')
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def bench_async(url: str, calls: int, concurrency: int) -> float:
+    async def run():
+        async with AsyncRPCClient(rpc_url=url, chain_id=11155111, max_concurrency=concurrency,
+                                  rate_limiter=NullRateLimiter()) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(client.get_balance(ADDRESS, 'wei') for _ in range(calls)))
+            return time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RPCClient vs AsyncRPCClient throughput")
+    parser.add_argument("--calls", type=int, default=500, help="Number of eth_getBalance calls")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in server latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=100, help="AsyncRPCClient max_concurrency")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    server.latency = args.latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    sync_elapsed = bench_sync(url, args.calls)
+    async_elapsed = bench_async(url, args.calls, args.concurrency)
+    server.shutdown()
+
+    print(f"{'client':<16}{'calls':>8}{'seconds':>10}{'calls/s':>10}")
+    print(f"{'RPCClient':<16}{args.calls:>8}{sync_elapsed:>10.2f}{args.calls / sync_elapsed:>10.1f}")
+    print(f"{'AsyncRPCClient':<16}{args.calls:>8}{async_elapsed:>10.2f}{args.calls / async_elapsed:>10.1f}")
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
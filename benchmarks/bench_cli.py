@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark: every ./cli subcommand, each run in a fresh interpreter
+against the mock node and a mock Etherscan API, in a throwaway wallet directory.
+
+For each command it reports wall time and where it went (interpreter startup,
+imports, JSON-RPC round trips, Etherscan, key derivation and signing, and the
+rest of the CLI), the JSON-RPC calls and round trips sent, Etherscan requests
+and peak RSS. Wallet commands are timed at every --wallets count and history
+commands at every --history size, giving scaling curves; the other commands run
+at the first of each.
+
+Results are written as JSON (by default to benchmarks/results/<commit>.json), so
+two commits can be compared:
+
+Usage: python benchmarks/bench_cli.py [--wallets 1 10 50] [--history 10 1000] [--repeat 3] [--latency 0]
+           [--commands balance send ...] [--output results.json] [--compare benchmarks/results/<commit>.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import secrets
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+PASSWORD = "Bench1234!"
+SENDER_KEY = "42" * 32
+RECIPIENT = "0x0987654321098765432109876543210987654321"
+
+# Command name, argv template and the scale it is timed over ('wallets', 'history' or None).
+# Wallet-creating commands run last, so the others see exactly --wallets wallets.
+COMMANDS = [
+    ('wallet list', ['wallet', 'list'], 'wallets'),
+    ('wallet show', ['wallet', 'show', '--address', '{sender}'], 'wallets'),
+    ('wallet use', ['wallet', 'use', '--address', '{sender}'], 'wallets'),
+    ('balance', ['balance', '--address', '{sender}'], None),
+    ('send', ['send', '--to', RECIPIENT, '--amount', '0.001', '--from', '{sender}', '--password', PASSWORD], None),
+    ('tx status', ['tx', 'status', '--hash', '{tx_hash}'], None),
+    ('tx history', ['tx', 'history', '--address', '{sender}'], 'history'),
+    ('tx export', ['tx', 'export', '--address', '{sender}', '--output', 'bench.json'], 'history'),
+    ('wallet generate', ['wallet', 'generate', '--password', PASSWORD], 'wallets'),
+    ('wallet import', ['wallet', 'import', '--private-key', '{new_key}', '--password', PASSWORD], 'wallets'),
+]
+
+PHASES = ('startup', 'import', 'rpc', 'etherscan', 'crypto', 'other')
+
+
+def use_workspace(workspace: Path, *modules) -> None:
+    """Point the wallet and export directories of the given wallet/transaction modules into a workspace."""
+    for module in modules:
+        if hasattr(module, 'WALLET_DIR'):
+            module.WALLET_DIR = workspace / 'wallets'
+            module.DEFAULT_WALLET_FILE = workspace / 'wallets' / 'default.txt'
+        if hasattr(module, 'EXPORT_PATH'):
+            module.EXPORT_PATH = workspace / 'exports'
+
+
+# ---------------------------------------------------------------------------
+# Child: one CLI command in this interpreter, reporting its phases to BENCH_CLI_REPORT
+# ---------------------------------------------------------------------------
+
+def _timed(function, timers: dict, phase: str):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timers[phase] += time.perf_counter() - start
+    return wrapper
+
+
+def run_child(argv: list) -> None:
+    start = time.perf_counter()
+    # Same module layout as ./cli: src on the path, then the src package
+    sys.path.insert(0, os.path.join(project_root, 'src'))
+    from src import main as cli
+    imported = time.perf_counter()
+
+    import resource
+    import requests
+    import transaction as cli_transaction
+    import wallet as cli_wallet
+    from src import transaction as src_transaction, transports, wallet as src_wallet
+    from src.call_budget import command_usage
+    from src.metrics import current_command
+
+    use_workspace(Path(os.environ['BENCH_CLI_WORKSPACE']), cli_wallet, src_wallet, cli_transaction, src_transaction)
+    timers = {'rpc': 0.0, 'etherscan': 0.0, 'crypto': 0.0}
+    for transport in (transports.HTTPTransport, transports._SocketTransport):
+        transport.send = _timed(transport.send, timers, 'rpc')
+    requests.get = _timed(requests.get, timers, 'etherscan')
+    for manager in (cli_wallet.WalletManager, src_wallet.WalletManager):
+        for name in ('_encrypt_private_key', '_decrypt_private_key', '_private_key_to_address'):
+            setattr(manager, name, _timed(getattr(manager, name), timers, 'crypto'))
+    for manager in (cli_transaction.TransactionManager, src_transaction.TransactionManager):
+        manager._sign_transaction = _timed(manager._sign_transaction, timers, 'crypto')
+
+    sys.argv = ['cli'] + argv
+    exit_code = 0
+    try:
+        cli.run()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    finished = time.perf_counter()
+
+    usage = command_usage(current_command())
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report = {
+        'exit_code': exit_code,
+        'child_s': finished - start,
+        'import_s': imported - start,
+        'command_s': finished - imported,
+        **{f"{phase}_s": seconds for phase, seconds in timers.items()},
+        'rpc_calls': usage.total_calls,
+        'round_trips': usage.round_trips,
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        'peak_rss_kb': peak_rss // 1024 if sys.platform == 'darwin' else peak_rss
+    }
+    with open(os.environ['BENCH_CLI_REPORT'], 'w') as f:
+        json.dump(report, f)
+
+
+# ---------------------------------------------------------------------------
+# Parent: mock servers, workspaces, scale points and results
+# ---------------------------------------------------------------------------
+
+def run_command(argv: list, env: dict) -> dict:
+    """Run one CLI command in a child interpreter and return its report plus wall and startup time."""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as report_file:
+        report_path = report_file.name
+    try:
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', *argv],
+                                 env=dict(env, BENCH_CLI_REPORT=report_path), capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        with open(report_path) as f:
+            report = json.load(f) if os.path.getsize(report_path) else None
+    finally:
+        os.unlink(report_path)
+    if report is None or report['exit_code']:
+        output = (process.stdout + process.stderr).strip().splitlines()[-5:]
+        raise RuntimeError(f"'{' '.join(argv)}' failed: " + ' | '.join(output))
+    report['wall_s'] = wall
+    report['startup_s'] = wall - report['child_s']
+    report['other_s'] = report['command_s'] - report['rpc_s'] - report['etherscan_s'] - report['crypto_s']
+    return report
+
+
+def summarize(name: str, wallets: int, history: int, reports: list, etherscan_requests: int) -> dict:
+    def median(key):
+        return statistics.median(report[key] for report in reports)
+    return {
+        'command': name,
+        'wallets': wallets,
+        'history': history,
+        'runs': len(reports),
+        'wall_s': median('wall_s'),
+        'wall_samples': [report['wall_s'] for report in reports],
+        'phases': {phase: median(f"{phase}_s") for phase in PHASES},
+        'rpc_calls': reports[-1]['rpc_calls'],
+        'round_trips': reports[-1]['round_trips'],
+        'etherscan_requests': etherscan_requests // len(reports),
+        'peak_rss_kb': max(report['peak_rss_kb'] for report in reports)
+    }
+
+
+def prepare_workspace(workspace: Path, wallets: int, node, sender: str) -> str:
+    """Import `wallets` wallets (the funded sender first) and mine a transaction for tx status; returns its hash."""
+    from eth_account import Account
+    from src import wallet as src_wallet
+
+    (workspace / 'wallets').mkdir(parents=True)
+    use_workspace(workspace, src_wallet)
+    manager = src_wallet.WalletManager()
+    for index in range(wallets):
+        manager.import_wallet(SENDER_KEY if index == 0 else f"{index:064x}", PASSWORD)
+    signed = Account.sign_transaction({
+        'nonce': node.chain.nonce(sender, pending=True), 'gasPrice': node.chain.gas_price, 'gas': 21000,
+        'to': RECIPIENT, 'value': 1, 'data': b'', 'chainId': node.chain.chain_id
+    }, "0x" + SENDER_KEY)
+    return node.chain.submit(signed.raw_transaction)
+
+
+def git_commit() -> tuple:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=project_root,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def compare(results: list, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r['command'], r['wallets'], r['history']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path} ({baseline['commit']}{', dirty' if baseline.get('dirty') else ''}):")
+    print(f"{'command':<16} {'wallets':>7} {'history':>7} {'before':>9} {'after':>9} {'change':>8} {'rpc calls':>10}")
+    for result in results:
+        old = before.get((result['command'], result['wallets'], result['history']))
+        if old is None:
+            continue
+        change = (result['wall_s'] - old['wall_s']) / old['wall_s'] * 100
+        calls = f"{old['rpc_calls']} -> {result['rpc_calls']}" if old['rpc_calls'] != result['rpc_calls'] \
+            else str(result['rpc_calls'])
+        print(f"{result['command']:<16} {result['wallets']:>7} {result['history']:>7} {old['wall_s'] * 1000:>7.1f}ms "
+              f"{result['wall_s'] * 1000:>7.1f}ms {change:>+7.1f}% {calls:>10}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        return run_child(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Time every CLI command end to end against local mock servers")
+    parser.add_argument("--wallets", type=int, nargs='+', default=[1, 10, 50], help="Wallet counts to time")
+    parser.add_argument("--history", type=int, nargs='+', default=[10, 1000], help="Transaction history sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command and scale point (median reported)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock node and Etherscan latency in seconds")
+    parser.add_argument("--commands", nargs='+', help="Only these commands, e.g. balance 'tx history'")
+    parser.add_argument("--output", help="Results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    args = parser.parse_args()
+
+    from eth_account import Account
+    from src.mock_node import MockEtherscan, MockNode
+
+    logging.disable(logging.WARNING)
+    commit, dirty = git_commit()
+    sender = Account.from_key(SENDER_KEY).address
+    commands = [command for command in COMMANDS if not args.commands or command[0] in args.commands]
+    results = []
+    with MockNode(accounts={sender: 10 ** 21}, latency=args.latency) as node, \
+            MockEtherscan(chain=node.chain, latency=args.latency) as etherscan, \
+            tempfile.TemporaryDirectory() as tmp:
+        base_env = dict(os.environ, RPC_URL=node.url, ETHERSCAN_API_URL=etherscan.url, ETHERSCAN_API_KEY='bench')
+        base_env.pop('RPC_CASSETTE', None)
+        for wallets in args.wallets:
+            workspace = Path(tmp) / f"wallets-{wallets}"
+            tx_hash = prepare_workspace(workspace, wallets, node, sender)
+            env = dict(base_env, BENCH_CLI_WORKSPACE=str(workspace))
+            for history in args.history:
+                etherscan.history_size = history
+                for name, template, scale in commands:
+                    if (scale != 'wallets' and wallets != args.wallets[0]) or \
+                            (scale != 'history' and history != args.history[0]):
+                        continue
+                    requests_before = etherscan.requests
+                    reports = []
+                    for _ in range(args.repeat):
+                        values = {'sender': sender.lower(), 'tx_hash': tx_hash, 'new_key': secrets.token_hex(32)}
+                        reports.append(run_command([part.format(**values) for part in template], env))
+                    result = summarize(name, wallets, history, reports, etherscan.requests - requests_before)
+                    results.append(result)
+                    phases = ' '.join(f"{phase} {result['phases'][phase] * 1000:.0f}" for phase in PHASES)
+                    print(f"{name:<16} wallets={wallets:<4} history={history:<5} {result['wall_s'] * 1000:7.1f}ms "
+                          f"({phases} ms) rpc {result['rpc_calls']}/{result['round_trips']} "
+                          f"rss {result['peak_rss_kb'] / 1024:.0f}MB")
+
+    output = Path(args.output) if args.output else Path(project_root) / 'benchmarks' / 'results' / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'dirty': dirty,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': {'repeat': args.repeat, 'latency': args.latency},
+            'results': results
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
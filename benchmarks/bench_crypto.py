@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the cryptographic primitives behind wallet generate/import and send,
+each timed in isolation, next to alternative backends for the same operation.
+
+Reports ops/s and the per-op latency distribution of public key derivation,
+Keccak-256, PBKDF2 (100k iterations), Fernet, Account.sign_transaction, the manual
+RLP re-encoding and Account.recover_transaction, plus the WalletManager and
+TransactionManager methods built from them, and an estimate of the CPU each
+command spends on them. Alternatives run only when their package is installed.
+
+Save a run with --output and later check it for regressions: --baseline fails
+(exit 1) when a primitive's median latency grows by more than --tolerance.
+
+Usage: python benchmarks/bench_crypto.py [--min-time 1.0] [--filter pbkdf2] [--output crypto.json]
+           [--baseline crypto.json --tolerance 0.25]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import rlp
+from _pysha3 import keccak_256
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from ecdsa import SECP256k1, SigningKey
+from eth_account import Account
+from eth_utils import to_bytes, to_hex
+
+from src.transaction import TransactionManager
+from src.wallet import WalletManager
+
+PRIVATE_KEY = bytes.fromhex("4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318")
+PASSWORD = "Bench1234!"
+SALT = bytes(range(16))
+KDF_ITERATIONS = 100000
+TRANSACTION = {
+    'nonce': 7, 'gasPrice': 1_000_000_000, 'gas': 21000, 'to': '0x0987654321098765432109876543210987654321',
+    'value': 10 ** 17, 'data': b'', 'chainId': 11155111
+}
+
+# The primitives each command runs, to estimate its cryptographic CPU time
+COMMANDS = {
+    'wallet generate': ['pubkey/ecdsa', 'keccak/pysha3', 'pbkdf2/cryptography', 'fernet/encrypt'],
+    'wallet import': ['pubkey/ecdsa', 'keccak/pysha3', 'pbkdf2/cryptography', 'fernet/encrypt'],
+    'send': ['pbkdf2/cryptography', 'fernet/decrypt', 'pubkey/eth_keys', 'sign/eth_account', 'rlp/encode',
+             'recover/eth_account'],
+}
+
+
+def _pbkdf2(password: bytes, salt: bytes) -> bytes:
+    return PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS).derive(password)
+
+
+def primitives() -> list:
+    """(name, what it stands for, zero-argument function) for every primitive, current backends first."""
+    signing_tx = dict(TRANSACTION, to=to_bytes(hexstr=TRANSACTION['to']))
+    signed = Account.sign_transaction(signing_tx, PRIVATE_KEY)
+    raw = to_hex(rlp.encode([signing_tx['nonce'], signing_tx['gasPrice'], signing_tx['gas'], signing_tx['to'],
+                             signing_tx['value'], signing_tx['data'], signed.v, signed.r, signed.s]))
+    public_key = SigningKey.from_string(PRIVATE_KEY, curve=SECP256k1).verifying_key.to_string()
+    fernet = Fernet(base64.urlsafe_b64encode(_pbkdf2(PASSWORD.encode(), SALT)))
+    token = fernet.encrypt(PRIVATE_KEY)
+    wallet_manager = WalletManager()
+    # _sign_transaction uses no instance state; skip __init__, which loads settings.json and opens an RPCClient
+    transaction_manager = TransactionManager.__new__(TransactionManager)
+    encrypted = wallet_manager._encrypt_private_key(PRIVATE_KEY, PASSWORD)
+    wallet_data = {'salt': encrypted['salt'].hex(), 'encrypted_private_key': encrypted['encrypted_key'].hex()}
+
+    benchmarks = [
+        ('pubkey/ecdsa', "public key from private key: ecdsa (pure Python, used by WalletManager)",
+         lambda: SigningKey.from_string(PRIVATE_KEY, curve=SECP256k1).verifying_key.to_string()),
+        ('keccak/pysha3', "Keccak-256 of a public key: _pysha3 (used by WalletManager)",
+         lambda: keccak_256(public_key).digest()),
+        ('pbkdf2/cryptography', f"PBKDF2-HMAC-SHA256, {KDF_ITERATIONS} iterations: cryptography "
+                                "(used by WalletManager)",
+         lambda: _pbkdf2(PASSWORD.encode(), SALT)),
+        ('pbkdf2/hashlib', "PBKDF2-HMAC-SHA256: hashlib",
+         lambda: hashlib.pbkdf2_hmac('sha256', PASSWORD.encode(), SALT, KDF_ITERATIONS, 32)),
+        ('fernet/encrypt', "Fernet encryption of a private key", lambda: fernet.encrypt(PRIVATE_KEY)),
+        ('fernet/decrypt', "Fernet decryption of a private key", lambda: fernet.decrypt(token)),
+        ('sign/eth_account', "Account.sign_transaction (legacy transfer)",
+         lambda: Account.sign_transaction(signing_tx, PRIVATE_KEY)),
+        ('rlp/encode', "manual RLP re-encoding of the signed transaction",
+         lambda: rlp.encode([signing_tx['nonce'], signing_tx['gasPrice'], signing_tx['gas'], signing_tx['to'],
+                             signing_tx['value'], signing_tx['data'], signed.v, signed.r, signed.s])),
+        ('recover/eth_account', "Account.recover_transaction", lambda: Account.recover_transaction(raw)),
+        ('wallet/private_key_to_address', "WalletManager._private_key_to_address",
+         lambda: wallet_manager._private_key_to_address(PRIVATE_KEY)),
+        ('wallet/encrypt_private_key', "WalletManager._encrypt_private_key",
+         lambda: wallet_manager._encrypt_private_key(PRIVATE_KEY, PASSWORD)),
+        ('wallet/decrypt_private_key', "WalletManager._decrypt_private_key",
+         lambda: wallet_manager._decrypt_private_key(wallet_data, PASSWORD)),
+        ('tx/sign_transaction', "TransactionManager._sign_transaction (sign, re-encode, recover)",
+         lambda: transaction_manager._sign_transaction(TRANSACTION, PRIVATE_KEY.hex())),
+    ]
+
+    # Alternative backends, when installed
+    try:
+        from eth_keys import keys
+        benchmarks.append(('pubkey/eth_keys', f"public key: eth_keys ({type(keys.backend).__name__}, "
+                                              f"used by Account.from_key)",
+                           lambda: keys.PrivateKey(PRIVATE_KEY).public_key.to_bytes()))
+    except ImportError:
+        pass
+    try:
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+        secret = int.from_bytes(PRIVATE_KEY, 'big')
+        benchmarks.append(('pubkey/openssl', "public key: cryptography (OpenSSL)",
+                           lambda: ec.derive_private_key(secret, ec.SECP256K1()).public_key().public_bytes(
+                               Encoding.X962, PublicFormat.UncompressedPoint)))
+    except (ImportError, AttributeError):
+        pass
+    try:
+        from coincurve import PrivateKey
+        benchmarks.append(('pubkey/coincurve', "public key: coincurve (libsecp256k1)",
+                           lambda: PrivateKey(PRIVATE_KEY).public_key.format(compressed=False)))
+    except ImportError:
+        pass
+    try:
+        from Crypto.Hash import keccak
+        benchmarks.append(('keccak/pycryptodome', "Keccak-256: pycryptodome",
+                           lambda: keccak.new(digest_bits=256, data=public_key).digest()))
+    except ImportError:
+        pass
+    try:
+        from eth_hash.auto import keccak as eth_hash_keccak
+        benchmarks.append(('keccak/eth_hash', "Keccak-256: eth_hash (used by eth_utils)",
+                           lambda: eth_hash_keccak(public_key)))
+    except ImportError:
+        pass
+    return benchmarks
+
+
+def measure(function, min_time: float, min_ops: int) -> dict:
+    """Run function until min_time seconds and min_ops calls have passed; per-op latencies in milliseconds."""
+    function()  # Warm caches and lazy imports
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while len(latencies) < min_ops or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        function()
+        latencies.append((time.perf_counter_ns() - start) / 1e6)
+    latencies.sort()
+
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    return {
+        'ops': len(latencies),
+        'ops_per_s': len(latencies) / (sum(latencies) / 1000),
+        'mean_ms': statistics.fmean(latencies),
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1]
+    }
+
+
+def check_regressions(results: dict, baseline_path: str, tolerance: float) -> list:
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {old['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms "
+                               f"(+{(result['p50_ms'] / old['p50_ms'] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the wallet and signing primitives in isolation")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to run each primitive for")
+    parser.add_argument("--min-ops", type=int, default=5, help="Calls per primitive, at least")
+    parser.add_argument("--filter", help="Only primitives whose name contains this, e.g. pubkey")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Earlier --output file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 growth over the baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = {}
+    print(f"{'primitive':<32} {'ops/s':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+    for name, description, function in primitives():
+        if args.filter and args.filter not in name:
+            continue
+        result = dict(measure(function, args.min_time, args.min_ops), description=description)
+        results[name] = result
+        print(f"{name:<32} {result['ops_per_s']:>10.1f} {result['mean_ms']:>9.3f} {result['p50_ms']:>9.3f} "
+              f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f}")
+
+    # Alternatives against the backend the code uses today (the first of each group)
+    groups = {}
+    for name in results:
+        groups.setdefault(name.split('/')[0], []).append(name)
+    compared = {group: names for group, names in groups.items()
+                if len(names) > 1 and group not in ('fernet', 'wallet', 'tx')}
+    if compared:
+        print("\nBackends (p50 relative to the one in use):")
+        for group, names in compared.items():
+            current = results[names[0]]['p50_ms']
+            print(f"  {group}: " + ", ".join(f"{name.split('/')[1]} {results[name]['p50_ms'] / current:.2f}x"
+                                             for name in names))
+
+    estimates = {command: sum(results[name]['p50_ms'] for name in names)
+                 for command, names in COMMANDS.items() if all(name in results for name in names)}
+    if estimates:
+        print("\nCryptographic CPU per command (sum of p50s):")
+        for command, total in estimates.items():
+            top = max(COMMANDS[command], key=lambda name: results[name]['p50_ms'])
+            print(f"  {command:<16} {total:8.1f}ms, {results[top]['p50_ms'] / total * 100:.0f}% in {top}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                       'min_time': args.min_time, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        regressions = check_regressions(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions over {args.tolerance:.0%} against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: how long ./cli takes to start, and which imports it pays for.
+
+Runs each command in a fresh interpreter under `python -X importtime` (offline
+commands for real, in a throwaway wallet directory; network commands only up to
+importing their modules) and reports the best wall time against a bare
+interpreter, the time spent importing, and the slowest modules by cumulative
+import time. --budget-ms fails (exit 1) when an offline command takes longer than
+the budget on top of the bare interpreter.
+
+Usage: python benchmarks/bench_import.py [--runs 5] [--top 10] [--budget-ms 50] [--commands "wallet list" ...]
+"""
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commands that start without a network, run for real, and the module each network command imports when it runs
+OFFLINE_COMMANDS = {'--help': '--help', 'wallet list': 'wallet list', 'stats': 'stats',
+                    'wallet use': 'wallet use --address 0x0000000000000000000000000000000000000000'}
+NETWORK_COMMANDS = {'wallet show': 'wallet', 'balance': 'src.rpc_client', 'send': 'transaction',
+                    'tx status': 'transaction', 'tx history': 'transaction'}
+
+# Runs one command the way ./cli does, with the wallet directory moved into a workspace
+CHILD = """
+import os, sys
+sys.path.insert(0, os.path.join({root!r}, 'src'))
+sys.argv = ['cli'] + {argv!r}
+from src import main
+if sys.argv[1:2] == ['wallet']:
+    import wallet
+    wallet.WALLET_DIR = wallet.Path({workspace!r})
+    wallet.DEFAULT_WALLET_FILE = wallet.WALLET_DIR / 'default.txt'
+{body}
+"""
+RUN = """
+try:
+    main.run()
+except SystemExit:
+    pass
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def child_code(argv: list, workspace: str, import_only: str = None) -> str:
+    body = f"import {import_only}" if import_only else RUN
+    return CHILD.format(root=project_root, argv=argv, workspace=workspace, body=body)
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) for every line of -X importtime output."""
+    return [(match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+            for match in IMPORT_LINE.finditer(stderr)]
+
+
+def best_run(code: str, runs: int) -> tuple:
+    """Best wall time of `runs` interpreters running code, and the import breakdown of the last one."""
+    best, imports = float('inf'), []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                                 cwd=project_root)
+        best = min(best, time.perf_counter() - start)
+        imports = parse_importtime(process.stderr)
+    return best, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time and import breakdown of CLI commands")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters per command (best wall time reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per command")
+    parser.add_argument("--budget-ms", type=float, help="Fail if an offline command adds more than this to startup")
+    parser.add_argument("--commands", nargs='+', help="Only these commands")
+    args = parser.parse_args()
+
+    bare, site_imports = best_run("pass", args.runs)
+    site_us = sum(cumulative for _, _, cumulative, depth in site_imports if depth == 0)
+    print(f"bare interpreter: {bare * 1000:.1f}ms ({site_us / 1000:.1f}ms of it importing site packages)\n")
+
+    over_budget = []
+    with tempfile.TemporaryDirectory() as workspace:
+        commands = [(command, argv, None) for command, argv in OFFLINE_COMMANDS.items()] + \
+            [(command, command, module) for command, module in NETWORK_COMMANDS.items()]
+        for command, argv, import_only in commands:
+            if args.commands and command not in args.commands:
+                continue
+            wall, imports = best_run(child_code(shlex.split(argv), workspace, import_only), args.runs)
+            own = [entry for entry in imports if entry[0] not in {name for name, *_ in site_imports}]
+            import_ms = sum(cumulative for _, _, cumulative, depth in own if depth == 0) / 1000
+            label = command if import_only is None else f"{command} (imports)"
+            print(f"{label:<24} {wall * 1000:7.1f}ms  +{(wall - bare) * 1000:6.1f}ms over bare, "
+                  f"{import_ms:6.1f}ms importing {len(own)} modules")
+            for name, self_us, cumulative_us, _ in sorted(own, key=lambda entry: -entry[2])[:args.top]:
+                print(f"    {cumulative_us / 1000:7.1f}ms cumulative {self_us / 1000:6.1f}ms self  {name}")
+            if import_only is None and args.budget_ms is not None and (wall - bare) * 1000 > args.budget_ms:
+                over_budget.append(f"{command}: +{(wall - bare) * 1000:.1f}ms")
+
+    if args.budget_ms is not None:
+        if over_budget:
+            print(f"\nOver the {args.budget_ms:.0f}ms cold-start budget: {', '.join(over_budget)}")
+            sys.exit(1)
+        print(f"\nOffline commands are within the {args.budget_ms:.0f}ms cold-start budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: RPCClient.map_calls with a growing number of worker threads.
+
+Runs N eth_getBalance calls (distinct addresses, so the response cache never answers)
+against a local stand-in JSON-RPC server that adds a fixed latency to every response,
+and reports calls per second for each worker count.
+
+Usage: python benchmarks/bench_map_calls.py [--calls 400] [--latency 0.02] [--workers 1 2 4 8 16 32]
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.bench_async_rpc import StandInHandler, StandInServer
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+
+
+def bench_workers(url: str, calls: int, workers: int) -> float:
+    # Measure the transport, not the throttle
+    client = RPCClient(rpc_url=url, chain_id=11155111, rate_limiter=NullRateLimiter(), pool_size=workers)
+    client.get_chain_id()
+    params = ([f"0x{i:040x}", 'latest'] for i in range(calls))
+    start = time.perf_counter()
+    for result in client.map_calls('eth_getBalance', params, max_workers=workers):
+        if isinstance(result, Exception):
+            raise result
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RPCClient.map_calls throughput by worker count")
+    parser.add_argument("--calls", type=int, default=400, help="Number of eth_getBalance calls per run")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in server latency in seconds")
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4, 8, 16, 32], help="Worker counts to run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    server.latency = args.latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"{'workers':<10}{'calls':>8}{'seconds':>10}{'calls/s':>10}{'scaling':>10}")
+    baseline = None
+    for workers in args.workers:
+        elapsed = bench_workers(url, args.calls, workers)
+        throughput = args.calls / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:<10}{args.calls:>8}{elapsed:>10.2f}{throughput:>10.1f}{throughput / baseline:>9.1f}x")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark: CLI commands replayed from a recorded cassette.
+
+Record a session against a real endpoint once (RPC and Etherscan calls, with timings):
+
+    RPC_CASSETTE=record:benchmarks/cassettes/session.json ./cli balance --address 0x...
+    RPC_CASSETTE=record:benchmarks/cassettes/session.json ./cli tx status --hash 0x...
+    RPC_CASSETTE=record:benchmarks/cassettes/session.json ./cli tx history --address 0x...
+
+then time the same commands in-process without a network, at the recorded latency
+(--speed 1) or as fast as possible (--speed 0, the default) to measure client overhead alone:
+
+Usage: python benchmarks/bench_replay.py benchmarks/cassettes/session.json \\
+           "balance --address 0x..." "tx status --hash 0x..." [--rounds 20] [--speed 0]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import shlex
+import statistics
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from src import cassette, main as cli
+
+
+def bench_command(command: str, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        # Every round replays the cassette from its first exchange
+        cassette._CASSETTES.clear()
+        sys.argv = ['cli'] + shlex.split(command)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            try:
+                cli.run()
+            except SystemExit as e:
+                if e.code:
+                    raise RuntimeError(f"'{command}' failed under replay: {output.getvalue().strip()}")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay CLI commands from a cassette and time them")
+    parser.add_argument("cassette", help="Cassette recorded with RPC_CASSETTE=record:<path>")
+    parser.add_argument("commands", nargs='+', help="CLI commands to replay, e.g. \"balance --address 0x...\"")
+    parser.add_argument("--rounds", type=int, default=20, help="Runs per command")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay speed: 1 keeps recorded latencies, 0 answers immediately")
+    args = parser.parse_args()
+
+    os.environ['RPC_CASSETTE'] = f"replay:{args.cassette}"
+    os.environ['RPC_CASSETTE_SPEED'] = str(args.speed)
+    logging.disable(logging.INFO)
+
+    print(f"{'command':<40}{'rounds':>8}{'median ms':>12}{'p95 ms':>10}")
+    for command in args.commands:
+        timings = sorted(bench_command(command, args.rounds))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{command[:39]:<40}{args.rounds:>8}{statistics.median(timings) * 1000:>12.2f}{p95 * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,503 @@
+import asyncio
+import json
+import logging
+import os
+import ssl
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union, Any
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+from src.rate_limiter import get_rate_limiter
+from src.retry import NON_IDEMPOTENT_METHODS, RETRYABLE_STATUSES, RetryPolicy, parse_retry_after
+from src.rpc_client import NETWORK_NAMES, READ_ONLY_METHODS, RPCClient
+from src.settings import load_settings
+from src.single_flight import AsyncSingleFlight, flight_key
+
+load_dotenv()
+# Configuration path
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHTTPError(Exception):
+    """Non-2xx HTTP status returned by the RPC endpoint."""
+
+    def __init__(self, status: int, reason: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status} {reason}")
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _HTTPConnection:
+    """
+    A single keep-alive HTTP/1.1 connection built on asyncio streams.
+
+    Only what JSON-RPC over HTTP needs is supported: POST with a JSON body and
+    responses framed by Content-Length, chunked encoding or connection close.
+    """
+
+    def __init__(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext]):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.reusable = True
+
+    async def open(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context
+        )
+
+    @property
+    def host_header(self) -> str:
+        """Host as the Host header names it: bracketed IPv6 literals, and the port unless it is the scheme's default."""
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        default_port = 443 if self.ssl_context is not None else 80
+        return host if self.port == default_port else f"{host}:{self.port}"
+
+    async def post(self, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, str, Dict[str, str], bytes]:
+        """Send a POST request and return (status, reason, headers, body)."""
+        lines = [f"POST {path} HTTP/1.1", f"Host: {self.host_header}", f"Content-Length: {len(body)}",
+                 "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        status = int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ''
+
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0].strip(), 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            response_body = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            response_body = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            response_body = await self.reader.read()
+            self.reusable = False
+
+        if response_headers.get('connection', '').lower() == 'close':
+            self.reusable = False
+        return status, reason, response_headers, response_body
+
+    def close(self) -> None:
+        self.reusable = False
+        if self.writer is not None:
+            self.writer.close()
+
+
+class AsyncRPCClient:
+    """
+    asyncio-native Ethereum RPC client with the same surface as RPCClient.
+    Features:
+    - Keep-alive connection pool on asyncio streams (no extra dependencies)
+    - Bounded concurrency semaphore so thousands of calls can share one event loop
+    - Token-bucket rate limiting shared with RPCClient for the same endpoint
+    - Async retries under the shared RetryPolicy (rpc.retry: deadline, jitter, Retry-After, timeouts)
+    - JSON-RPC batching
+    - Single-flight: identical concurrent read-only calls share one request
+    """
+
+    def __init__(self, rpc_url: str = None, chain_id: int = None, timeout: float = None, max_retries: int = None,
+                 max_concurrency: int = 100, rate_limiter: Any = None):
+        """
+        Initialize async RPC Client with basic settings.
+
+        Args:
+            rpc_url: Ethereum RPC endpoint (http:// or https://)
+            chain_id: Expected network chain ID
+            timeout: Read timeout in seconds; rpc.retry.read_timeout when omitted
+            max_retries: Maximum number of attempts per call; rpc.retry.max_attempts when omitted
+            max_concurrency: Maximum number of in-flight HTTP requests
+            rate_limiter: Optional limiter with a reserve() method; defaults to the
+                bucket for this endpoint configured under rpc.rate_limit in settings.json
+        """
+        settings = load_settings(CONFIG_PATH)
+        self.rpc_url = rpc_url or os.getenv('RPC_URL')
+        self.expected_chain_id = chain_id or settings.network.chain_id
+        self.default_gas_price_gwei = settings.transaction.default_gas_price_gwei
+        # Deadline, jitter, Retry-After and timeouts shared with RPCClient (rpc.retry in settings.json)
+        self.retry_policy = RetryPolicy.from_config(
+            settings.rpc.get('retry'), read_timeout=timeout, max_attempts=max_retries
+        )
+        self.timeout = self.retry_policy.read_timeout
+        self.max_retries = self.retry_policy.max_attempts
+        self.max_concurrency = max_concurrency
+        self.headers = {'Content-Type': 'application/json'}
+        self.request_id = 0
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            self.rpc_url, settings.rpc.get('rate_limit')
+        )
+
+        url = urlsplit(self.rpc_url or '')
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported RPC URL for AsyncRPCClient: {self.rpc_url}")
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == 'https' else 80)
+        self._path = (url.path or '/') + (f"?{url.query}" if url.query else '')
+        self._ssl_context = ssl.create_default_context() if url.scheme == 'https' else None
+        self._idle: List[_HTTPConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Identical read-only calls in flight at the same time share one request
+        self.single_flight = AsyncSingleFlight()
+
+        # Simple metrics tracking
+        self.call_count = 0
+        self.success_count = 0
+
+    async def __aenter__(self) -> 'AsyncRPCClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the loop that actually runs the calls
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _make_rpc_call(self, method: str, params: List[Any] = None) -> Any:
+        """
+        Make a JSON-RPC call with retries (see RetryPolicy). Read-only calls
+        already in flight with the same params are joined instead of resent.
+        """
+        if params is None:
+            params = []
+
+        if method in READ_ONLY_METHODS:
+            return await self.single_flight.do(flight_key(method, params), lambda: self._send_call(method, params))
+        return await self._send_call(method, params)
+
+    async def _send_call(self, method: str, params: List[Any]) -> Any:
+        """Send one JSON-RPC call and unwrap its result."""
+        self.call_count += 1
+        self.request_id += 1
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": self.request_id
+        }
+
+        logger.debug(f"🔄 Calling {method} with params: {params}")
+        result = await self._post(payload, method)
+
+        if not isinstance(result, dict):
+            raise ValueError(f"Unexpected response for {method}: {result}")
+
+        if 'error' in result:
+            error_msg = result['error'].get('message', 'Unknown error')
+            logger.error(f"❌ RPC Error {method}: {error_msg}")
+            raise ValueError(f"RPC error: {error_msg}")
+
+        self.success_count += 1
+        return result['result']
+
+    async def batch(self, calls: List[Tuple[str, Optional[List[Any]]]]) -> List[Any]:
+        """
+        Send several JSON-RPC calls as one JSON-RPC array in a single HTTP POST.
+
+        Returns:
+            Results in the same order as calls, with failed calls returned as
+            ValueError instances (see RPCClient.batch).
+        """
+        if not calls:
+            return []
+
+        payload = []
+        for method, params in calls:
+            self.call_count += 1
+            self.request_id += 1
+            payload.append({
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params if params is not None else [],
+                "id": self.request_id
+            })
+
+        response = await self._post(payload, 'batch')
+        if isinstance(response, dict):
+            error_msg = response.get('error', {}).get('message', 'Unknown error')
+            raise ValueError(f"RPC error: {error_msg}")
+
+        by_id = {item.get('id'): item for item in response if isinstance(item, dict)}
+        results = []
+        for request in payload:
+            item = by_id.get(request['id'])
+            if item is None:
+                results.append(ValueError(f"RPC error: no response for {request['method']}"))
+            elif 'error' in item:
+                results.append(ValueError(f"RPC error: {item['error'].get('message', 'Unknown error')}"))
+            else:
+                self.success_count += 1
+                results.append(item.get('result'))
+        return results
+
+    async def _post(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]], label: str) -> Any:
+        """
+        POST a JSON-RPC payload (single call or batch) with bounded concurrency and retries
+        within one RetryPolicy budget: decorrelated jitter, Retry-After and the total deadline.
+
+        Returns:
+            Decoded JSON response body
+        """
+        body = json.dumps(payload).encode()
+        methods = tuple(item['method'] for item in payload) if isinstance(payload, list) else (payload['method'],)
+
+        with self.retry_policy.start() as budget:
+            while True:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                connect, read = self.retry_policy.timeout(methods, budget)
+                retry_after = None
+                try:
+                    async with self._get_semaphore():
+                        status, reason, headers, response_body = await asyncio.wait_for(
+                            self._send(body), timeout=min(connect + read, max(budget.remaining(), 0.001))
+                        )
+                    if status >= 400:
+                        raise AsyncHTTPError(status, reason, parse_retry_after(headers.get('retry-after')))
+                    return json.loads(response_body)
+                except AsyncHTTPError as e:
+                    if e.status not in RETRYABLE_STATUSES:
+                        logger.error(f"❌ {label} failed, not retrying: {e}")
+                        raise ConnectionError(f"HTTP error: {e}")
+                    error, retry_after = f"HTTP error: {e}", e.retry_after
+                except asyncio.TimeoutError:
+                    error = "Request timed out after retries"
+                except (OSError, asyncio.IncompleteReadError) as e:
+                    # Only a connection that was never made is safe to retry for non-idempotent methods
+                    if (any(method in NON_IDEMPOTENT_METHODS for method in methods)
+                            and not isinstance(e, ConnectionRefusedError)):
+                        raise ConnectionError(f"Network error: {e}")
+                    error = f"Network error: {e}"
+                except json.JSONDecodeError:
+                    raise ValueError("Invalid JSON response from RPC")
+
+                delay = budget.next_delay(retry_after)
+                if delay is None:
+                    logger.error(f"❌ {label} failed after {budget.attempt} attempts: {error}")
+                    raise ConnectionError(error)
+                logger.warning(f"⏰ {label} attempt {budget.attempt}/{budget.max_attempts} failed ({error}), "
+                               f"retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _send(self, body: bytes) -> Tuple[int, str, Dict[str, str], bytes]:
+        """Send one request over a pooled connection, reopening once if a kept-alive socket went stale."""
+        reused = bool(self._idle)
+        connection = self._idle.pop() if reused else await self._open_connection()
+        try:
+            response = await connection.post(self._path, self.headers, body)
+        except (OSError, asyncio.IncompleteReadError):
+            connection.close()
+            if not reused:
+                raise
+            connection = await self._open_connection()
+            try:
+                response = await connection.post(self._path, self.headers, body)
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+
+        if connection.reusable:
+            self._idle.append(connection)
+        else:
+            connection.close()
+        return response
+
+    async def _open_connection(self) -> _HTTPConnection:
+        connection = _HTTPConnection(self._host, self._port, self._ssl_context)
+        await connection.open()
+        return connection
+
+    async def get_chain_id(self) -> int:
+        """Get and validate the chain ID."""
+        chain_id = int(await self._make_rpc_call('eth_chainId'), 16)
+        if chain_id != self.expected_chain_id:
+            raise ValueError(
+                f"Wrong network! Expected {self.expected_chain_id} ({NETWORK_NAMES.get(self.expected_chain_id)}), "
+                f"got {chain_id}"
+            )
+        return chain_id
+
+    async def get_balance(self, address: str, unit: str = 'ether') -> Union[int, float]:
+        """
+        Get balance of an address.
+        """
+        if not RPCClient._validate_address(address):
+            raise ValueError(f"Invalid address: {address}")
+
+        if unit not in ['wei', 'gwei', 'ether']:
+            raise ValueError("Unit must be 'wei', 'gwei', or 'ether'")
+
+        balance_wei = int(await self._make_rpc_call('eth_getBalance', [address, 'latest']), 16)
+
+        if unit == 'wei':
+            return balance_wei
+        elif unit == 'gwei':
+            return balance_wei / 1_000_000_000
+        else:  # ether
+            return balance_wei / 1_000_000_000_000_000_000
+
+    async def get_nonce(self, address: str) -> int:
+        """Get the next transaction nonce for an address."""
+        if not RPCClient._validate_address(address):
+            raise ValueError(f"Invalid address: {address}")
+
+        return int(await self._make_rpc_call('eth_getTransactionCount', [address, 'pending']), 16)
+
+    async def get_gas_price(self, unit: str = 'gwei') -> Union[int, float]:
+        """Get current gas price with fallback for zero values only."""
+        gas_price_wei = int(await self._make_rpc_call('eth_gasPrice'), 16)
+
+        if gas_price_wei == 0:
+            logger.warning(f"Zero gas price received, using default {self.default_gas_price_gwei} Gwei")
+            gas_price_wei = int(self.default_gas_price_gwei * 1_000_000_000)
+
+        if unit == 'wei':
+            return gas_price_wei
+        elif unit == 'gwei':
+            return gas_price_wei / 1_000_000_000
+        else:
+            return gas_price_wei / 1_000_000_000_000_000_000
+
+    async def estimate_gas(self, transaction: Dict[str, Any]) -> int:
+        """
+        Estimate gas for a transaction.
+        """
+        if not isinstance(transaction, dict):
+            raise ValueError("Transaction must be a dictionary")
+
+        if 'to' not in transaction:
+            raise ValueError("Transaction missing 'to' address")
+
+        try:
+            gas = int(await self._make_rpc_call('eth_estimateGas', [transaction]), 16)
+            if gas > 0:
+                return gas
+        except Exception as e:
+            logger.warning(f"Gas estimation failed: {e}, using static estimate")
+
+        return RPCClient._static_gas_estimate(transaction)
+
+    async def send_raw_transaction(self, signed_tx_hex: str) -> str:
+        """Send a signed transaction to the network."""
+        if not signed_tx_hex.startswith('0x'):
+            raise ValueError("Transaction must start with 0x")
+
+        if len(signed_tx_hex) < 100:
+            logger.warning("Transaction looks unusually short")
+
+        tx_hash = await self._make_rpc_call('eth_sendRawTransaction', [signed_tx_hex])
+        logger.info(f"📤 Transaction sent: {tx_hash}")
+        return tx_hash
+
+    async def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        """
+        Check transaction status (pending, confirmed, or not found).
+        The transaction and its receipt are fetched in one batched round trip.
+        """
+        if not tx_hash.startswith('0x') or len(tx_hash) != 66:
+            raise ValueError("Invalid transaction hash")
+        try:
+            tx, receipt = RPCClient._unwrap(await self.batch([
+                ('eth_getTransactionByHash', [tx_hash]),
+                ('eth_getTransactionReceipt', [tx_hash])
+            ]))
+            if not tx:
+                return {
+                    'status': 'not_found',
+                    'message': 'Transaction not found',
+                    'gas_used': 0,
+                    'block_number': 'N/A'
+                }
+            if receipt:
+                status = 'success' if receipt['status'] == '0x1' else 'failed'
+                block_num = int(receipt['blockNumber'], 16) if receipt['blockNumber'] else 0
+                return {
+                    'status': status,
+                    'message': f"Confirmed in block {block_num}",
+                    'gas_used': int(receipt.get('gasUsed', '0x0'), 16),
+                    'block_number': block_num
+                }
+            return {
+                'status': 'pending',
+                'message': 'Transaction pending',
+                'gas_used': 0,
+                'block_number': 'N/A'
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': str(e),
+                'gas_used': 0,
+                'block_number': 'N/A'
+            }
+
+    async def get_block_number(self) -> int:
+        """Get the latest block number."""
+        return int(await self._make_rpc_call('eth_blockNumber'), 16)
+
+    async def get_block_info(self, block_number: int) -> Dict[str, Any]:
+        """Get basic info about a block."""
+        if block_number < 0:
+            raise ValueError("Block number cannot be negative")
+
+        block_data = await self._make_rpc_call('eth_getBlockByNumber', [hex(block_number), False])
+
+        if not block_data:
+            raise ValueError(f"Block {block_number} not found")
+
+        return {
+            'number': block_number,
+            'timestamp': int(block_data['timestamp'], 16) if block_data.get('timestamp') else 0,
+            'miner': block_data.get('miner', '0x0'),
+            'gas_used': int(block_data.get('gasUsed', '0x0'), 16),
+            'transaction_count': len(block_data.get('transactions', []))
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get basic usage statistics."""
+        success_rate = (self.success_count / self.call_count * 100) if self.call_count > 0 else 0
+        return {
+            'total_calls': self.call_count,
+            'successful_calls': self.success_count,
+            'success_rate': round(success_rate, 1),
+            'coalesced_calls': self.single_flight.coalesced,
+            'network': NETWORK_NAMES.get(self.expected_chain_id, 'Unknown')
+        }
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        while self._idle:
+            self._idle.pop().close()
+        logger.info("Async RPC Client closed")
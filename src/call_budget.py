@@ -0,0 +1,148 @@
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from src.metrics import current_command
+from src.settings import read_settings
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+
+# Defaults for rpc.call_budget in settings.json: the JSON-RPC calls and round trips each CLI
+# command may send (on a cold start, so the chain ID check is included; cache hits are free)
+CALL_BUDGET_DEFAULTS = {
+    'enforce': False,   # Fail commands over budget; RPC_CALL_BUDGET=enforce turns it on for one run
+    'budgets': {
+        'balance': {'calls': 2, 'round_trips': 2},       # Chain ID check, eth_getBalance
+        'wallet show': {'calls': 2, 'round_trips': 2},   # Chain ID check, eth_getBalance
+        'send': {'calls': 6, 'round_trips': 2},          # Build batch (which checks the chain ID), broadcast
+        'tx status': {'calls': 3, 'round_trips': 2}      # Chain ID check, transaction + receipt batch
+    }
+}
+
+
+class CallBudgetExceeded(AssertionError):
+    """A command sent more RPC calls or round trips than its budget allows."""
+
+
+class CallUsage:
+    """JSON-RPC calls (each call of a batch, and every retry, counts) and round trips sent by a command."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.round_trips = 0
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def record(self, methods: Iterable[str]) -> None:
+        self.calls.update(methods)
+        self.round_trips += 1
+
+    def describe(self) -> str:
+        detail = ', '.join(f"{method} x{count}" for method, count in sorted(self.calls.items()))
+        return f"{self.total_calls} calls in {self.round_trips} round trips" + (f" ({detail})" if detail else "")
+
+
+# Usage per command in this process (None collects calls made outside any CLI command)
+_USAGE: Dict[Optional[str], CallUsage] = {}
+_USAGE_LOCK = threading.Lock()
+# Usage of the current ./cli daemon request, counted apart from the process (see isolated_usage)
+_SCOPE: contextvars.ContextVar = contextvars.ContextVar('call_usage', default=None)
+
+
+def _usage() -> Dict[Optional[str], CallUsage]:
+    scope = _SCOPE.get()
+    return _USAGE if scope is None else scope
+
+
+@contextlib.contextmanager
+def isolated_usage() -> Iterator[None]:
+    """Count the calls made in this context, e.g. one daemon request, apart from everything else."""
+    token = _SCOPE.set({})
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+def record_round_trip(methods: Iterable[str]) -> None:
+    """Count one request sent to a node, carrying the given calls, against the current command."""
+    with _USAGE_LOCK:
+        _usage().setdefault(current_command(), CallUsage()).record(methods)
+
+
+def command_usage(command: Optional[str]) -> CallUsage:
+    """Calls and round trips sent so far under a command."""
+    with _USAGE_LOCK:
+        usage = _usage().get(command, CallUsage())
+        snapshot = CallUsage()
+        snapshot.calls.update(usage.calls)
+        snapshot.round_trips = usage.round_trips
+        return snapshot
+
+
+def reset_usage() -> None:
+    with _USAGE_LOCK:
+        _usage().clear()
+
+
+def call_budget_settings() -> Dict[str, Any]:
+    """rpc.call_budget from settings.json (listed budgets override the defaults) and the RPC_CALL_BUDGET override."""
+    try:
+        config = read_settings(CONFIG_PATH)
+    except ValueError:
+        config = {}
+    budget_config = config.get('rpc', {}).get('call_budget', {})
+    settings = dict(CALL_BUDGET_DEFAULTS, **budget_config)
+    settings['budgets'] = dict(CALL_BUDGET_DEFAULTS['budgets'], **budget_config.get('budgets', {}))
+    if os.getenv('RPC_CALL_BUDGET'):
+        settings['enforce'] = os.getenv('RPC_CALL_BUDGET') == 'enforce'
+    return settings
+
+
+def check_budget(command: str, budgets: Optional[Dict[str, Dict[str, int]]] = None) -> CallUsage:
+    """
+    Compare a command's usage with its budget (commands without one always pass).
+
+    Returns:
+        The command's usage
+
+    Raises:
+        CallBudgetExceeded: If it sent more calls or round trips than budgeted
+    """
+    budgets = CALL_BUDGET_DEFAULTS['budgets'] if budgets is None else budgets
+    usage = command_usage(command)
+    budget = budgets.get(command)
+    if budget is None:
+        return usage
+    over = []
+    if 'calls' in budget and usage.total_calls > budget['calls']:
+        over.append(f"{usage.total_calls} calls > {budget['calls']}")
+    if 'round_trips' in budget and usage.round_trips > budget['round_trips']:
+        over.append(f"{usage.round_trips} round trips > {budget['round_trips']}")
+    if over:
+        raise CallBudgetExceeded(f"'{command}' is over its RPC budget ({'; '.join(over)}): {usage.describe()}")
+    return usage
+
+
+def finish_command(command: str) -> None:
+    """
+    Log a command's RPC usage and, when enforcing, check it against its budget.
+
+    Raises:
+        CallBudgetExceeded: If enforcing and the command went over budget
+    """
+    settings = call_budget_settings()
+    usage = command_usage(command)
+    if usage.round_trips:
+        logger.info(f"📞 {command}: {usage.describe()}")
+    if settings['enforce']:
+        check_budget(command, settings['budgets'])
@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from src.settings import atomic_write
+from src.single_flight import flight_key
+
+logger = logging.getLogger(__name__)
+
+# Defaults for rpc.cassette in settings.json; RPC_CASSETTE=record:<path> or replay:<path>
+# (and RPC_CASSETTE_SPEED) override them for a single run
+CASSETTE_DEFAULTS = {
+    'mode': None,      # 'record' a session to path, 'replay' it without a network, or None
+    'path': None,
+    'speed': 1.0       # Replay speed: 1.0 keeps the recorded latencies, 0 answers immediately
+}
+CASSETTE_MODES = ('record', 'replay')
+
+# Query parameters never written to a cassette
+_SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token'}
+
+
+class CassetteMiss(ValueError):
+    """A replayed request that the cassette has no recording of."""
+
+
+def cassette_settings(cassette_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    rpc.cassette from settings.json merged with the RPC_CASSETTE / RPC_CASSETTE_SPEED overrides.
+
+    Raises:
+        ValueError: On an unknown mode or a mode without a path
+    """
+    settings = dict(CASSETTE_DEFAULTS, **(cassette_config or {}))
+    override = os.getenv('RPC_CASSETTE')
+    if override:
+        mode, _, path = override.partition(':')
+        settings.update(mode=mode, path=path or settings['path'])
+    if os.getenv('RPC_CASSETTE_SPEED'):
+        settings['speed'] = float(os.getenv('RPC_CASSETTE_SPEED'))
+    if settings['mode'] in ('off', ''):
+        settings['mode'] = None
+    if settings['mode'] is not None:
+        if settings['mode'] not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {settings['mode']}. Use one of {', '.join(CASSETTE_MODES)}")
+        if not settings['path']:
+            raise ValueError(f"Cassette mode '{settings['mode']}' needs a path")
+    return settings
+
+
+def request_key(payload: Any) -> str:
+    """Key a payload is matched on: its calls' methods and params, not their JSON-RPC ids."""
+    if isinstance(payload, list):
+        return '[' + ','.join(request_key(item) for item in payload) + ']'
+    return flight_key(payload.get('method'), payload.get('params') or [])
+
+
+def redact_url(url: str) -> str:
+    """URL without API keys in its query string."""
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if name.lower() not in _SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class Cassette:
+    """
+    Recorded request/response pairs with their latencies, stored as JSON.
+
+    Replay matches requests by key (method and params), serving the recordings of
+    a key in the order they were made; once they run out the last one is repeated,
+    so polling loops that ran longer than the recorded session still finish.
+    """
+
+    def __init__(self, path: str, interactions: Optional[List[Dict[str, Any]]] = None):
+        self.path = Path(path).expanduser()
+        self.interactions: List[Dict[str, Any]] = list(interactions or [])
+        self._played: Dict[str, int] = {}
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for interaction in self.interactions:
+            self._by_key.setdefault(interaction['key'], []).append(interaction)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, missing_ok: bool = False) -> 'Cassette':
+        """
+        Raises:
+            ValueError: If the file is missing (unless missing_ok) or is not a cassette
+        """
+        try:
+            with open(Path(path).expanduser(), 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            if missing_ok:
+                return cls(path)
+            raise ValueError(f"Cassette not found: {path}")
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid cassette {path}: {e}")
+        if not isinstance(data, dict) or not isinstance(data.get('interactions'), list):
+            raise ValueError(f"Invalid cassette {path}: no interactions")
+        return cls(path, data['interactions'])
+
+    def record(self, key: str, request: Any, elapsed: float, response: Any = None, size: int = 0,
+               error: Optional[Dict[str, Any]] = None) -> None:
+        """Add one exchange: a response (with its size in bytes) or the error it ended in."""
+        interaction = {'key': key, 'request': request, 'elapsed': round(elapsed, 6)}
+        if error is not None:
+            interaction['error'] = error
+        else:
+            interaction.update(response=response, bytes=size)
+        with self._lock:
+            self.interactions.append(interaction)
+            self._by_key.setdefault(key, []).append(interaction)
+
+    def play(self, key: str) -> Dict[str, Any]:
+        """
+        Next recording of a request.
+
+        Raises:
+            CassetteMiss: If the request was never recorded
+        """
+        with self._lock:
+            recordings = self._by_key.get(key)
+            if not recordings:
+                raise CassetteMiss(f"No recorded response for {key} in {self.path}")
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            return recordings[min(index, len(recordings) - 1)]
+
+    def save(self) -> None:
+        """Write the cassette (atomically, so an interrupted run never leaves half a file)."""
+        with self._lock:
+            text = json.dumps({'version': 1, 'interactions': self.interactions}, indent=1)
+        atomic_write(self.path, text)
+
+
+def _describe_error(error: requests.exceptions.RequestException) -> Dict[str, Any]:
+    response = getattr(error, 'response', None)
+    if isinstance(error, requests.exceptions.HTTPError) and response is not None:
+        headers = {name: response.headers[name] for name in ('Retry-After',) if name in response.headers}
+        return {'type': 'HTTPError', 'status': response.status_code,
+                'body': (response.content or b'').decode(errors='replace'), 'headers': headers}
+    return {'type': type(error).__name__, 'message': str(error)}
+
+
+def _raise_recorded(error: Dict[str, Any]) -> None:
+    if error['type'] == 'HTTPError':
+        response = requests.Response()
+        response.status_code = error['status']
+        response._content = error.get('body', '').encode()
+        response.headers.update(error.get('headers', {}))
+        raise requests.exceptions.HTTPError(f"{error['status']} Error (recorded)", response=response)
+    error_class = getattr(requests.exceptions, error['type'], None)
+    if not (isinstance(error_class, type) and issubclass(error_class, requests.exceptions.RequestException)):
+        error_class = requests.exceptions.ConnectionError
+    raise error_class(error.get('message', 'recorded error'))
+
+
+def _replay_wait(interaction: Dict[str, Any], speed: float) -> None:
+    if speed > 0:
+        time.sleep(interaction['elapsed'] / speed)
+
+
+def _with_request_ids(recorded: Any, request: Any, response: Any) -> Any:
+    """The recorded response with the ids of the request being answered."""
+    if isinstance(request, dict):
+        return dict(response, id=request.get('id')) if isinstance(response, dict) else response
+    if not isinstance(response, list):
+        return response
+    ids = {old.get('id'): new.get('id') for old, new in zip(recorded, request)}
+    return [dict(item, id=ids.get(item.get('id'), item.get('id'))) if isinstance(item, dict) else item
+            for item in response]
+
+
+class RecordingTransport:
+    """Wraps a transport and records every exchange through it, errors included."""
+
+    def __init__(self, inner: Any, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    def send(self, data: str, timeout: Any = None) -> Tuple[Any, int]:
+        request = json.loads(data)
+        start = time.monotonic()
+        try:
+            result, size = self.inner.send(data, timeout)
+        except requests.exceptions.RequestException as e:
+            self.cassette.record(request_key(request), request, time.monotonic() - start, error=_describe_error(e))
+            raise
+        self.cassette.record(request_key(request), request, time.monotonic() - start, result, size)
+        return result, size
+
+    def close(self) -> None:
+        self.inner.close()
+        self.cassette.save()
+
+
+class ReplayTransport:
+    """Answers from a cassette instead of the network, at the recorded latency scaled by speed."""
+
+    def __init__(self, cassette: Cassette, speed: float = 1.0):
+        """
+        Args:
+            cassette: Recorded session
+            speed: 1.0 replays at the recorded latencies, 2.0 twice as fast, 0 as fast as possible
+        """
+        self.cassette = cassette
+        self.speed = speed
+
+    def send(self, data: str, timeout: Any = None) -> Tuple[Any, int]:
+        """
+        Raises:
+            CassetteMiss: If the request was never recorded
+            requests.exceptions.RequestException: If the recorded exchange ended in one
+        """
+        request = json.loads(data)
+        interaction = self.cassette.play(request_key(request))
+        _replay_wait(interaction, self.speed)
+        if 'error' in interaction:
+            _raise_recorded(interaction['error'])
+        return _with_request_ids(interaction['request'], request, interaction['response']), interaction['bytes']
+
+    def close(self) -> None:
+        pass
+
+
+# One cassette per file in the process, so every client of a command records into (or replays from) the same one
+_CASSETTES: Dict[str, Cassette] = {}
+_CASSETTES_LOCK = threading.Lock()
+
+
+def get_cassette(path: str, mode: str) -> Cassette:
+    """
+    Get the process-wide cassette for a file. Recording appends to an existing cassette,
+    so several CLI runs can build one session; delete the file to start over.
+
+    Raises:
+        ValueError: If a replayed cassette is missing or invalid
+    """
+    key = str(Path(path).expanduser().resolve())
+    with _CASSETTES_LOCK:
+        cassette = _CASSETTES.get(key)
+        if cassette is None:
+            cassette = Cassette.load(path, missing_ok=mode == 'record')
+            _CASSETTES[key] = cassette
+            verb = 'Recording to' if mode == 'record' else 'Replaying'
+            logger.info(f"📼 {verb} cassette {path} ({len(cassette.interactions)} exchanges)")
+        return cassette
+
+
+def wrap_transport(transport: Any, settings: Dict[str, Any]) -> Any:
+    """The transport to use under the cassette settings (see cassette_settings)."""
+    if settings['mode'] is None:
+        return transport
+    cassette = get_cassette(settings['path'], settings['mode'])
+    if settings['mode'] == 'record':
+        return RecordingTransport(transport, cassette)
+    transport.close()
+    return ReplayTransport(cassette, settings['speed'])
+
+
+def get_json(url: str, timeout: Any, settings: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a JSON API (e.g. Etherscan) through the cassette settings. API keys are
+    stripped from recorded URLs, and replay matches on the stripped URL.
+
+    Raises:
+        requests.exceptions.RequestException: On HTTP or network errors
+        CassetteMiss: If a replayed request was never recorded
+    """
+    settings = settings or CASSETTE_DEFAULTS
+    key = f"GET {redact_url(url)}"
+    if settings['mode'] == 'replay':
+        interaction = get_cassette(settings['path'], 'replay').play(key)
+        _replay_wait(interaction, settings['speed'])
+        if 'error' in interaction:
+            _raise_recorded(interaction['error'])
+        return interaction['response']
+
+    start = time.monotonic()
+    try:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.RequestException as e:
+        if settings['mode'] == 'record':
+            cassette = get_cassette(settings['path'], 'record')
+            cassette.record(key, redact_url(url), time.monotonic() - start, error=_describe_error(e))
+            cassette.save()
+        raise
+    if settings['mode'] == 'record':
+        cassette = get_cassette(settings['path'], 'record')
+        cassette.record(key, redact_url(url), time.monotonic() - start, data, len(response.content or b''))
+        cassette.save()
+    return data
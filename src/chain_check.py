@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.settings import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Defaults for rpc.chain_id_check in settings.json
+CHAIN_CHECK_DEFAULTS = {
+    'ttl': 3600,   # Seconds a successful check stays valid
+    'path': None   # JSON file sharing checks between runs; None keeps them in this process only
+}
+
+
+def _url_key(url: str) -> str:
+    """Stable key for an endpoint that does not leak API keys embedded in the URL."""
+    return hashlib.sha256((url or '').encode()).hexdigest()[:16]
+
+
+class ChainIdCache:
+    """
+    Remembers which endpoints were verified to serve which chain, so that the
+    eth_chainId check runs at most once per endpoint per TTL instead of on every
+    RPCClient construction. Checks can be persisted to a small JSON file, written
+    atomically, so that consecutive CLI runs share them.
+    """
+
+    def __init__(self, ttl: float = 3600, path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            ttl: Seconds a check stays valid
+            path: Optional JSON file persisting checks across processes
+            clock: Wall-clock time source (shared across processes when persisted)
+        """
+        self.ttl = ttl
+        self.path = Path(path).expanduser() if path else None
+        self.clock = clock
+        self._checks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._checks.update(self._load())
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                checks = json.load(f)
+            return checks if isinstance(checks, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable chain ID cache {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Write the checks atomically (caller holds the lock)."""
+        try:
+            atomic_write(self.path, json.dumps(self._checks))
+        except OSError as e:
+            logger.warning(f"Could not persist chain ID cache {self.path}: {e}")
+
+    def verified(self, url: str, chain_id: int) -> bool:
+        """Whether the endpoint was seen serving chain_id within the TTL."""
+        with self._lock:
+            check = self._checks.get(_url_key(url))
+            if check is None and self.path is not None:
+                # Another process may have checked it since we loaded
+                self._checks.update(self._load())
+                check = self._checks.get(_url_key(url))
+        return (check is not None and check.get('chain_id') == chain_id
+                and self.clock() - check.get('verified_at', 0) < self.ttl)
+
+    def record(self, url: str, chain_id: int) -> None:
+        """Remember a successful check."""
+        with self._lock:
+            self._checks[_url_key(url)] = {'chain_id': chain_id, 'verified_at': self.clock()}
+            if self.path is not None:
+                self._save()
+
+    def forget(self, url: str) -> None:
+        """Drop the check of an endpoint, e.g. after it answered for another chain."""
+        with self._lock:
+            if self._checks.pop(_url_key(url), None) is not None and self.path is not None:
+                self._save()
+
+
+# One cache per settings per process, so every RPCClient shares the checks
+_CACHES: Dict[tuple, ChainIdCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_chain_id_cache(check_config: Optional[Dict[str, Any]] = None) -> ChainIdCache:
+    """
+    Get the process-wide chain ID cache.
+
+    Args:
+        check_config: The rpc.chain_id_check section of settings.json, e.g.
+            {"ttl": 3600, "path": "~/.cache/ethereum-cli/chain-ids.json"}
+
+    Returns:
+        Shared ChainIdCache
+    """
+    settings = dict(CHAIN_CHECK_DEFAULTS, **(check_config or {}))
+    key = (float(settings['ttl']), settings['path'])
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = ChainIdCache(ttl=float(settings['ttl']), path=settings['path'])
+        return _CACHES[key]
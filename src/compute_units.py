@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, Optional, Union
+
+# Defaults for rpc.compute_units in settings.json. Costs follow common provider price
+# lists; "<method>:full" prices block requests that include full transactions.
+COMPUTE_UNIT_DEFAULTS = {
+    'enabled': False,      # Throttle on the compute-unit budget instead of rpc.rate_limit
+    'default_cost': 20,    # Cost of methods missing from the table
+    'costs': {
+        'eth_chainId': 0,
+        'net_version': 0,
+        'eth_blockNumber': 10,
+        'eth_feeHistory': 10,
+        'eth_maxPriorityFeePerGas': 10,
+        'eth_getTransactionReceipt': 15,
+        'eth_getBlockByNumber': 16,
+        'eth_getBlockByHash': 16,
+        'eth_getBlockByNumber:full': 60,
+        'eth_getBlockByHash:full': 60,
+        'eth_getTransactionByHash': 17,
+        'eth_getBalance': 19,
+        'eth_gasPrice': 20,
+        'eth_getTransactionCount': 26,
+        'eth_getCode': 26,
+        'eth_getStorageAt': 17,
+        'eth_call': 26,
+        'eth_getLogs': 75,
+        'eth_estimateGas': 87,
+        'eth_sendRawTransaction': 250
+    },
+    # Compute units per second, same shape as rpc.rate_limit ("shared" coordinates processes)
+    'budget': {'default': {'rate': 330, 'burst': 660}, 'endpoints': {}}
+}
+
+_FULL_BLOCK_METHODS = {'eth_getBlockByNumber', 'eth_getBlockByHash'}
+
+
+class CostTable:
+    """Per-method compute-unit prices of an RPC provider."""
+
+    def __init__(self, costs: Optional[Dict[str, float]] = None, default_cost: float = 20):
+        """
+        Args:
+            costs: Compute units per method; "<method>:full" prices full-transaction block requests
+            default_cost: Cost of methods missing from costs
+        """
+        self.costs = dict(costs or {})
+        self.default_cost = default_cost
+
+    @classmethod
+    def from_config(cls, cu_config: Optional[Dict[str, Any]] = None) -> 'CostTable':
+        """Build the table from rpc.compute_units in settings.json; listed costs override the defaults."""
+        cu_config = cu_config or {}
+        costs = dict(COMPUTE_UNIT_DEFAULTS['costs'], **cu_config.get('costs', {}))
+        return cls(costs, cu_config.get('default_cost', COMPUTE_UNIT_DEFAULTS['default_cost']))
+
+    def cost(self, method: str, params: Optional[List[Any]] = None) -> float:
+        """Compute units of one call."""
+        if method in _FULL_BLOCK_METHODS and params and len(params) > 1 and params[1] is True:
+            full = self.costs.get(f"{method}:full")
+            if full is not None:
+                return full
+        return self.costs.get(method, self.default_cost)
+
+    def payload_cost(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> float:
+        """Compute units of a JSON-RPC payload; a batch costs the sum of its calls."""
+        if isinstance(payload, list):
+            return sum(self.cost(item['method'], item.get('params')) for item in payload)
+        return self.cost(payload['method'], payload.get('params'))
@@ -0,0 +1,410 @@
+import contextlib
+import contextvars
+import hashlib
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.settings import ENV_PREFIX, read_settings
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+PROJECT_ROOT = str(Path(__file__).parent.parent.resolve())
+
+# Defaults for rpc.daemon in settings.json
+DAEMON_DEFAULTS = {
+    'socket': None,   # Unix socket path; None picks one per checkout in this user's private runtime directory
+    'workers': 16     # Requests run at the same time; further clients wait for a free worker
+}
+
+# Environment variables the commands read. A client whose values differ from the daemon's runs the
+# command itself, so that `RPC_URL=... ./cli balance` never gets an answer from another node
+FORWARDED_ENV = ('RPC_URL', 'ETHERSCAN_API_KEY', 'ETHERSCAN_API_URL', 'RPC_CASSETTE', 'RPC_CASSETTE_SPEED',
+                 'RPC_CALL_BUDGET')
+# ... and the families of variables settings.json may reference or be overridden by: the endpoints of
+# network profiles (HOLESKY_RPC_URL, MAINNET_RPC_URL, ...) and CLI_SETTINGS_* overrides
+FORWARDED_ENV_SUFFIX = '_RPC_URL'
+
+# Seconds a client waits to connect; a daemon that does not accept by then is treated as absent
+CONNECT_TIMEOUT = 1.0
+
+
+def daemon_settings() -> Dict[str, Any]:
+    """rpc.daemon from settings.json over DAEMON_DEFAULTS; CLI_DAEMON_SOCKET overrides the socket path."""
+    try:
+        configured = read_settings(CONFIG_PATH).get('rpc', {}).get('daemon', {})
+    except ValueError:
+        configured = {}
+    settings = dict(DAEMON_DEFAULTS, **configured)
+    settings['socket'] = os.getenv('CLI_DAEMON_SOCKET') or settings['socket'] or default_socket_path()
+    return settings
+
+
+def default_socket_path() -> str:
+    """
+    Socket of this user's daemon for this checkout, so that two checkouts never answer for each other.
+
+    It lives in $XDG_RUNTIME_DIR, or else in an ethereum-cli-<uid> directory in the temp directory that
+    Daemon.start creates with mode 0700, never directly in the shared temp directory.
+    """
+    checkout = hashlib.sha1(PROJECT_ROOT.encode()).hexdigest()[:8]
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if not runtime_dir or not os.path.isdir(runtime_dir):
+        user = os.getuid() if hasattr(os, 'getuid') else os.getenv('USERNAME', 'user')
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"ethereum-cli-{user}")
+    return os.path.join(runtime_dir, f"ethereum-cli-{checkout}.sock")
+
+
+def _private_dir(path: str) -> None:
+    """
+    Create the socket's directory with mode 0700, or check that an existing one is this user's own.
+
+    Raises:
+        ConnectionError: If the directory belongs to another user or others may write to it
+    """
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(path, 0o700)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise ConnectionError(f"{path} is not a private directory of this user; set rpc.daemon.socket "
+                              f"or CLI_DAEMON_SOCKET to a path in one")
+
+
+def _check_socket(path: str) -> None:
+    """
+    Check that path is a socket owned by this user before sending it anything: requests carry the
+    command line and environment, which may hold a password or private key.
+
+    Raises:
+        ConnectionError: If there is nothing at path, or it is not this user's socket
+    """
+    try:
+        info = os.lstat(path)
+    except OSError as e:
+        raise ConnectionError(f"No daemon at {path}: {e}") from e
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise ConnectionError(f"{path} is not a socket of this user's daemon")
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """User ID of the process at the other end of a Unix socket, or None where the platform does not tell."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _pid, uid, _gid = struct.unpack('3i', credentials)
+    return uid
+
+
+def _client_env() -> Dict[str, Optional[str]]:
+    env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+    env.update((name, value) for name, value in os.environ.items()
+               if name.endswith(FORWARDED_ENV_SUFFIX) or name.startswith(ENV_PREFIX))
+    return env
+
+
+def _exchange(path: str, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send one request line to the daemon at path and read its one-line reply.
+
+    Raises:
+        ConnectionError: If no daemon of this user answers at path
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ConnectionError("Unix sockets are not available on this platform")
+    _check_socket(path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+    except OSError as e:
+        raise ConnectionError(f"No daemon at {path}: {e}") from e
+    if not line:
+        raise ConnectionError(f"Daemon at {path} closed the connection without replying")
+    return json.loads(line)
+
+
+def forward_to_daemon(argv: List[str]) -> Optional[int]:
+    """
+    Run a CLI command in the daemon, if one is running, and print its output here.
+
+    Returns:
+        The command's exit code, or None if the command must run in this process (no daemon,
+        CLI_NO_DAEMON=1, or a daemon started with other settings)
+    """
+    if os.getenv('CLI_NO_DAEMON') == '1':
+        return None
+    path = daemon_settings()['socket']
+    if not os.path.exists(path):
+        return None
+    try:
+        reply = _exchange(path, {'argv': argv, 'env': _client_env(), 'root': PROJECT_ROOT})
+    except (ConnectionError, ValueError) as e:
+        logger.debug(f"Running locally: {e}")
+        return None
+    if 'fallback' in reply:
+        logger.debug(f"Running locally: {reply['fallback']}")
+        return None
+    sys.stdout.write(reply.get('stdout', ''))
+    sys.stderr.write(reply.get('stderr', ''))
+    sys.stdout.flush()
+    return reply.get('exit_code', 1)
+
+
+def daemon_request(op: str, path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send a control request ('status' or 'stop') to the daemon.
+
+    Raises:
+        ConnectionError: If no daemon is running
+    """
+    return _exchange(path or daemon_settings()['socket'], {'op': op}, timeout=CONNECT_TIMEOUT * 5)
+
+
+class _RequestOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that sends each thread's writes to the request it is serving."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        target = getattr(self._local, 'buffer', None) or self._fallback
+        return target.write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, 'buffer', None) is None:
+            self._fallback.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    @contextlib.contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+
+class Daemon:
+    """
+    Serves CLI commands over a Unix socket from one long-lived process, so that commands skip the
+    interpreter start and imports, and share warm RPC connections, the response cache, the gas
+    oracle and the chain ID check (see rpc_client.keep_warm).
+
+    Each request runs in its own thread with its own stdout, stderr, command name and call usage,
+    so concurrent clients never see each other's output or budgets.
+    """
+
+    def __init__(self, path: Optional[str] = None, workers: Optional[int] = None):
+        settings = daemon_settings()
+        self.path = path or settings['socket']
+        self.workers = workers or settings['workers']
+        self.env = _client_env()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._server = None
+        self._thread = None
+        self._stdout = self._stderr = None
+        self._served = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self, prewarm: bool = False) -> 'Daemon':
+        """Listen on the socket and serve requests in a background thread."""
+        import importlib
+        import socketserver
+        from src.rpc_client import keep_warm
+        # Importing the command modules up front is the cold start every request then skips
+        for module in ('wallet', 'transaction', 'src.transaction'):
+            importlib.import_module(module)
+
+        _private_dir(os.path.dirname(os.path.abspath(self.path)))
+        if os.path.exists(self.path):
+            try:
+                daemon_request('status', self.path)
+            except ConnectionError:
+                os.unlink(self.path)  # Left behind by a daemon that did not shut down cleanly
+            else:
+                raise ConnectionError(f"A daemon is already running at {self.path}")
+
+        keep_warm(True)
+        self._stdout, self._stderr = _RequestOutput(sys.stdout), _RequestOutput(sys.stderr)
+        sys.stdout, sys.stderr = self._stdout, self._stderr
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is self._stderr._fallback:
+                handler.setStream(self._stderr)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                uid = _peer_uid(self.connection)
+                if uid is not None and uid != os.getuid():
+                    logger.warning(f"⚠️ Refused a connection from user {uid}")
+                    return
+                line = self.rfile.readline()
+                if line:
+                    self.wfile.write(json.dumps(daemon.handle(json.loads(line))).encode() + b'\n')
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        previous_umask = os.umask(0o177)  # Only this user may connect
+        try:
+            self._server = Server(self.path, Handler)
+        finally:
+            os.umask(previous_umask)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='cli-daemon', daemon=True)
+        self._thread.start()
+        logger.info(f"🛰️ Daemon serving on {self.path} with {self.workers} workers")
+        if prewarm:
+            self._prewarm()
+        return self
+
+    def _prewarm(self) -> None:
+        """Check the chain ID and open a connection, so that the first command starts warm too."""
+        from src.rpc_client import RPCClient
+        try:
+            client = RPCClient()
+            try:
+                client.get_chain_id()
+            finally:
+                client.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not warm up the RPC connection: {e}")
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one request: a control op, or a CLI command to run."""
+        op = request.get('op')
+        if op == 'status':
+            from src.rpc_client import warm_configurations
+            with self._lock:
+                served = self._served
+            return {'pid': os.getpid(), 'socket': self.path, 'workers': self.workers, 'served': served,
+                    'warm_clients': warm_configurations()}
+        if op == 'stop':
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {'stopping': True}
+        if request.get('root') != PROJECT_ROOT:
+            return {'fallback': f"daemon serves {PROJECT_ROOT}"}
+        if request.get('env') != self.env:
+            env = request.get('env', {})
+            changed = sorted(name for name in set(env) | set(self.env) if env.get(name) != self.env.get(name))
+            return {'fallback': f"environment differs from the daemon's ({', '.join(changed)})"}
+        with self._slots:
+            # A fresh context per request: its own command name and call usage
+            return contextvars.Context().run(self._run, request['argv'])
+
+    def _run(self, argv: List[str]) -> Dict[str, Any]:
+        from src import main
+        from src.call_budget import isolated_usage
+        exit_code = 0
+        with self._stdout.capture() as stdout, self._stderr.capture() as stderr, isolated_usage():
+            try:
+                main.run(argv, forward=False)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                if isinstance(e.code, str):
+                    stderr.write(e.code + '\n')
+            except Exception as e:
+                logger.error(f"❌ {' '.join(argv)} failed in the daemon: {e}")
+                exit_code = 1
+        with self._lock:
+            self._served += 1
+        return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
+
+    def serve_forever(self) -> None:
+        """Block until the daemon has stopped (./cli daemon stop)."""
+        self._stopped.wait()
+
+    def stop(self) -> None:
+        """Stop serving, remove the socket and close the warm RPC connections."""
+        from src.rpc_client import keep_warm
+        with self._lock:
+            server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        keep_warm(False)
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is self._stderr:
+                handler.setStream(self._stderr._fallback)
+        sys.stdout, sys.stderr = self._stdout._fallback, self._stderr._fallback
+        # Removed last, so that a gone socket means the daemon has fully stopped
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._stopped.set()
+        logger.info("🛑 Daemon stopped")
+
+
+def _start_detached(path: str) -> None:
+    """Start `./cli daemon start` in its own session, logging next to the socket, and wait for it to listen."""
+    import subprocess
+    import time
+    log_path = path + '.log'
+    with open(log_path, 'ab') as log:
+        process = subprocess.Popen([sys.executable, os.path.join(PROJECT_ROOT, 'cli'), 'daemon', 'start'],
+                                   stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            daemon_request('status', path)
+            print(f"Daemon started (pid {process.pid}) on {path}; log: {log_path}")
+            return
+        except ConnectionError:
+            time.sleep(0.05)
+    print(f"Error: Daemon did not start, see {log_path}")
+    exit(1)
+
+
+def daemon_command(action: str, detach: bool = False) -> None:
+    """
+    CLI command: Manage the daemon.
+    Supports: ./cli daemon start [--detach] | stop | status
+    """
+    path = daemon_settings()['socket']
+    if action == 'start':
+        try:
+            status = daemon_request('status', path)
+            print(f"Daemon already running (pid {status['pid']}) on {path}")
+            return
+        except ConnectionError:
+            pass
+        if detach:
+            _start_detached(path)
+            return
+        daemon = Daemon(path).start(prewarm=True)
+        print(f"Daemon serving on {path} (./cli daemon stop to stop it)")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            daemon.stop()
+        return
+
+    try:
+        reply = daemon_request(action, path)
+    except ConnectionError:
+        print(f"No daemon running on {path}")
+        exit(1 if action == 'status' else 0)
+    if action == 'stop':
+        print(f"Daemon on {path} stopping")
+    else:
+        print(f"Daemon running (pid {reply['pid']}) on {reply['socket']}")
+        print(f"Workers: {reply['workers']}, commands served: {reply['served']}, "
+              f"warm RPC clients: {reply['warm_clients']}")
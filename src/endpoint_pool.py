@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Methods that change chain state are routed to the 'write' group, everything else to 'read'
+WRITE_METHODS = {'eth_sendRawTransaction', 'eth_sendTransaction'}
+GROUPS = ('read', 'write')
+
+# Smoothing factors for the moving averages (higher reacts faster)
+LATENCY_ALPHA = 0.3
+ERROR_ALPHA = 0.2
+# How long an endpoint is avoided after a 429 or repeated failures
+THROTTLE_COOLDOWN = 5.0
+FAILURE_COOLDOWN = 10.0
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class Endpoint:
+    """One RPC endpoint with its routing weight, groups, rate limiter and health statistics."""
+
+    def __init__(self, url: str, weight: float = 1.0, groups: Iterable[str] = GROUPS, rate_limiter: Any = None):
+        if weight <= 0:
+            raise ValueError(f"Endpoint weight must be positive: {url}")
+        unknown = set(groups) - set(GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown endpoint group(s) for {url}: {', '.join(sorted(unknown))}")
+        self.url = url
+        self.weight = float(weight)
+        self.groups = frozenset(groups)
+        self.rate_limiter = rate_limiter
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def score(self) -> float:
+        """Routing cost, lower is better: expected latency inflated by errors, divided by weight."""
+        latency = self.latency_ewma if self.latency_ewma is not None else 0.0
+        return latency * (1 + 10 * self.error_rate) / self.weight
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'weight': self.weight,
+            'groups': sorted(self.groups),
+            'latency_ms': round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'requests': self.requests,
+            'failures': self.failures,
+            'cooling_down': self.cooldown_until > now
+        }
+
+
+class EndpointPool:
+    """
+    Routes each call to the healthiest endpoint of its group.
+
+    Health is a moving average of latency and error rate per endpoint. Endpoints that
+    return 429 or fail repeatedly are put on a short cooldown and only used again when
+    nothing healthier is left, so callers can fail over instantly instead of sleeping.
+    """
+
+    def __init__(self, endpoints: List[Endpoint], clock=time.monotonic):
+        if not endpoints:
+            raise ValueError("Endpoint pool needs at least one endpoint")
+        for group in GROUPS:
+            if not any(group in endpoint.groups for endpoint in endpoints):
+                raise ValueError(f"No endpoint configured for '{group}' calls")
+        self.endpoints = endpoints
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, rpc_config: Dict[str, Any], rpc_url: Optional[str] = None) -> 'EndpointPool':
+        """
+        Build a pool from the rpc section of settings.json.
+
+        Args:
+            rpc_config: e.g. {"endpoints": [{"url": "${RPC_URL}", "weight": 2, "groups": ["read", "write"]},
+                                             {"url": "https://backup.example", "groups": ["read"]}]}
+                URLs may reference environment variables. Entries whose variables are unset are skipped.
+            rpc_url: Explicit endpoint; when given it is the only endpoint in the pool
+
+        Returns:
+            Configured EndpointPool
+
+        Raises:
+            ValueError: If no endpoint is left: rpc_url, rpc.endpoints and RPC_URL are all unset
+        """
+        rate_config = rpc_config.get('rate_limit')
+        if rpc_url:
+            entries = [{'url': rpc_url}]
+        else:
+            entries = cls.configured_endpoints(rpc_config) or [{'url': os.getenv('RPC_URL')}]
+        if not all(entry['url'] for entry in entries):
+            raise ValueError("No RPC endpoint configured: set RPC_URL or rpc.endpoints")
+
+        return cls([
+            Endpoint(
+                url=entry['url'],
+                weight=entry.get('weight', 1.0),
+                groups=entry.get('groups', GROUPS),
+                rate_limiter=get_rate_limiter(entry['url'], rate_config)
+            )
+            for entry in entries
+        ])
+
+    @staticmethod
+    def configured_endpoints(rpc_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """rpc.endpoints entries with their environment variables expanded, leaving out those referencing unset ones."""
+        entries = []
+        for entry in rpc_config.get('endpoints', []):
+            url = os.path.expandvars(entry.get('url', ''))
+            if url and '$' not in url:
+                entries.append(dict(entry, url=url))
+        return entries
+
+    @staticmethod
+    def group_for(methods: Iterable[str]) -> str:
+        """'write' if any of the methods changes state, otherwise 'read'."""
+        return 'write' if any(method in WRITE_METHODS for method in methods) else 'read'
+
+    def members(self, group: str) -> List[Endpoint]:
+        return [endpoint for endpoint in self.endpoints if group in endpoint.groups]
+
+    def select(self, group: str, exclude: Iterable[str] = ()) -> Optional[Endpoint]:
+        """
+        Pick the healthiest endpoint of a group.
+
+        Args:
+            group: 'read' or 'write'
+            exclude: URLs already tried for the current call
+
+        Returns:
+            Best endpoint, or None if every member of the group is excluded
+        """
+        exclude = set(exclude)
+        now = self.clock()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.members(group) if endpoint.url not in exclude]
+            if not candidates:
+                return None
+            ready = [endpoint for endpoint in candidates if endpoint.cooldown_until <= now]
+            if ready:
+                return min(ready, key=lambda endpoint: (endpoint.score(), -endpoint.weight))
+            # Everything is cooling down: use the one that recovers first
+            return min(candidates, key=lambda endpoint: endpoint.cooldown_until)
+
+    def record_success(self, endpoint: Endpoint, latency: float) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            if endpoint.latency_ewma is None:
+                endpoint.latency_ewma = latency
+            else:
+                endpoint.latency_ewma += LATENCY_ALPHA * (latency - endpoint.latency_ewma)
+            endpoint.error_rate *= (1 - ERROR_ALPHA)
+            endpoint.consecutive_failures = 0
+
+    def record_failure(self, endpoint: Endpoint, throttled: bool = False) -> None:
+        now = self.clock()
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.failures += 1
+            endpoint.error_rate += ERROR_ALPHA * (1 - endpoint.error_rate)
+            endpoint.consecutive_failures += 1
+            if throttled:
+                endpoint.cooldown_until = max(endpoint.cooldown_until, now + THROTTLE_COOLDOWN)
+            elif endpoint.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                endpoint.cooldown_until = max(endpoint.cooldown_until, now + FAILURE_COOLDOWN)
+        if len(self.endpoints) > 1:
+            logger.warning(f"Endpoint {endpoint.url} marked unhealthy (error rate {endpoint.error_rate:.2f})")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Health statistics of every endpoint."""
+        now = self.clock()
+        with self._lock:
+            return [endpoint.snapshot(now) for endpoint in self.endpoints]
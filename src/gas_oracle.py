@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults for rpc.gas_oracle in settings.json
+GAS_ORACLE_DEFAULTS = {
+    'ttl': 12.0,                 # Seconds a quote is served without asking the node (about one block)
+    'background_refresh': False, # Refresh in a daemon thread in long-lived processes
+    'refresh_interval': None     # Seconds between background refreshes, defaults to the TTL
+}
+
+
+class GasQuote(NamedTuple):
+    """A gas price in wei and the clock time it was fetched at."""
+    price_wei: int
+    fetched_at: float
+
+
+class GasPriceOracle:
+    """
+    Caches the network gas price.
+
+    The last quote is served until it is older than the TTL (or than the max_age a
+    caller demands), then fetched again. Quotes obtained elsewhere, e.g. in a batch,
+    can be fed in with update(). Long-lived processes can keep the quote warm with
+    a background refresh thread.
+    """
+
+    def __init__(self, fetch: Callable[[], str], ttl: float = 12.0, default_gwei: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            fetch: Returns an eth_gasPrice result (hex wei)
+            ttl: Seconds a quote stays fresh
+            default_gwei: Price used when the node reports zero
+            clock: Time source in seconds (injectable for tests)
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.default_gwei = default_gwei
+        self.clock = clock
+        self._quote: Optional[GasQuote] = None
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop = threading.Event()
+
+    def _max_age(self, max_age: Optional[float]) -> float:
+        return self.ttl if max_age is None else max_age
+
+    def peek(self, max_age: Optional[float] = None) -> Optional[GasQuote]:
+        """The cached quote if it is fresh enough, without fetching."""
+        quote = self._quote
+        if quote is not None and self.clock() - quote.fetched_at <= self._max_age(max_age):
+            return quote
+        return None
+
+    def quote(self, max_age: Optional[float] = None) -> GasQuote:
+        """
+        Get a quote no older than max_age seconds (default: the TTL), fetching if needed.
+
+        Raises:
+            Whatever fetch raises when a fresh quote is needed and the node is unreachable
+        """
+        quote = self.peek(max_age)
+        if quote is not None:
+            return quote
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            quote = self.peek(max_age)
+            if quote is None:
+                quote = self.update(self.fetch())
+        return quote
+
+    def update(self, gas_price_hex: str) -> GasQuote:
+        """Store an eth_gasPrice result, replacing a zero price with the default."""
+        gas_price_wei = int(gas_price_hex, 16)
+        if gas_price_wei == 0:
+            logger.warning(f"Zero gas price received, using default {self.default_gwei} Gwei")
+            gas_price_wei = int(self.default_gwei * 1_000_000_000)
+        self._quote = GasQuote(gas_price_wei, self.clock())
+        return self._quote
+
+    def age(self) -> Optional[float]:
+        """Seconds since the current quote was fetched, or None before the first quote."""
+        quote = self._quote
+        return None if quote is None else self.clock() - quote.fetched_at
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Refresh the quote every interval seconds (default: the TTL) in a daemon thread."""
+        if self._refresh_thread is not None:
+            return
+        interval = interval or self.ttl
+        self._stop.clear()
+
+        def refresh():
+            while not self._stop.is_set():
+                try:
+                    with self._lock:
+                        self.update(self.fetch())
+                except Exception as e:
+                    logger.warning(f"Background gas price refresh failed: {e}")
+                self._stop.wait(interval)
+
+        self._refresh_thread = threading.Thread(target=refresh, name='gas-oracle-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        if self._refresh_thread is not None:
+            self._stop.set()
+            self._refresh_thread.join()
+            self._refresh_thread = None
@@ -1,10 +1,14 @@
 import argparse
+import importlib
 import logging
-from typing import Optional
-from wallet import WalletManager, wallet_generate, wallet_import, wallet_show, wallet_list, wallet_use
-from transaction import TransactionManager, transaction_send, transaction_status, transaction_history, \
-    transaction_export
-from rpc_client import RPCClient
+import sys
+from typing import Callable, List, Optional
+# Command modules (wallet, transaction, rpc_client) are imported by the command that runs them (see _lazy),
+# so --help and offline commands like `wallet list` never load eth_account, requests or the crypto libraries.
+# Imported through the src package so the command reaches the same module the RPC clients report to
+from src.metrics import set_command, stats_show
+from src.call_budget import CallBudgetExceeded, finish_command
+from src.daemon import daemon_command, forward_to_daemon
 
 # Setup logging
 logging.basicConfig(
@@ -14,14 +18,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def balance(address: Optional[str] = None) -> None:
+def _lazy(module: str, function: str) -> Callable[..., None]:
+    """Command handler that imports its module only when the command runs."""
+    def handler(*args):
+        return getattr(importlib.import_module(module), function)(*args)
+    handler.__name__ = function
+    return handler
+
+
+def balance(address: Optional[str] = None, networks: Optional[str] = None) -> None:
     """
-    CLI command: Check wallet balance.
-    Supports: ./cli balance [--address [address]]
+    CLI command: Check wallet balance, on one network or on several at once.
+    Supports: ./cli balance [--address [address]] [--networks all|sepolia,holesky,...]
     """
+    from wallet import WalletManager
+    from src.rpc_client import RPCClient
+    rpc_client = None
     try:
         wallet_manager = WalletManager()
-        rpc_client = RPCClient()
         # Use default wallet if no address specified
         if not address:
             address = wallet_manager.get_default_wallet()
@@ -33,22 +47,55 @@ def balance(address: Optional[str] = None) -> None:
             print(f"Error: Invalid address: {address}")
             exit(1)
 
-        balance_eth = rpc_client.get_balance(address, 'ether')
+        if networks:
+            _balance_on_networks(address, networks)
+            return
+
+        # One call: the ether amount is converted locally
+        rpc_client = RPCClient()
         balance_wei = rpc_client.get_balance(address, 'wei')
         print(f"Address: {address}")
-        print(f"Balance: {balance_eth:.6f} ETH")
+        print(f"Balance: {balance_wei / 1_000_000_000_000_000_000:.6f} ETH")
         print(f"Balance: {balance_wei:,} Wei")
     except Exception as e:
         print(f"Error: {e}")
         exit(1)
     finally:
-        rpc_client.close()
+        if rpc_client is not None:
+            rpc_client.close()
+
+
+def _balance_on_networks(address: str, networks: str) -> None:
+    """Query the balance on every selected network concurrently; exits 1 if any selected network could not answer."""
+    from src.networks import fan_out, network_settings, resolve_networks, skipped_networks
+    settings = network_settings()
+    results = fan_out(resolve_networks(networks, settings), lambda client: client.get_balance(address, 'wei'),
+                      settings)
+    skipped = skipped_networks(networks, settings)
+    print(f"Address: {address}")
+    failed = False
+    for name, balance_wei in results.items():
+        profile = settings.networks[name]
+        if isinstance(balance_wei, Exception):
+            failed = True
+            print(f"{name} ({profile.name}): Error: {balance_wei}")
+        else:
+            print(f"{name} ({profile.name}): {balance_wei / 1_000_000_000_000_000_000:.6f} {profile.currency_symbol} "
+                  f"({balance_wei:,} Wei)")
+    if skipped:
+        print(f"Skipped (no RPC endpoint set): {', '.join(skipped)}")
+    if failed:
+        exit(1)
 
 
-def run():
+def run(argv: Optional[List[str]] = None, forward: bool = True):
     """
     Main CLI entry point for Ethereum CLI on Sepolia Testnet.
-    Supports: ./cli [wallet|balance|send|tx] ...
+    Supports: ./cli [wallet|balance|send|tx|stats|daemon] ...
+
+    Args:
+        argv: Arguments to run (default: the command line)
+        forward: Hand the command to a running ./cli daemon, if there is one
     """
     parser = argparse.ArgumentParser(description="Ethereum CLI for Sepolia Testnet")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -60,33 +107,34 @@ def run():
     # Wallet generate
     wallet_generate_parser = wallet_subparsers.add_parser("generate", help="Generate new wallet")
     wallet_generate_parser.add_argument("--password", required=True, help="Password for encryption")
-    wallet_generate_parser.set_defaults(func=wallet_generate)
+    wallet_generate_parser.set_defaults(func=_lazy('wallet', 'wallet_generate'))
 
     # Wallet import
     wallet_import_parser = wallet_subparsers.add_parser("import", help="Import existing wallet")
     wallet_import_parser.add_argument("--private-key", required=True, help="Private key to import")
     wallet_import_parser.add_argument("--password", required=True, help="Password for encryption")
-    wallet_import_parser.set_defaults(func=wallet_import)
+    wallet_import_parser.set_defaults(func=_lazy('wallet', 'wallet_import'))
 
     # Wallet show
     wallet_show_parser = wallet_subparsers.add_parser("show", help="Show wallet information")
     wallet_show_parser.add_argument("--address",
                                     help="Specific wallet address (optional, uses default wallet if not specified)")
     wallet_show_parser.add_argument("--password", help="Password for private key access (optional)")
-    wallet_show_parser.set_defaults(func=wallet_show)
+    wallet_show_parser.set_defaults(func=_lazy('wallet', 'wallet_show'))
 
     # Wallet list
     wallet_list_parser = wallet_subparsers.add_parser("list", help="List all wallets")
-    wallet_list_parser.set_defaults(func=wallet_list)
+    wallet_list_parser.set_defaults(func=_lazy('wallet', 'wallet_list'))
 
     # Wallet use
     wallet_use_parser = wallet_subparsers.add_parser("use", help="Set default wallet")
     wallet_use_parser.add_argument("--address", required=True, help="Wallet address to set as default")
-    wallet_use_parser.set_defaults(func=wallet_use)
+    wallet_use_parser.set_defaults(func=_lazy('wallet', 'wallet_use'))
 
     # Balance command
     balance_parser = subparsers.add_parser("balance", help="Check wallet balance")
     balance_parser.add_argument("--address", help="Wallet address (optional, uses default wallet if not specified)")
+    balance_parser.add_argument("--networks", help="Network profiles to query at once: 'all' or e.g. sepolia,holesky")
     balance_parser.set_defaults(func=balance)
 
     # Transaction commands
@@ -96,30 +144,60 @@ def run():
     tx_parser.add_argument("--from", dest="from_address",
                            help="Sender address (optional, uses default wallet if not specified)")
     tx_parser.add_argument("--password", required=True, help="Wallet password")
-    tx_parser.set_defaults(func=transaction_send)
+    tx_parser.set_defaults(func=_lazy('transaction', 'transaction_send'))
 
     tx_status_parser = subparsers.add_parser("tx", help="Transaction commands")
     tx_status_subparsers = tx_status_parser.add_subparsers(dest="tx_command", help="Transaction subcommands")
 
     tx_status_subparser = tx_status_subparsers.add_parser("status", help="Check transaction status")
     tx_status_subparser.add_argument("--hash", required=True, help="Transaction hash")
-    tx_status_subparser.set_defaults(func=transaction_status)
+    tx_status_subparser.add_argument("--networks",
+                                     help="Network profiles to look on at once: 'all' or e.g. sepolia,holesky")
+    tx_status_subparser.set_defaults(func=_lazy('transaction', 'transaction_status'))
 
     tx_history_parser = tx_status_subparsers.add_parser("history", help="Fetch transaction history")
     tx_history_parser.add_argument("--address", help="Wallet address (optional, uses default wallet if not specified)")
-    tx_history_parser.set_defaults(func=transaction_history)
+    tx_history_parser.set_defaults(func=_lazy('transaction', 'transaction_history'))
 
     tx_export_parser = tx_status_subparsers.add_parser("export", help="Export transaction history to JSON")
     tx_export_parser.add_argument("--address", help="Wallet address (optional, uses default wallet if not specified)")
     tx_export_parser.add_argument("--output", help="Output filename (optional, default.txt to tx_history_<address>.json)")
-    tx_export_parser.set_defaults(func=transaction_export)
+    tx_export_parser.set_defaults(func=_lazy('transaction', 'transaction_export'))
+
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show RPC metrics collected across runs")
+    stats_parser.add_argument("--prometheus", help="Also write the metrics as a Prometheus textfile")
+    stats_parser.add_argument("--reset", action="store_true", help="Clear the collected metrics after showing them")
+    stats_parser.set_defaults(func=stats_show)
 
-    args = parser.parse_args()
+    # Daemon commands
+    daemon_parser = subparsers.add_parser("daemon", help="Serve commands from a long-lived process")
+    daemon_subparsers = daemon_parser.add_subparsers(dest="daemon_command", help="Daemon subcommands")
+    daemon_start_parser = daemon_subparsers.add_parser("start", help="Start the daemon")
+    daemon_start_parser.add_argument("--detach", action="store_true", help="Run in the background")
+    daemon_subparsers.add_parser("stop", help="Stop the daemon")
+    daemon_subparsers.add_parser("status", help="Show whether the daemon is running")
+    daemon_parser.set_defaults(func=daemon_command)
+
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         exit(1)
 
+    # A running daemon answers with warm connections and imports; it runs this same function with forward=False
+    if forward and args.command != "daemon":
+        exit_code = forward_to_daemon(list(argv) if argv is not None else sys.argv[1:])
+        if exit_code is not None:
+            if exit_code:
+                exit(exit_code)
+            return
+
+    # RPC clients report their compute-unit spend and calls under this command
+    command = " ".join(filter(None, [args.command, getattr(args, 'wallet_command', None),
+                                     getattr(args, 'tx_command', None), getattr(args, 'daemon_command', None)]))
+    set_command(command)
+
     # Call the appropriate function with filtered arguments
     if args.command == "wallet":
         if not args.wallet_command:
@@ -136,7 +214,7 @@ def run():
         elif args.wallet_command == "use":
             args.func(args.address)
     elif args.command == "balance":
-        args.func(args.address)
+        args.func(args.address, args.networks)
     elif args.command == "send":
         args.func(args.to, args.amount, args.password, args.from_address)
     elif args.command == "tx":
@@ -144,11 +222,25 @@ def run():
             tx_status_parser.print_help()
             exit(1)
         if args.tx_command == "status":
-            args.func(args.hash)
+            args.func(args.hash, args.networks)
         elif args.tx_command == "history":
             args.func(args.address)
         elif args.tx_command == "export":
             args.func(args.address, args.output)
+    elif args.command == "stats":
+        args.func(args.prometheus, args.reset)
+    elif args.command == "daemon":
+        if not args.daemon_command:
+            daemon_parser.print_help()
+            exit(1)
+        args.func(args.daemon_command, getattr(args, 'detach', False))
+
+    # Fails the run when rpc.call_budget.enforce (or RPC_CALL_BUDGET=enforce) is set and the command went over budget
+    try:
+        finish_command(command)
+    except CallBudgetExceeded as e:
+        print(f"Error: {e}")
+        exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,357 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.settings import atomic_write, read_settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+# Configuration path
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; fixed so that runs can be merged
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+
+# Defaults for rpc.metrics in settings.json
+METRICS_DEFAULTS = {
+    'path': None,                # JSON file accumulating metrics across runs (read by ./cli stats)
+    'prometheus_textfile': None  # Prometheus textfile collector output, rewritten on every client close
+}
+
+_COUNTERS = ('requests', 'errors', 'retries', 'throttled', 'bytes_sent', 'bytes_received', 'rate_limit_wait_s',
+             'compute_units')
+
+# CLI command being run (see set_command), used to report spend per command; a context variable,
+# so that concurrent requests of ./cli daemon each report their own
+_command: contextvars.ContextVar = contextvars.ContextVar('cli_command', default=None)
+
+
+def set_command(command: Optional[str]) -> None:
+    """Name the CLI command whose RPC usage the current context reports (e.g. 'tx history')."""
+    _command.set(command)
+
+
+def current_command() -> Optional[str]:
+    return _command.get()
+
+
+def endpoint_label(url: str) -> str:
+    """Host of an endpoint, so that API keys in URL paths never end up in metrics."""
+    parts = urlsplit(url or '')
+    return parts.hostname or parts.path or 'unknown'
+
+
+class Histogram:
+    """Latency histogram keeping a per-bucket (non-cumulative) count for each of LATENCY_BUCKETS."""
+
+    def __init__(self, counts: Optional[List[int]] = None, total: float = 0.0):
+        self.counts = list(counts) if counts else [0] * len(LATENCY_BUCKETS)
+        self.total = total
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[index] += 1
+                break
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket (like Prometheus histogram_quantile)."""
+        count = self.count
+        if count == 0:
+            return None
+        rank = q * count
+        seen = 0
+        lower = 0.0
+        for bucket_count, bound in zip(self.counts, LATENCY_BUCKETS):
+            if seen + bucket_count >= rank and bucket_count > 0:
+                if bound == float('inf'):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = bound if bound != float('inf') else lower
+        return lower
+
+    def merge(self, other: 'Histogram') -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+
+class CallStats:
+    """Counters and latency histogram of one (method, endpoint) pair."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rate_limit_wait_s = 0.0
+        self.compute_units = 0.0
+        self.latency = Histogram()
+
+    def merge(self, other: 'CallStats') -> None:
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.latency.merge(other.latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in _COUNTERS}
+        data['latency_buckets'] = self.latency.counts
+        data['latency_sum_s'] = self.latency.total
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CallStats':
+        stats = cls()
+        for name in _COUNTERS:
+            setattr(stats, name, data.get(name, 0))
+        counts = data.get('latency_buckets')
+        if counts and len(counts) == len(LATENCY_BUCKETS):
+            stats.latency = Histogram(counts, data.get('latency_sum_s', 0.0))
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(q):
+            value = self.latency.quantile(q)
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'rate_limit_wait_s': round(self.rate_limit_wait_s, 3),
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'compute_units': self.compute_units,
+            'p50_ms': ms(0.5),
+            'p90_ms': ms(0.9),
+            'p99_ms': ms(0.99)
+        }
+
+
+class RPCMetrics:
+    """
+    Per-method, per-endpoint RPC metrics: latency histograms, retries, 429s, time spent
+    waiting on the rate limiter, request/response sizes and provider compute units, plus
+    compute units spent per CLI command. Thread-safe.
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], CallStats] = {}
+        self._commands: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, method: str, url: str) -> CallStats:
+        key = (method, endpoint_label(url))
+        if key not in self._stats:
+            self._stats[key] = CallStats()
+        return self._stats[key]
+
+    def record_request(self, method: str, url: str, latency: Optional[float], bytes_sent: int = 0,
+                       bytes_received: int = 0, ok: bool = True, compute_units: float = 0) -> None:
+        """Record one attempt (latency is None when no response arrived); failed attempts are billed too."""
+        with self._lock:
+            stats = self._get(method, url)
+            stats.requests += 1
+            stats.compute_units += compute_units
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if not ok:
+                stats.errors += 1
+            if latency is not None:
+                stats.latency.observe(latency)
+
+    def record_retry(self, method: str, url: str, throttled: bool = False) -> None:
+        with self._lock:
+            stats = self._get(method, url)
+            stats.retries += 1
+            if throttled:
+                stats.throttled += 1
+
+    def record_rate_limit_wait(self, method: str, url: str, seconds: float) -> None:
+        if seconds > 0:
+            with self._lock:
+                self._get(method, url).rate_limit_wait_s += seconds
+
+    def record_command(self, command: str, requests: int, compute_units: float) -> None:
+        """Add a client's spend to the totals of the CLI command it served."""
+        with self._lock:
+            spend = self._commands.setdefault(command, {'requests': 0, 'compute_units': 0})
+            spend['requests'] += requests
+            spend['compute_units'] += compute_units
+
+    def merge(self, other: 'RPCMetrics') -> None:
+        with self._lock:
+            for key, stats in other._stats.items():
+                self._stats.setdefault(key, CallStats()).merge(stats)
+            for command, spend in other._commands.items():
+                totals = self._commands.setdefault(command, {'requests': 0, 'compute_units': 0})
+                for name in totals:
+                    totals[name] += spend.get(name, 0)
+
+    def totals(self) -> CallStats:
+        total = CallStats()
+        with self._lock:
+            for stats in self._stats.values():
+                total.merge(stats)
+        return total
+
+    def summary(self) -> Dict[str, Any]:
+        """Summaries per method, per endpoint and per (method, endpoint)."""
+        by_method: Dict[str, CallStats] = {}
+        by_endpoint: Dict[str, CallStats] = {}
+        with self._lock:
+            items = list(self._stats.items())
+            commands = {command: dict(spend) for command, spend in sorted(self._commands.items())}
+        for (method, endpoint), stats in items:
+            by_method.setdefault(method, CallStats()).merge(stats)
+            by_endpoint.setdefault(endpoint, CallStats()).merge(stats)
+        return {
+            'methods': {method: stats.summary() for method, stats in sorted(by_method.items())},
+            'endpoints': {endpoint: stats.summary() for endpoint, stats in sorted(by_endpoint.items())},
+            'calls': [dict(method=method, endpoint=endpoint, **stats.summary())
+                      for (method, endpoint), stats in sorted(items)],
+            'commands': commands
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'version': 1,
+                    'calls': [dict(method=method, endpoint=endpoint, **stats.to_dict())
+                              for (method, endpoint), stats in sorted(self._stats.items())],
+                    'commands': {command: dict(spend) for command, spend in self._commands.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RPCMetrics':
+        metrics = cls()
+        for entry in data.get('calls', []):
+            metrics._stats[(entry['method'], entry['endpoint'])] = CallStats.from_dict(entry)
+        for command, spend in data.get('commands', {}).items():
+            metrics._commands[command] = {'requests': spend.get('requests', 0),
+                                          'compute_units': spend.get('compute_units', 0)}
+        return metrics
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP ethereum_cli_rpc_{name} {help_text}")
+            lines.append(f"# TYPE ethereum_cli_rpc_{name} {kind}")
+
+        with self._lock:
+            items = sorted(self._stats.items())
+            commands = sorted(self._commands.items())
+        counters = [
+            ('requests_total', 'requests', 'HTTP requests sent'),
+            ('errors_total', 'errors', 'Requests that failed'),
+            ('retries_total', 'retries', 'Requests retried or failed over'),
+            ('throttled_total', 'throttled', 'Requests answered with 429'),
+            ('rate_limit_wait_seconds_total', 'rate_limit_wait_s', 'Seconds spent waiting on the client rate limiter'),
+            ('request_bytes_total', 'bytes_sent', 'Request body bytes'),
+            ('response_bytes_total', 'bytes_received', 'Response body bytes'),
+            ('compute_units_total', 'compute_units', 'Provider compute units spent')
+        ]
+        for name, attribute, help_text in counters:
+            metric(name, 'counter', help_text)
+            for (method, endpoint), stats in items:
+                lines.append(f'ethereum_cli_rpc_{name}{{method="{method}",endpoint="{endpoint}"}} {getattr(stats, attribute)}')
+
+        metric('latency_seconds', 'histogram', 'Request latency')
+        for (method, endpoint), stats in items:
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.latency.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'ethereum_cli_rpc_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'ethereum_cli_rpc_latency_seconds_sum{{{labels}}} {stats.latency.total}')
+            lines.append(f'ethereum_cli_rpc_latency_seconds_count{{{labels}}} {stats.latency.count}')
+
+        metric('command_compute_units_total', 'counter', 'Provider compute units spent per CLI command')
+        for command, spend in commands:
+            lines.append(f'ethereum_cli_rpc_command_compute_units_total{{command="{command}"}} {spend["compute_units"]}')
+        return "\n".join(lines) + "\n"
+
+
+def load_metrics(path: str) -> RPCMetrics:
+    """Metrics accumulated in a JSON file (empty if it does not exist or is unreadable)."""
+    try:
+        with open(Path(path).expanduser(), 'r') as f:
+            return RPCMetrics.from_dict(json.load(f))
+    except FileNotFoundError:
+        return RPCMetrics()
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable metrics file {path}: {e}")
+        return RPCMetrics()
+
+
+def save_metrics(metrics: RPCMetrics, path: str, prometheus_textfile: Optional[str] = None) -> RPCMetrics:
+    """
+    Add a run's metrics to the JSON file (under a lock, so concurrent CLI runs are not lost)
+    and optionally rewrite the Prometheus textfile with the new totals.
+
+    Returns:
+        The accumulated metrics
+    """
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        accumulated = load_metrics(str(path))
+        accumulated.merge(metrics)
+        atomic_write(path, json.dumps(accumulated.to_dict()))
+    finally:
+        os.close(lock_fd)
+    if prometheus_textfile:
+        atomic_write(Path(prometheus_textfile).expanduser(), accumulated.to_prometheus())
+    return accumulated
+
+
+def _metrics_settings() -> Dict[str, Any]:
+    try:
+        config = read_settings(CONFIG_PATH)
+    except ValueError:
+        config = {}
+    return dict(METRICS_DEFAULTS, **config.get('rpc', {}).get('metrics', {}))
+
+
+# CLI Interface for the stats command
+def stats_show(prometheus_path: str = None, reset: bool = False) -> None:
+    """
+    CLI command: Show RPC metrics accumulated across runs as JSON.
+    Supports: ./cli stats [--prometheus file] [--reset]
+    """
+    settings = _metrics_settings()
+    if not settings['path']:
+        print("Error: RPC metrics are disabled. Set rpc.metrics.path in config/settings.json.")
+        exit(1)
+
+    path = Path(settings['path']).expanduser()
+    metrics = load_metrics(str(path))
+    print(json.dumps(metrics.summary(), indent=2))
+    if prometheus_path:
+        atomic_write(Path(prometheus_path).expanduser(), metrics.to_prometheus())
+        print(f"Prometheus metrics written to {prometheus_path}")
+    if reset and path.exists():
+        path.unlink()
+        print("RPC metrics reset")
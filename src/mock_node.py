@@ -0,0 +1,632 @@
+"""
+In-process Ethereum JSON-RPC node for tests, load tests and offline benchmarks.
+
+Keeps accounts, nonces, blocks and receipts in memory, accepts signed raw
+transactions (legacy and EIP-1559) and mines each one into its own block by
+default. Latency and faults (429 bursts, timeouts, dropped connections, server
+errors and malformed responses) can be injected, one-off or at random rates.
+MockEtherscan stands in for the Etherscan transaction history API.
+
+Usage: python -m src.mock_node [--port 8545] [--latency 0.02] [--fund 0xADDRESS=10] [--fault rate_limit=0.05]
+                               [--etherscan-port 8546 --history 100]
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import rlp
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address, to_hex
+
+logger = logging.getLogger(__name__)
+
+# Fault kinds accepted by MockNode.inject and fault_rates
+FAULTS = (
+    'rate_limit',     # HTTP 429 with Retry-After
+    'server_error',   # HTTP 503
+    'timeout',        # No answer for `hang` seconds, then the connection is dropped
+    'disconnect',     # Connection closed without an answer
+    'malformed'       # HTTP 200 with a body that is not JSON
+)
+
+_TX_TYPE_ACCESS_LIST, _TX_TYPE_DYNAMIC_FEE = 0x01, 0x02
+
+
+class RPCError(Exception):
+    """A JSON-RPC error answered to the client."""
+
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+
+def _quantity(value: int) -> str:
+    return hex(value)
+
+
+def _int(field: bytes) -> int:
+    return int.from_bytes(field, 'big')
+
+
+def _intrinsic_gas(data: bytes) -> int:
+    return 21_000 + sum(16 if byte else 4 for byte in data)
+
+
+def decode_raw_transaction(raw: bytes) -> Dict[str, Any]:
+    """
+    Fields of a signed raw transaction, sender included.
+
+    Raises:
+        RPCError: If the bytes are not a signed transaction
+    """
+    try:
+        sender = Account.recover_transaction(raw)
+        if raw[0] == _TX_TYPE_DYNAMIC_FEE:
+            (chain_id, nonce, tip, max_fee, gas, to, value, data, _, _, _, _) = rlp.decode(raw[1:])
+            tx = {'type': 2, 'chainId': _int(chain_id), 'maxPriorityFeePerGas': _int(tip), 'maxFeePerGas': _int(max_fee)}
+        elif raw[0] == _TX_TYPE_ACCESS_LIST:
+            (chain_id, nonce, gas_price, gas, to, value, data, _, _, _, _) = rlp.decode(raw[1:])
+            tx = {'type': 1, 'chainId': _int(chain_id), 'gasPrice': _int(gas_price)}
+        else:
+            (nonce, gas_price, gas, to, value, data, v, _, _) = rlp.decode(raw)
+            v = _int(v)
+            # EIP-155 signatures carry the chain ID in v; pre-155 ones (27/28) are valid on any chain
+            tx = {'type': 0, 'chainId': (v - 35) // 2 if v >= 35 else None, 'gasPrice': _int(gas_price)}
+    except Exception as e:
+        raise RPCError(f"rlp: invalid transaction: {e}", -32602)
+    tx.update({
+        'hash': to_hex(keccak(raw)),
+        'from': sender,
+        'nonce': _int(nonce),
+        'gas': _int(gas),
+        'to': to_checksum_address(to) if to else None,
+        'value': _int(value),
+        'input': to_hex(data)
+    })
+    return tx
+
+
+class MockChain:
+    """Accounts, transactions and blocks of the mock node; every method is thread-safe."""
+
+    def __init__(self, chain_id: int = 11155111, gas_price_wei: int = 1_000_000_000, automine: bool = True,
+                 accounts: Optional[Dict[str, int]] = None, block_gas_limit: int = 30_000_000):
+        """
+        Args:
+            chain_id: Chain ID signed transactions must carry
+            gas_price_wei: Answer to eth_gasPrice, and the base fee of EIP-1559 transactions
+            automine: Mine every accepted transaction into a block of its own; otherwise call mine()
+            accounts: Initial balances in wei by address
+            block_gas_limit: Gas limit reported for blocks
+        """
+        self.chain_id = chain_id
+        self.gas_price = gas_price_wei
+        self.automine = automine
+        self.block_gas_limit = block_gas_limit
+        self.balances: Dict[str, int] = {}
+        self.nonces: Dict[str, int] = {}
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[Dict[str, Any]] = []
+        self.blocks: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+        for address, wei in (accounts or {}).items():
+            self.fund(address, wei)
+        self._new_block([])
+
+    def fund(self, address: str, wei: int) -> None:
+        """Add wei to an address."""
+        with self._lock:
+            key = address.lower()
+            self.balances[key] = self.balances.get(key, 0) + wei
+
+    def balance(self, address: str) -> int:
+        with self._lock:
+            return self.balances.get(address.lower(), 0)
+
+    def nonce(self, address: str, pending: bool = False) -> int:
+        """Transactions mined from an address, plus those waiting to be mined when pending."""
+        with self._lock:
+            nonce = self.nonces.get(address.lower(), 0)
+            if pending:
+                nonce += sum(1 for tx in self.pending if tx['from'].lower() == address.lower())
+            return nonce
+
+    def _effective_gas_price(self, tx: Dict[str, Any]) -> int:
+        if tx['type'] == 2:
+            return min(tx['maxFeePerGas'], self.gas_price + tx['maxPriorityFeePerGas'])
+        return tx['gasPrice']
+
+    def submit(self, raw: bytes) -> str:
+        """
+        Validate a signed raw transaction the way a node's mempool does, and queue it.
+
+        Returns:
+            Transaction hash
+
+        Raises:
+            RPCError: With the message geth answers for the same rejection
+        """
+        tx = decode_raw_transaction(raw)
+        with self._lock:
+            if tx['hash'] in self.transactions:
+                raise RPCError("already known")
+            if tx['chainId'] is not None and tx['chainId'] != self.chain_id:
+                raise RPCError(f"invalid chain id: have {tx['chainId']} want {self.chain_id}")
+            expected = self.nonce(tx['from'], pending=True)
+            if tx['nonce'] < expected:
+                raise RPCError(f"nonce too low: next nonce {expected}, tx nonce {tx['nonce']}")
+            if tx['nonce'] > expected:
+                raise RPCError(f"nonce too high: next nonce {expected}, tx nonce {tx['nonce']}")
+            intrinsic = _intrinsic_gas(bytes.fromhex(tx['input'][2:]))
+            if tx['gas'] < intrinsic:
+                raise RPCError(f"intrinsic gas too low: gas {tx['gas']}, minimum needed {intrinsic}")
+            if tx['type'] == 2 and tx['maxFeePerGas'] < self.gas_price:
+                raise RPCError(f"max fee per gas less than block base fee: maxFeePerGas: {tx['maxFeePerGas']}, "
+                               f"baseFee: {self.gas_price}")
+            cost = tx['value'] + tx['gas'] * self._effective_gas_price(tx)
+            if self.balance(tx['from']) < cost:
+                raise RPCError(f"insufficient funds for gas * price + value: address {tx['from']} "
+                               f"have {self.balance(tx['from'])} want {cost}")
+            self.transactions[tx['hash']] = tx
+            self.pending.append(tx)
+            if self.automine:
+                self.mine()
+        return tx['hash']
+
+    def mine(self) -> Dict[str, Any]:
+        """Mine the pending transactions into a new block."""
+        with self._lock:
+            mined, self.pending = self.pending, []
+            block = self._new_block(mined)
+            cumulative = 0
+            for index, tx in enumerate(mined):
+                gas_used = _intrinsic_gas(bytes.fromhex(tx['input'][2:]))
+                cumulative += gas_used
+                price = self._effective_gas_price(tx)
+                sender = tx['from'].lower()
+                self.balances[sender] -= tx['value'] + gas_used * price
+                if tx['to']:
+                    self.fund(tx['to'], tx['value'])
+                self.nonces[sender] = self.nonces.get(sender, 0) + 1
+                tx.update(blockNumber=block['number'], blockHash=block['hash'], transactionIndex=index)
+                self.receipts[tx['hash']] = {
+                    'transactionHash': tx['hash'],
+                    'transactionIndex': _quantity(index),
+                    'blockHash': block['hash'],
+                    'blockNumber': _quantity(block['number']),
+                    'from': tx['from'],
+                    'to': tx['to'],
+                    'gasUsed': _quantity(gas_used),
+                    'cumulativeGasUsed': _quantity(cumulative),
+                    'effectiveGasPrice': _quantity(price),
+                    'contractAddress': None,
+                    'logs': [],
+                    'status': '0x1',
+                    'type': _quantity(tx['type'])
+                }
+            block['gasUsed'] = cumulative
+            return block
+
+    def _new_block(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        number = len(self.blocks)
+        parent = self.blocks[-1]['hash'] if self.blocks else to_hex(b'\0' * 32)
+        block = {
+            'number': number,
+            'hash': to_hex(keccak(f"{self.chain_id}:{number}:{parent}".encode())),
+            'parentHash': parent,
+            'timestamp': int(time.time()),
+            'transactions': transactions,
+            'gasUsed': 0
+        }
+        self.blocks.append(block)
+        return block
+
+    def block_number(self) -> int:
+        with self._lock:
+            return len(self.blocks) - 1
+
+    def block(self, tag: Any) -> Optional[Dict[str, Any]]:
+        """Block by number (hex), 'latest'/'pending'/'safe'/'finalized'/'earliest' or hash."""
+        with self._lock:
+            if tag in ('latest', 'pending', 'safe', 'finalized'):
+                return self.blocks[-1]
+            if tag == 'earliest':
+                return self.blocks[0]
+            if isinstance(tag, str) and len(tag) == 66:
+                return next((block for block in self.blocks if block['hash'] == tag), None)
+            try:
+                number = int(tag, 16)
+            except (TypeError, ValueError):
+                raise RPCError(f"invalid block tag: {tag}", -32602)
+            return self.blocks[number] if 0 <= number < len(self.blocks) else None
+
+
+def _format_tx(tx: Dict[str, Any]) -> Dict[str, Any]:
+    formatted = {
+        'hash': tx['hash'],
+        'from': tx['from'],
+        'to': tx['to'],
+        'nonce': _quantity(tx['nonce']),
+        'gas': _quantity(tx['gas']),
+        'value': _quantity(tx['value']),
+        'input': tx['input'],
+        'type': _quantity(tx['type']),
+        'blockNumber': _quantity(tx['blockNumber']) if 'blockNumber' in tx else None,
+        'blockHash': tx.get('blockHash'),
+        'transactionIndex': _quantity(tx['transactionIndex']) if 'transactionIndex' in tx else None
+    }
+    for field in ('chainId', 'gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas'):
+        if tx.get(field) is not None:
+            formatted[field] = _quantity(tx[field])
+    return formatted
+
+
+def _format_block(block: Optional[Dict[str, Any]], full: bool, gas_limit: int) -> Optional[Dict[str, Any]]:
+    if block is None:
+        return None
+    return {
+        'number': _quantity(block['number']),
+        'hash': block['hash'],
+        'parentHash': block['parentHash'],
+        'timestamp': _quantity(block['timestamp']),
+        'miner': '0x' + '00' * 20,
+        'gasLimit': _quantity(gas_limit),
+        'gasUsed': _quantity(block['gasUsed']),
+        'transactions': [_format_tx(tx) if full else tx['hash'] for tx in block['transactions']]
+    }
+
+
+class MockNode:
+    """
+    Local HTTP JSON-RPC server backed by a MockChain.
+
+        with MockNode(accounts={address: 10 ** 18}) as node:
+            client = RPCClient(rpc_url=node.url, chain_id=node.chain.chain_id)
+    """
+
+    def __init__(self, chain: Optional[MockChain] = None, latency: float = 0.0, jitter: float = 0.0,
+                 fault_rates: Optional[Dict[str, float]] = None, retry_after: int = 1, hang: float = 30.0,
+                 seed: Optional[int] = None, host: str = '127.0.0.1', port: int = 0, **chain_options: Any):
+        """
+        Args:
+            chain: Chain state to serve (default: a new MockChain built from chain_options)
+            latency: Seconds added to every HTTP request
+            jitter: Up to this many extra seconds, at random
+            fault_rates: Probability of each fault kind per HTTP request, e.g. {'rate_limit': 0.05}
+            retry_after: Retry-After seconds sent with 429 answers
+            hang: Seconds a 'timeout' fault holds the request before dropping the connection
+            seed: Seed of the latency jitter and random faults, for reproducible runs
+            host, port: Address to listen on (port 0 picks a free one)
+        """
+        self.chain = chain or MockChain(**chain_options)
+        self.latency = latency
+        self.jitter = jitter
+        self.fault_rates = dict(fault_rates or {})
+        for kind in self.fault_rates:
+            self._check_fault(kind)
+        self.retry_after = retry_after
+        self.hang = hang
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.requests = 0
+        self.faults: Counter = Counter()
+        self._injected: deque = deque()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), _MockNodeHandler)
+        self._server.daemon_threads = True
+        self._server.node = self
+        self._thread: Optional[threading.Thread] = None
+        self._methods: Dict[str, Callable[[List[Any]], Any]] = {
+            'eth_chainId': lambda params: _quantity(self.chain.chain_id),
+            'net_version': lambda params: str(self.chain.chain_id),
+            'eth_blockNumber': lambda params: _quantity(self.chain.block_number()),
+            'eth_gasPrice': lambda params: _quantity(self.chain.gas_price),
+            'eth_maxPriorityFeePerGas': lambda params: _quantity(0),
+            'eth_getBalance': lambda params: _quantity(self.chain.balance(params[0])),
+            'eth_getTransactionCount': lambda params: _quantity(
+                self.chain.nonce(params[0], pending=len(params) > 1 and params[1] == 'pending')),
+            'eth_getCode': lambda params: '0x',
+            'eth_call': lambda params: '0x',
+            'eth_estimateGas': self._estimate_gas,
+            'eth_sendRawTransaction': lambda params: self.chain.submit(bytes.fromhex(params[0][2:])),
+            'eth_getTransactionByHash': self._transaction,
+            'eth_getTransactionReceipt': lambda params: self.chain.receipts.get(params[0]),
+            'eth_getBlockByNumber': lambda params: _format_block(
+                self.chain.block(params[0]), len(params) > 1 and params[1] is True, self.chain.block_gas_limit),
+            'eth_getBlockByHash': lambda params: _format_block(
+                self.chain.block(params[0]), len(params) > 1 and params[1] is True, self.chain.block_gas_limit)
+        }
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @staticmethod
+    def _check_fault(kind: str) -> None:
+        if kind not in FAULTS:
+            raise ValueError(f"Unknown fault: {kind}. Use one of {', '.join(FAULTS)}")
+
+    def inject(self, kind: str, count: int = 1) -> None:
+        """Answer the next count HTTP requests with a fault (e.g. inject('rate_limit', 5) for a 429 burst)."""
+        self._check_fault(kind)
+        with self._lock:
+            self._injected.extend([kind] * count)
+
+    def start(self) -> 'MockNode':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-node', daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Mock node (chain {self.chain.chain_id}) listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        # Release requests held by 'timeout' faults first
+        self._stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockNode':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _next_fault(self) -> Optional[str]:
+        with self._lock:
+            self.requests += 1
+            if self._injected:
+                kind = self._injected.popleft()
+            else:
+                kind = next((kind for kind, rate in self.fault_rates.items() if self.random.random() < rate), None)
+            if kind:
+                self.faults[kind] += 1
+            return kind
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _estimate_gas(self, params: List[Any]) -> str:
+        call = params[0] if params else {}
+        if call.get('from') and int(call.get('value', '0x0'), 16) > self.chain.balance(call['from']):
+            raise RPCError("insufficient funds for transfer")
+        data = call.get('data') or call.get('input') or '0x'
+        return _quantity(_intrinsic_gas(bytes.fromhex(data[2:])))
+
+    def _transaction(self, params: List[Any]) -> Optional[Dict[str, Any]]:
+        tx = self.chain.transactions.get(params[0])
+        return _format_tx(tx) if tx else None
+
+    def handle_call(self, request: Any) -> Dict[str, Any]:
+        """Answer one JSON-RPC call object."""
+        if not isinstance(request, dict) or 'method' not in request:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "invalid request"}}
+        method, request_id = request['method'], request.get('id')
+        with self._lock:
+            self.calls[method] += 1
+        handler = self._methods.get(method)
+        if handler is None:
+            error = {"code": -32601, "message": f"the method {method} does not exist/is not available"}
+            return {"jsonrpc": "2.0", "id": request_id, "error": error}
+        try:
+            return {"jsonrpc": "2.0", "id": request_id, "result": handler(request.get('params') or [])}
+        except RPCError as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+        except (IndexError, KeyError, TypeError, ValueError, AttributeError) as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32602, "message": f"invalid params: {e}"}}
+
+
+class _MockNodeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    wbufsize = 65536  # Send headers and body in one segment
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _answer(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        node: MockNode = self.server.node
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        delay = node._delay()
+        if delay:
+            time.sleep(delay)
+
+        fault = node._next_fault()
+        if fault == 'rate_limit':
+            return self._answer(429, b'{"error": "too many requests"}', {'Retry-After': str(node.retry_after)})
+        if fault == 'server_error':
+            return self._answer(503, b'{"error": "service unavailable"}')
+        if fault in ('timeout', 'disconnect'):
+            if fault == 'timeout':
+                node._stopped.wait(node.hang)
+            self.close_connection = True
+            return
+        if fault == 'malformed':
+            return self._answer(200, b'{"jsonrpc": "2.0", "id": 1, "resu')
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            error = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "parse error"}}
+            return self._answer(200, json.dumps(error).encode())
+        if isinstance(request, list):
+            response = [node.handle_call(item) for item in request]
+        else:
+            response = node.handle_call(request)
+        self._answer(200, json.dumps(response).encode())
+
+
+class MockEtherscan:
+    """
+    Local HTTP stand-in for the Etherscan account API (module=account&action=txlist), used
+    through ETHERSCAN_API_URL. An address's history is `history_size` generated transfers
+    plus the transactions the chain mined for it, newest first.
+
+        with MockNode() as node, MockEtherscan(chain=node.chain, history_size=500) as etherscan:
+            os.environ['ETHERSCAN_API_URL'] = etherscan.url
+    """
+
+    def __init__(self, chain: Optional[MockChain] = None, history_size: int = 0, latency: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            chain: Chain whose mined transactions are listed too
+            history_size: Generated transactions listed for every address
+            latency: Seconds added to every HTTP request
+            host, port: Address to listen on (port 0 picks a free one)
+        """
+        self.chain = chain
+        self.history_size = history_size
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _MockEtherscanHandler)
+        self._server.daemon_threads = True
+        self._server.etherscan = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> 'MockEtherscan':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-etherscan', daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Mock Etherscan listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockEtherscan':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _generated(self, address: str) -> List[Dict[str, str]]:
+        peer = to_checksum_address(keccak(address.lower().encode())[-20:])
+        return [{
+            'blockNumber': str(index + 1),
+            'hash': to_hex(keccak(f"{address.lower()}:{index}".encode())),
+            'from': address if index % 2 else peer,
+            'to': peer if index % 2 else address,
+            'value': str((index + 1) * 10 ** 15),
+            'gas': '21000',
+            'gasUsed': '21000',
+            'gasPrice': '1000000000',
+            'isError': '0'
+        } for index in range(self.history_size)]
+
+    def _mined(self, address: str) -> List[Dict[str, str]]:
+        if self.chain is None:
+            return []
+        mined = []
+        with self.chain._lock:
+            for tx in self.chain.transactions.values():
+                receipt = self.chain.receipts.get(tx['hash'])
+                if receipt is None or address.lower() not in (tx['from'].lower(), (tx['to'] or '').lower()):
+                    continue
+                mined.append({
+                    'blockNumber': str(self.history_size + tx['blockNumber']),
+                    'hash': tx['hash'],
+                    'from': tx['from'],
+                    'to': tx['to'] or '',
+                    'value': str(tx['value']),
+                    'gas': str(tx['gas']),
+                    'gasUsed': str(int(receipt['gasUsed'], 16)),
+                    'gasPrice': str(int(receipt['effectiveGasPrice'], 16)),
+                    'isError': '0'
+                })
+        return mined
+
+    def handle_query(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """Answer one API query with Etherscan's status/message/result envelope."""
+        with self._lock:
+            self.requests += 1
+        if (query.get('module'), query.get('action')) != ('account', 'txlist'):
+            return {'status': '0', 'message': 'NOTOK', 'result': 'Error! Missing Or invalid Module name'}
+        address = query.get('address', '')
+        if len(address) != 42 or not address.startswith('0x'):
+            return {'status': '0', 'message': 'NOTOK', 'result': 'Error! Invalid address format'}
+        transactions = self._generated(address) + self._mined(address)
+        if query.get('sort', 'asc') == 'desc':
+            transactions.reverse()
+        if not transactions:
+            return {'status': '0', 'message': 'No transactions found', 'result': []}
+        return {'status': '1', 'message': 'OK', 'result': transactions}
+
+
+class _MockEtherscanHandler(_MockNodeHandler):
+    def do_GET(self) -> None:
+        etherscan: MockEtherscan = self.server.etherscan
+        if etherscan.latency:
+            time.sleep(etherscan.latency)
+        query = {name: values[-1] for name, values in parse_qs(urlsplit(self.path).query).items()}
+        self._answer(200, json.dumps(etherscan.handle_query(query)).encode())
+
+    def do_POST(self) -> None:
+        self._answer(405, b'{"error": "method not allowed"}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock Ethereum JSON-RPC node")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--chain-id", type=int, default=11155111)
+    parser.add_argument("--gas-price-gwei", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--fund", action='append', default=[], metavar="ADDRESS=ETH", help="Initial balance")
+    parser.add_argument("--fault", action='append', default=[], metavar="KIND=RATE",
+                        help=f"Random fault rate per request ({', '.join(FAULTS)})")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--etherscan-port", type=int, default=None,
+                        help="Also serve a mock Etherscan API on this port (use with ETHERSCAN_API_URL)")
+    parser.add_argument("--history", type=int, default=0, help="Generated transactions per address on mock Etherscan")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    accounts = {address: int(float(eth) * 10 ** 18) for address, eth in (item.split('=') for item in args.fund)}
+    fault_rates = {kind: float(rate) for kind, rate in (item.split('=') for item in args.fault)}
+    node = MockNode(latency=args.latency, jitter=args.jitter, fault_rates=fault_rates, seed=args.seed,
+                    host=args.host, port=args.port, chain_id=args.chain_id,
+                    gas_price_wei=int(args.gas_price_gwei * 10 ** 9), accounts=accounts)
+    node.start()
+    etherscan = None
+    if args.etherscan_port is not None:
+        etherscan = MockEtherscan(chain=node.chain, history_size=args.history, latency=args.latency,
+                                  host=args.host, port=args.etherscan_port).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        node.stop()
+        if etherscan is not None:
+            etherscan.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from src.call_budget import CallBudgetExceeded, finish_command, isolated_usage
+from src.endpoint_pool import EndpointPool
+from src.metrics import current_command
+from src.rpc_client import RPCClient
+from src.settings import load_settings
+from src.settings_model import Settings
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+
+T = TypeVar('T')
+
+
+def network_settings() -> Settings:
+    """settings.json, whose networks section lists the profiles (sepolia, holesky, mainnet, local, ...)."""
+    return load_settings(CONFIG_PATH)
+
+
+def unconfigured_networks(settings: Optional[Settings] = None) -> List[str]:
+    """Profiles none of whose endpoints is set, e.g. mainnet at ${MAINNET_RPC_URL} while MAINNET_RPC_URL is unset."""
+    settings = settings or network_settings()
+    return [name for name in settings.networks
+            if not EndpointPool.configured_endpoints(settings.for_network(name).rpc)]
+
+
+def resolve_networks(spec: str, settings: Optional[Settings] = None) -> List[str]:
+    """
+    Profile names selected by --networks: 'all' (every profile with an endpoint set, see
+    skipped_networks), or a comma-separated list of networks.<name> profiles.
+
+    Raises:
+        ValueError: If a name has no profile, or nothing is selected
+    """
+    settings = settings or network_settings()
+    if spec.strip() == 'all':
+        unconfigured = unconfigured_networks(settings)
+        names = [name for name in settings.networks if name not in unconfigured]
+        if unconfigured and not names:
+            raise ValueError(f"No network has an RPC endpoint set (unset: {', '.join(unconfigured)})")
+    else:
+        names = list(dict.fromkeys(name.strip() for name in spec.split(',') if name.strip()))
+    if not names:
+        raise ValueError("No networks selected (configure profiles under networks in settings.json)")
+    unknown = [name for name in names if name not in settings.networks]
+    if unknown:
+        configured = ', '.join(settings.networks) or 'none'
+        raise ValueError(f"Unknown network: {', '.join(unknown)} (configured: {configured})")
+    return names
+
+
+def skipped_networks(spec: str, settings: Optional[Settings] = None) -> List[str]:
+    """Profiles that --networks all leaves out because none of their endpoints is set; named ones are never skipped."""
+    return unconfigured_networks(settings) if spec.strip() == 'all' else []
+
+
+def client_for(name: str, settings: Optional[Settings] = None, **rpc_options: Any) -> RPCClient:
+    """
+    RPC client for the networks.<name> profile: its own endpoint pool, chain ID check and response cache
+    (cache keys carry the chain ID, so chains never answer for each other even with a shared cache file).
+
+    Raises:
+        ValueError: If the profile is unknown or none of its endpoints is set
+    """
+    settings = (settings or network_settings()).for_network(name)
+    if not EndpointPool.configured_endpoints(settings.rpc):
+        templates = ', '.join(entry.get('url', '') for entry in settings.rpc['endpoints']) or 'none'
+        raise ValueError(f"No RPC endpoint for network {name} (networks.{name}.endpoints: {templates})")
+    rpc_options.setdefault('chain_id', settings.network.chain_id)
+    return RPCClient(config=settings, **rpc_options)
+
+
+def fan_out(names: List[str], call: Callable[[RPCClient], T], settings: Optional[Settings] = None,
+            **rpc_options: Any) -> Dict[str, Union[T, Exception]]:
+    """
+    Run call with one client per network, on all networks at the same time, so that the whole
+    takes as long as the slowest chain instead of the sum of them.
+
+    Each network's calls are counted apart and checked against the current command's call budget
+    on their own: `balance --networks all` may spend the balance budget on every chain.
+
+    Args:
+        names: Profile names (see resolve_networks)
+        call: Work to do on one network, e.g. lambda client: client.get_balance(address)
+        settings: Settings holding the profiles (default: settings.json)
+        **rpc_options: Further RPCClient arguments (timeout, max_retries, ...)
+
+    Returns:
+        Results by network, in the order of names. A network that failed maps to its ValueError,
+        ConnectionError or CallBudgetExceeded instead, so one unreachable chain does not hide the others.
+    """
+    settings = settings or network_settings()
+    command = current_command()
+
+    def run(name: str) -> Union[T, Exception]:
+        with isolated_usage():
+            client = None
+            try:
+                client = client_for(name, settings, **rpc_options)
+                result = call(client)
+                if command:
+                    finish_command(command)
+                return result
+            except (ValueError, ConnectionError, CallBudgetExceeded) as e:
+                logger.error(f"❌ {name}: {e}")
+                return e
+            finally:
+                if client is not None:
+                    client.close()
+
+    with ThreadPoolExecutor(max_workers=max(len(names), 1), thread_name_prefix='rpc-network') as executor:
+        # Each worker runs in a copy of the caller's context: same command name and call priority
+        futures = [executor.submit(contextvars.copy_context().run, run, name) for name in names]
+        return {name: future.result() for name, future in zip(names, futures)}
@@ -0,0 +1,131 @@
+import contextvars
+import itertools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.rate_limiter import NullRateLimiter
+
+# Priority classes, highest first
+CRITICAL = 'critical'          # Sending transactions and what they depend on (nonce, broadcast)
+INTERACTIVE = 'interactive'    # A user waiting on a command
+BACKGROUND = 'background'      # Scans, enrichment and other bulk reads
+PRIORITIES = (CRITICAL, INTERACTIVE, BACKGROUND)
+
+# Defaults for rpc.priority in settings.json
+PRIORITY_DEFAULTS = {
+    'default': INTERACTIVE,
+    'max_skips': 8             # A waiting call is passed over by higher classes at most this many times
+}
+
+# Priority of the RPC calls made in this context (see rpc_priority)
+_current_priority: contextvars.ContextVar = contextvars.ContextVar('rpc_priority', default=None)
+
+
+def _check(priority: str) -> str:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}. Use one of {', '.join(PRIORITIES)}")
+    return priority
+
+
+@contextmanager
+def rpc_priority(priority: str) -> Iterator[None]:
+    """Run the RPC calls made inside the block (in this thread or task) with the given priority."""
+    token = _current_priority.set(_check(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority(default: str = INTERACTIVE) -> str:
+    """Priority set by the innermost rpc_priority block, or default."""
+    return _current_priority.get() or default
+
+
+class _Ticket:
+    __slots__ = ('rank', 'seq', 'skipped')
+
+    def __init__(self, rank: int, seq: int):
+        self.rank = rank
+        self.seq = seq
+        self.skipped = 0
+
+
+class PriorityScheduler:
+    """
+    Dispatches sends that share a rate limiter in priority order.
+
+    Callers queue for the limiter, one at a time: whoever is dispatched reserves its
+    tokens and waits them out before the next caller is chosen, so a critical call
+    arriving behind a backlog of background reads waits for at most one of them.
+    Within a class callers are served first come, first served. A caller passed over
+    max_skips times by higher classes goes next, which bounds starvation.
+    """
+
+    def __init__(self, limiter: Any, max_skips: int = 8):
+        """
+        Args:
+            limiter: Rate limiter with an acquire() method (e.g. TokenBucket)
+            max_skips: Times a waiting call may be passed over by higher priorities
+        """
+        self.limiter = limiter
+        self.max_skips = max_skips
+        self.dispatched: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._waiting: List[_Ticket] = []
+        self._busy = False
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _next(self) -> _Ticket:
+        starved = [ticket for ticket in self._waiting if ticket.skipped >= self.max_skips]
+        return min(starved or self._waiting, key=lambda ticket: (ticket.rank, ticket.seq))
+
+    def acquire(self, priority: str = INTERACTIVE, tokens: float = 1.0) -> float:
+        """
+        Wait for this caller's turn and its tokens.
+
+        Returns:
+            Seconds spent waiting
+        """
+        priority = _check(priority)
+        if isinstance(self.limiter, NullRateLimiter):
+            self.dispatched[priority] += 1
+            return 0.0
+
+        start = time.monotonic()
+        ticket = _Ticket(PRIORITIES.index(priority), next(self._seq))
+        with self._cond:
+            self._waiting.append(ticket)
+            while self._busy or self._next() is not ticket:
+                self._cond.wait()
+            self._waiting.remove(ticket)
+            for other in self._waiting:
+                if other.rank > ticket.rank:
+                    other.skipped += 1
+            self._busy = True
+            self.dispatched[priority] += 1
+        try:
+            self.limiter.acquire(tokens)
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+        return time.monotonic() - start
+
+
+# One scheduler per rate limiter, so every client sharing a bucket also shares its queue
+_SCHEDULERS: 'weakref.WeakKeyDictionary[Any, PriorityScheduler]' = weakref.WeakKeyDictionary()
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(limiter: Any, max_skips: Optional[int] = None) -> PriorityScheduler:
+    """Get the process-wide scheduler of a rate limiter (max_skips applies when it is created)."""
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(limiter)
+        if scheduler is None:
+            scheduler = PriorityScheduler(limiter, PRIORITY_DEFAULTS['max_skips'] if max_skips is None else max_skips)
+            _SCHEDULERS[limiter] = scheduler
+        return scheduler
@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Used when settings.json has no rpc.rate_limit section: one request every 0.5s
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 1.0
+
+# Shared bucket state: tokens available and the timestamp they were computed at
+_STATE_FORMAT = '<dd'
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+class NullRateLimiter:
+    """Rate limiter that never waits. Useful for local nodes and benchmarks."""
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        return 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        return 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. A reservation
+    always succeeds immediately and may drive the bucket negative; the caller is
+    told how long to wait for its turn. Waiters are therefore served in the order
+    they reserved, and the lock is never held while sleeping.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum number of requests that may be sent back to back
+            clock: Time source in seconds (injectable for tests)
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens_available: float, updated: float, tokens: float) -> tuple:
+        """Refill, debit and return (new_tokens, now, wait_seconds)."""
+        now = self.clock()
+        tokens_available = min(self.burst, tokens_available + max(0.0, now - updated) * self.rate)
+        tokens_available -= tokens
+        wait = -tokens_available / self.rate if tokens_available < 0 else 0.0
+        return tokens_available, now, wait
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens without blocking.
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            self._tokens, self._updated, wait = self._take(self._tokens, self._updated, tokens)
+        return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens and sleep until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiting: waiting {wait:.2f}s before request")
+            time.sleep(wait)
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a small file guarded by flock, so that
+    several CLI processes talking to the same endpoint share one budget.
+    """
+
+    def __init__(self, path: Path, rate: float, burst: float = 1.0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: State file shared by all cooperating processes
+            rate: Sustained requests per second
+            burst: Maximum number of requests that may be sent back to back
+            clock: Wall-clock time source shared across processes
+        """
+        if fcntl is None:
+            raise RuntimeError("Shared rate limiting requires fcntl (not available on this platform)")
+        super().__init__(rate, burst, clock)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.pread(fd, _STATE_SIZE, 0)
+                if len(raw) == _STATE_SIZE:
+                    tokens_available, updated = struct.unpack(_STATE_FORMAT, raw)
+                else:
+                    tokens_available, updated = self.burst, self.clock()
+                tokens_available, updated, wait = self._take(tokens_available, updated, tokens)
+                os.pwrite(fd, struct.pack(_STATE_FORMAT, tokens_available, updated), 0)
+            finally:
+                os.close(fd)  # Closing the descriptor releases the flock
+        return wait
+
+
+# One limiter per endpoint per process, so every RPCClient talking to the same
+# endpoint draws from the same bucket
+_LIMITERS: Dict[tuple, Any] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def _endpoint_settings(rpc_url: str, rate_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge default settings with the entry for this endpoint (matched by full URL or host name)."""
+    settings = {'rate': DEFAULT_RATE, 'burst': DEFAULT_BURST}
+    settings.update(rate_config.get('default', {}))
+    endpoints = rate_config.get('endpoints', {})
+    host = urlsplit(rpc_url or '').hostname
+    if rpc_url in endpoints:
+        settings.update(endpoints[rpc_url])
+    elif host in endpoints:
+        settings.update(endpoints[host])
+    return settings
+
+
+def get_rate_limiter(rpc_url: str, rate_config: Optional[Dict[str, Any]] = None, unit: str = 'requests') -> Any:
+    """
+    Get the process-wide rate limiter for an endpoint.
+
+    Args:
+        rpc_url: Endpoint URL
+        rate_config: The rpc.rate_limit section of settings.json, e.g.
+            {"default": {"rate": 10, "burst": 10},
+             "endpoints": {"go.getblock.io": {"rate": 25, "burst": 25}},
+             "shared": true, "state_dir": "/tmp/ethereum-cli-ratelimit"}
+            "rate": 0 disables limiting for that endpoint.
+        unit: What a token stands for ('requests', or 'compute_units' for provider
+            billing budgets); buckets of different units are never shared
+
+    Returns:
+        A limiter with reserve() and acquire() methods
+    """
+    rate_config = rate_config or {}
+    settings = _endpoint_settings(rpc_url, rate_config)
+    rate, burst = float(settings['rate']), float(settings['burst'])
+    shared = bool(settings.get('shared', rate_config.get('shared', False)))
+    key = (rpc_url, rate, burst, shared, unit)
+
+    with _LIMITERS_LOCK:
+        if key not in _LIMITERS:
+            if rate <= 0:
+                _LIMITERS[key] = NullRateLimiter()
+            elif shared and fcntl is not None:
+                state_dir = Path(rate_config.get('state_dir') or Path(tempfile.gettempdir()) / 'ethereum-cli-ratelimit')
+                name = (rpc_url or '') if unit == 'requests' else f"{unit}:{rpc_url or ''}"
+                digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+                _LIMITERS[key] = FileTokenBucket(state_dir / f"{digest}.bucket", rate, burst)
+            else:
+                if shared:
+                    logger.warning("Shared rate limiting is not supported on this platform, using a per-process bucket")
+                _LIMITERS[key] = TokenBucket(rate, burst)
+        return _LIMITERS[key]
@@ -0,0 +1,222 @@
+import contextvars
+import logging
+import random
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Defaults for rpc.retry in settings.json
+RETRY_DEFAULTS = {
+    'deadline': 30.0,          # Total seconds one call may spend, including every retry and wait
+    'max_attempts': 5,
+    'base_delay': 0.5,         # Decorrelated jitter: each wait is drawn from [base_delay, 3 * previous wait]
+    'max_delay': 8.0,
+    'connect_timeout': 3.05,
+    'read_timeout': 10.0,
+    'heavy_read_timeout': 30.0,
+    'heavy_methods': ['eth_getLogs', 'eth_getBlockReceipts', 'debug_traceTransaction', 'trace_block']
+}
+
+# HTTP statuses worth retrying; anything else in 4xx (bad key, bad request) fails at once
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+# Methods that must not be sent twice once they may have reached the node
+NON_IDEMPOTENT_METHODS = {'eth_sendTransaction'}
+
+# Budget of the retry loop currently running in this context, so nested loops share its deadline
+_current_budget: contextvars.ContextVar = contextvars.ContextVar('retry_budget', default=None)
+
+
+def parse_retry_after(value: Optional[str], now: Callable[[], float] = time.time) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - now())
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """Retry-After of the HTTP response behind an error, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers or not hasattr(headers, 'get'):
+        return None
+    value = headers.get('Retry-After')
+    return parse_retry_after(value) if isinstance(value, str) else None
+
+
+class RetryBudget:
+    """
+    State of one retry loop: attempts made, the previous wait and the deadline.
+
+    A budget started while another one is active (e.g. an RPC call made inside a
+    TransactionManager retry loop) never outlives the outer deadline, so nested
+    loops cannot stack their waits on top of each other.
+    """
+
+    def __init__(self, policy: 'RetryPolicy', max_attempts: int):
+        self.policy = policy
+        self.max_attempts = max_attempts
+        self.attempt = 0
+        self._previous_delay = policy.base_delay
+        self.deadline_at = policy.clock() + policy.deadline
+        parent = _current_budget.get()
+        if parent is not None:
+            self.deadline_at = min(self.deadline_at, parent.deadline_at)
+        self._token = None
+
+    def __enter__(self) -> 'RetryBudget':
+        self._token = _current_budget.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current_budget.reset(self._token)
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline_at - self.policy.clock())
+
+    def fail_over(self) -> bool:
+        """
+        Count a failed attempt that is retried at once on another endpoint.
+
+        Returns:
+            False if attempts or the deadline are exhausted
+        """
+        self.attempt += 1
+        return self.attempt < self.max_attempts and self.remaining() > 0
+
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Count a failed attempt and pick the wait before the next one.
+
+        Args:
+            retry_after: Server-requested wait (Retry-After), honored when it fits the deadline
+
+        Returns:
+            Seconds to wait, or None if attempts or the deadline are exhausted
+        """
+        self.attempt += 1
+        if self.attempt >= self.max_attempts:
+            return None
+        delay = min(self.policy.max_delay,
+                    self.policy.rng(self.policy.base_delay, self._previous_delay * 3))
+        self._previous_delay = delay
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if delay >= self.remaining():
+            return None
+        return delay
+
+
+class RetryPolicy:
+    """
+    Retry policy shared by RPC calls and TransactionManager: a total deadline per
+    call, decorrelated jitter between attempts, Retry-After support, per-method
+    retryability and separate connect/read timeouts (longer for heavy methods).
+    """
+
+    def __init__(self, deadline: float = 30.0, max_attempts: int = 5, base_delay: float = 0.5,
+                 max_delay: float = 8.0, connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 heavy_read_timeout: float = 30.0, heavy_methods: Iterable[str] = (),
+                 clock: Callable[[], float] = time.monotonic,
+                 rng: Callable[[float, float], float] = random.uniform):
+        """
+        Args:
+            deadline: Total seconds per call, including retries and waits
+            max_attempts: Maximum number of attempts per call
+            base_delay: Smallest wait between attempts
+            max_delay: Largest wait between attempts (a longer Retry-After is still honored)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response
+            heavy_read_timeout: Read timeout for heavy_methods
+            heavy_methods: Methods known to take long on the node
+            clock: Time source in seconds (injectable for tests)
+            rng: Draws a uniform wait between two bounds (injectable for tests)
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.heavy_read_timeout = heavy_read_timeout
+        self.heavy_methods = frozenset(heavy_methods)
+        self.clock = clock
+        self.rng = rng
+
+    @classmethod
+    def from_config(cls, retry_config: Optional[Dict[str, Any]] = None, **overrides: Any) -> 'RetryPolicy':
+        """Build a policy from the rpc.retry section of settings.json; overrides win over settings."""
+        settings = dict(RETRY_DEFAULTS, **(retry_config or {}))
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**settings)
+
+    def start(self, max_attempts: Optional[int] = None) -> RetryBudget:
+        """Start the budget of one call."""
+        return RetryBudget(self, max_attempts or self.max_attempts)
+
+    def timeout(self, methods: Iterable[str] = (), budget: Optional[RetryBudget] = None) -> Tuple[float, float]:
+        """
+        (connect, read) timeouts for a request, never longer than what is left of the budget.
+        """
+        read = self.heavy_read_timeout if any(method in self.heavy_methods for method in methods) else self.read_timeout
+        connect = self.connect_timeout
+        if budget is not None:
+            remaining = max(budget.remaining(), 0.001)
+            connect, read = min(connect, remaining), min(read, remaining)
+        return connect, read
+
+    @staticmethod
+    def retryable(methods: Iterable[str], error: BaseException) -> bool:
+        """
+        Whether a failed request may be sent again.
+
+        Non-idempotent methods are only retried when the request cannot have reached
+        the node (connection errors). Other methods are retried on network errors,
+        timeouts and the HTTP statuses in RETRYABLE_STATUSES.
+        """
+        if any(method in NON_IDEMPOTENT_METHODS for method in methods):
+            return isinstance(error, requests.exceptions.ConnectionError)
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = getattr(error, 'response', None)
+            return response is not None and response.status_code in RETRYABLE_STATUSES
+        return isinstance(error, requests.exceptions.RequestException)
+
+    def call(self, func: Callable[[], Any], retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+             label: str = 'Call', max_attempts: Optional[int] = None) -> Any:
+        """
+        Run func, retrying on retry_on errors within one budget. Calls made inside func
+        share the budget's deadline.
+
+        Raises:
+            The last error once attempts or the deadline are exhausted
+        """
+        with self.start(max_attempts) as budget:
+            while True:
+                try:
+                    return func()
+                except retry_on as e:
+                    delay = budget.next_delay(retry_after_of(e))
+                    if delay is None:
+                        raise
+                    logger.warning(f"⏰ {label} attempt {budget.attempt} failed: {e}. Retrying in {delay:.1f}s")
+                    time.sleep(delay)
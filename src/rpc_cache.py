@@ -0,0 +1,224 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Returned by ResponseCache.get when nothing usable is cached (None is a valid RPC result)
+MISS = object()
+
+# Policies
+IMMUTABLE = 'immutable'   # Kept forever, also on disk
+TTL = 'ttl'               # Kept for latest_ttl seconds, memory only
+NEVER = None
+
+# Defaults for rpc.cache in settings.json
+CACHE_DEFAULTS = {
+    'enabled': True,
+    'max_entries': 1024,
+    'latest_ttl': 2.0,      # Seconds a 'latest'-tagged result stays fresh
+    'finality_depth': 64,   # Blocks this far behind the head are treated as finalized
+    'path': None            # SQLite file for immutable results; None keeps the cache in memory only
+}
+
+# Methods whose result follows the head of the chain
+# (eth_gasPrice is cached by the gas oracle instead)
+_HEAD_METHODS = {'eth_blockNumber', 'eth_estimateGas', 'eth_feeHistory', 'eth_maxPriorityFeePerGas'}
+# Methods taking a block tag or number as their last parameter
+_STATE_METHODS = {'eth_getBalance', 'eth_getTransactionCount', 'eth_getCode', 'eth_getStorageAt', 'eth_call'}
+# Methods answered with an object carrying the blockNumber it was included in
+_INCLUDED_METHODS = {'eth_getTransactionReceipt', 'eth_getTransactionByHash'}
+
+
+def _block_number(value: Any) -> Optional[int]:
+    """Block number from a hex quantity, or None for tags and malformed values."""
+    if isinstance(value, str) and value.startswith('0x'):
+        try:
+            return int(value, 16)
+        except ValueError:
+            return None
+    return None
+
+
+class ResponseCache:
+    """
+    Cache for JSON-RPC results, keyed by method and params.
+
+    Each call gets a cacheability policy: results that can never change (eth_chainId,
+    blocks by hash, blocks, receipts and state behind the finalized head) are kept
+    forever in an LRU and, optionally, in a SQLite file. Results that follow the head
+    ('latest' tag, eth_blockNumber) are kept for a short TTL. Pending and
+    state-changing calls are never cached.
+
+    The finalized head is tracked from the results that pass through the cache: an
+    explicit 'finalized' block, or the highest head seen minus finality_depth.
+    """
+
+    def __init__(self, chain_id: int, max_entries: int = 1024, latest_ttl: float = 2.0,
+                 finality_depth: int = 64, path: Optional[str] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            chain_id: Network of the cached results (part of every key)
+            max_entries: Size of the in-memory LRU
+            latest_ttl: Seconds a head-following result stays fresh
+            finality_depth: Blocks behind the head after which data is treated as final
+            path: Optional SQLite file persisting immutable results across runs
+            clock: Time source in seconds (injectable for tests)
+        """
+        self.chain_id = chain_id
+        self.max_entries = max_entries
+        self.latest_ttl = latest_ttl
+        self.finality_depth = finality_depth
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.head: Optional[int] = None
+        self.finalized: Optional[int] = None
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            db_path = Path(path).expanduser()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls, chain_id: int, cache_config: Dict[str, Any]) -> Optional['ResponseCache']:
+        """Build a cache from the rpc.cache section of settings.json, or None if disabled."""
+        settings = dict(CACHE_DEFAULTS, **(cache_config or {}))
+        if not settings['enabled']:
+            return None
+        return cls(
+            chain_id,
+            max_entries=settings['max_entries'],
+            latest_ttl=settings['latest_ttl'],
+            finality_depth=settings['finality_depth'],
+            path=settings['path']
+        )
+
+    def _key(self, method: str, params: List[Any]) -> str:
+        return f"{self.chain_id}:{method}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+    @staticmethod
+    def cacheable(method: str, params: List[Any]) -> bool:
+        """Whether a call may be answered from the cache at all (decided before sending)."""
+        if 'pending' in params:
+            return False
+        return (method == 'eth_chainId' or method in _HEAD_METHODS or method in _STATE_METHODS
+                or method in _INCLUDED_METHODS or method in ('eth_getBlockByNumber', 'eth_getBlockByHash'))
+
+    def _is_final(self, block_number: Optional[int]) -> bool:
+        return block_number is not None and self.finalized is not None and block_number <= self.finalized
+
+    def policy(self, method: str, params: List[Any], result: Any) -> Optional[str]:
+        """
+        Decide how long a successful result may be cached.
+
+        Returns:
+            IMMUTABLE, TTL or NEVER
+        """
+        if not self.cacheable(method, params) or result is None:
+            return NEVER
+        if method == 'eth_chainId':
+            return IMMUTABLE
+        if method in _HEAD_METHODS:
+            return TTL
+        if method == 'eth_getBlockByHash':
+            # A hash always names the same block
+            return IMMUTABLE
+        if method == 'eth_getBlockByNumber':
+            tag = params[0] if params else 'latest'
+            number = _block_number(tag)
+            if tag == 'earliest' or self._is_final(number):
+                return IMMUTABLE
+            return TTL
+        if method in _INCLUDED_METHODS:
+            # Only final inclusions are stable; recent ones may still be reorged out
+            return IMMUTABLE if self._is_final(_block_number(result.get('blockNumber'))) else NEVER
+        # State methods: the last parameter is the block tag or number
+        tag = params[-1] if params else 'latest'
+        return IMMUTABLE if self._is_final(_block_number(tag)) else TTL
+
+    def _observe(self, method: str, params: List[Any], result: Any) -> None:
+        """Track the chain head and finalized block from results passing through."""
+        number = None
+        if method == 'eth_blockNumber':
+            number = _block_number(result)
+        elif method == 'eth_getBlockByNumber' and isinstance(result, dict):
+            number = _block_number(result.get('number'))
+            if number is not None and params and params[0] == 'finalized':
+                self.finalized = max(self.finalized or 0, number)
+        if number is None:
+            return
+        self.head = max(self.head or 0, number)
+        if self.head >= self.finality_depth:
+            self.finalized = max(self.finalized or 0, self.head - self.finality_depth)
+
+    def get(self, method: str, params: List[Any]) -> Any:
+        """
+        Look up a cached result.
+
+        Returns:
+            The result, or MISS
+        """
+        key = self._key(method, params)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT result FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(key, result, None)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+        return MISS
+
+    def put(self, method: str, params: List[Any], result: Any) -> None:
+        """Store a successful result according to its policy."""
+        with self._lock:
+            self._observe(method, params, result)
+            policy = self.policy(method, params, result)
+            if policy is NEVER:
+                return
+            key = self._key(method, params)
+            if policy == IMMUTABLE:
+                self._remember(key, result, None)
+                if self._db is not None:
+                    self._db.execute("INSERT OR REPLACE INTO responses (key, result) VALUES (?, ?)",
+                                     (key, json.dumps(result)))
+                    self._db.commit()
+            else:
+                self._remember(key, result, self.clock() + self.latest_ttl)
+
+    def _remember(self, key: str, result: Any, expires: Optional[float]) -> None:
+        """Insert into the LRU (caller holds the lock)."""
+        self._entries[key] = (result, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the disk store is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,12 +1,34 @@
+import asyncio
+import contextvars
+import functools
+import itertools
 import json
+import math
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from dotenv import load_dotenv
 import requests
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 import warnings
+from src.endpoint_pool import EndpointPool
+from src.rpc_cache import ResponseCache, MISS
+from src.chain_check import get_chain_id_cache
+from src.gas_oracle import GasPriceOracle, GAS_ORACLE_DEFAULTS
+from src.retry import RetryPolicy, retry_after_of
+from src.metrics import RPCMetrics, METRICS_DEFAULTS, current_command, save_metrics
+from src.compute_units import COMPUTE_UNIT_DEFAULTS, CostTable
+from src.rate_limiter import get_rate_limiter
+from src.transports import transport_for
+from src.cassette import cassette_settings, wrap_transport
+from src.call_budget import record_round_trip
+from src.single_flight import SingleFlight, flight_key
+from src.priority import CRITICAL, PRIORITY_DEFAULTS, current_priority, get_scheduler, rpc_priority
+from src.settings import as_settings, load_settings
 warnings.filterwarnings("ignore", category=Warning)
 
 load_dotenv()
@@ -22,139 +44,701 @@ logger = logging.getLogger(__name__)
 
 # Simple network names
 NETWORK_NAMES = {
+    1: 'Ethereum Mainnet',
+    17000: 'Holesky Testnet',
+    31337: 'Local Devnet',
     11155111: 'Sepolia Testnet'
 }
 
+# Methods that never change state and may be sent twice (hedged) safely
+READ_ONLY_METHODS = {
+    'eth_chainId', 'eth_blockNumber', 'eth_gasPrice', 'eth_getBalance', 'eth_getTransactionCount',
+    'eth_getTransactionByHash', 'eth_getTransactionReceipt', 'eth_getBlockByNumber', 'eth_getBlockByHash',
+    'eth_getCode', 'eth_getStorageAt', 'eth_call', 'eth_estimateGas', 'eth_getLogs', 'eth_feeHistory',
+    'net_version'
+}
+
+# Defaults for rpc.hedging in settings.json
+HEDGING_DEFAULTS = {
+    'enabled': False,
+    'percentile': 95,      # Hedge once a call is slower than this percentile of recent latency
+    'min_delay_ms': 50,
+    'max_delay_ms': 2000,  # Also used until enough latency samples exist
+    'min_samples': 10,
+    'window': 200
+}
+
+# Endpoint pool, HTTP session, transports, response cache and gas oracle per client configuration,
+# shared by every RPCClient of a long-lived process (see keep_warm); None when not sharing
+_WARM_STATE: Optional[Dict[Tuple, Dict[str, Any]]] = None
+_WARM_LOCK = threading.Lock()
+
+
+def keep_warm(enabled: bool = True) -> None:
+    """
+    Share connections, the response cache, the gas oracle and endpoint latency stats between
+    the RPCClients this process creates with the same settings, so that each new client starts
+    warm (used by ./cli daemon). Each client still keeps its own counters and metrics, and
+    close() leaves the shared parts open; keep_warm(False) closes them.
+    """
+    global _WARM_STATE
+    with _WARM_LOCK:
+        states, _WARM_STATE = _WARM_STATE, ({} if enabled else None)
+    for state in (states or {}).values():
+        state['gas_oracle'].stop()
+        for transport in state['transports'].values():
+            transport.close()
+        state['session'].close()
+        if state['cache'] is not None:
+            state['cache'].close()
+
+
+def _warm_gas_price(state: Dict[str, Any]) -> str:
+    """
+    eth_gasPrice for a shared gas oracle, through the newest client of its configuration that is
+    still open (never a closed one, whose executors are shut down).
+
+    Raises:
+        ConnectionError: If every client of the configuration has been closed
+    """
+    with _WARM_LOCK:
+        client = state['clients'][-1] if state['clients'] else None
+    if client is None:
+        raise ConnectionError("No open RPC client to fetch the gas price with")
+    return client._make_rpc_call('eth_gasPrice')
+
+
+def warm_configurations() -> int:
+    """Client configurations kept warm (see keep_warm)."""
+    with _WARM_LOCK:
+        return len(_WARM_STATE or {})
+
+
 class RPCClient:
     """
     Improved Ethereum RPC Client with enhanced rate limiting handling.
     Features:
-    - Basic RPC calls with exponential backoff for 429 errors
+    - Basic RPC calls with retries for 429 and network errors
     - Balance with unit conversion
     - Gas estimation
     - Transaction monitoring
-    - Simple rate limiting to prevent 429 errors
+    - Token-bucket rate limiting per endpoint (configurable in settings.json)
+    - Deadline-based retries with decorrelated jitter and Retry-After support
+    - Endpoint pool with latency-aware routing and instant failover
+    - Optional hedging of slow read-only calls to a second endpoint
+    - Response cache for immutable and recent results (configurable in settings.json)
+    - Lazy chain ID check, memoized per endpoint (optionally across runs)
+    - Gas price oracle with TTL and optional background refresh
+    - Per-method, per-endpoint latency histograms and counters (see get_stats)
+    - Thread-safe: one client can be shared by a thread pool (see map_calls)
+    - HTTP, WebSocket (ws://, wss://) and Unix socket IPC transports, chosen by URL scheme
+    - Single-flight: identical concurrent read-only calls share one request
+    - Priority classes (critical / interactive / background) on the shared rate budget
+    - Provider compute-unit accounting, optionally throttling on a CU-per-second budget
+    - Optional AsyncRPCClient backend, driven from a private event loop thread
     """
 
-    def __init__(self, rpc_url: str = None, chain_id: int = None, timeout: int = 10, max_retries: int = 5):
+    def __init__(self, rpc_url: str = None, chain_id: int = None, timeout: float = None, max_retries: int = None,
+                 async_client: Any = None, rate_limiter: Any = None, pool: EndpointPool = None,
+                 pool_size: int = 10, config: Optional[Dict[str, Any]] = None):
         """
         Initialize RPC Client with basic settings.
 
         Args:
-            rpc_url: Ethereum RPC endpoint
+            rpc_url: Ethereum RPC endpoint (http(s)://, ws(s):// or ipc:///path/to/geth.ipc); when
+                omitted, the endpoints listed under rpc.endpoints in settings.json are used, falling back to RPC_URL
             chain_id: Expected network chain ID
-            timeout: Request timeout in seconds
-            max_retries: Number of retry attempts
-        """
-        with open(CONFIG_PATH, 'r') as f:
-            config = json.load(f)
-        self.rpc_url = rpc_url or os.getenv('RPC_URL')
-        self.expected_chain_id = chain_id or config['network']['chain_id']
-        self.timeout = timeout
-        self.max_retries = max_retries
+            timeout: Read timeout in seconds (heavy methods use rpc.retry.heavy_read_timeout);
+                rpc.retry.read_timeout when omitted
+            max_retries: Maximum number of attempts per call, within the rpc.retry deadline;
+                rpc.retry.max_attempts when omitted
+            async_client: Optional AsyncRPCClient to send requests through instead of requests.Session
+            rate_limiter: Optional limiter with an acquire() method used for every endpoint;
+                defaults to the shared bucket per endpoint configured under rpc.rate_limit
+                (or rpc.compute_units.budget when compute-unit budgeting is enabled)
+            pool: Optional pre-built EndpointPool
+            pool_size: Keep-alive connections kept per endpoint; size it to the number of
+                threads sharing the client (also the default map_calls worker count)
+            config: Settings to use instead of settings.json (a Settings object, e.g. a Session's, or a dict)
+        """
+        settings = as_settings(config) if config is not None else load_settings(CONFIG_PATH)
+        rpc_config = settings.rpc
+        self.async_client = async_client
+        self._loop = None
+        self._loop_thread = None
+        if async_client is not None:
+            rpc_url = rpc_url or async_client.rpc_url
+        # Under keep_warm, clients built from settings alone share the parts an earlier one warmed up
+        self._warm_key = None
+        if _WARM_STATE is not None and async_client is None and rate_limiter is None and pool is None:
+            self._warm_key = (settings.model_dump_json(), rpc_url, os.getenv('RPC_URL'),
+                              chain_id, pool_size)
+        with _WARM_LOCK:
+            warm = (_WARM_STATE or {}).get(self._warm_key)
+        self.pool = warm['pool'] if warm else pool or EndpointPool.from_config(rpc_config, rpc_url)
+        # Compute units per method (rpc.compute_units); with 'enabled', configured endpoints are
+        # throttled on a CU-per-second budget instead of a request rate
+        cu_config = dict(COMPUTE_UNIT_DEFAULTS, **rpc_config.get('compute_units', {}))
+        self.costs = CostTable.from_config(cu_config)
+        self.cu_budget = bool(cu_config['enabled'])
+        if self.cu_budget and pool is None:
+            for endpoint in self.pool.endpoints:
+                endpoint.rate_limiter = get_rate_limiter(endpoint.url, cu_config['budget'], unit='compute_units')
+        if rate_limiter is not None:
+            for endpoint in self.pool.endpoints:
+                endpoint.rate_limiter = rate_limiter
+        self.rpc_url = self.pool.endpoints[0].url
+        self.expected_chain_id = chain_id or settings.network.chain_id
+        # Deadline, jitter, Retry-After and timeouts for every request (rpc.retry in settings.json);
+        # timeout and max_retries override the settings only when given
+        self.retry_policy = RetryPolicy.from_config(
+            rpc_config.get('retry'), read_timeout=timeout, max_attempts=max_retries
+        )
+        self.timeout = self.retry_policy.read_timeout
+        self.max_retries = self.retry_policy.max_attempts
         self.headers = {'Content-Type': 'application/json'}
-        self.session = requests.Session()
+        self.pool_size = pool_size
         self.request_id = 0
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # Minimum 0.5 seconds between requests
+        # Guards request IDs, counters and lazily created helpers shared between threads
+        self._lock = threading.Lock()
+        # One transport per endpoint, picked by URL scheme (raises ValueError for unknown schemes),
+        # recorded to or replayed from a cassette when rpc.cassette / RPC_CASSETTE asks for it
+        self.cassette = cassette_settings(rpc_config.get('cassette'))
+        if warm:
+            self.session, self.transports = warm['session'], warm['transports']
+        else:
+            self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=len(self.pool.endpoints), pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self.transports = {
+                endpoint.url: wrap_transport(transport_for(endpoint.url, self.session, self.headers, pool_size),
+                                             self.cassette)
+                for endpoint in self.pool.endpoints
+            }
+
+        # Hedging of slow read-only calls (opt-in via rpc.hedging in settings.json)
+        self.hedging = dict(HEDGING_DEFAULTS, **rpc_config.get('hedging', {}))
+        self._latencies = deque(maxlen=self.hedging['window'])
+        self._hedge_executor = None
+
+        # Cache of immutable and 'latest' results (rpc.cache in settings.json)
+        self.cache = warm['cache'] if warm else \
+            ResponseCache.from_config(self.expected_chain_id, rpc_config.get('cache', {}))
+
+        # Detailed per-method/per-endpoint metrics, optionally accumulated across runs (rpc.metrics)
+        self.metrics = RPCMetrics()
+        self.metrics_settings = dict(METRICS_DEFAULTS, **rpc_config.get('metrics', {}))
+
+        # Identical read-only calls in flight at the same time share one request
+        self.single_flight = SingleFlight()
+
+        # Calls queue for the rate limiter by priority (rpc.priority in settings.json, see rpc_priority)
+        self.priority_settings = dict(PRIORITY_DEFAULTS, **rpc_config.get('priority', {}))
 
         # Simple metrics tracking
         self.call_count = 0
         self.success_count = 0
+        self.hedged_calls = 0
+        self.hedge_wins = 0
 
-        # Test connection
-        try:
-            self.get_chain_id()
-            logger.info(f"✅ Connected to {self.rpc_url} (Chain ID: {self.expected_chain_id})")
-        except Exception as e:
-            logger.error(f"❌ Connection failed: {e}")
-            raise
+        # The network is verified lazily, once per endpoint per TTL, right before the
+        # first request sent to it; connection problems surface on that first call
+        self.chain_ids = get_chain_id_cache(rpc_config.get('chain_id_check'))
 
-    def _make_rpc_call(self, method: str, params: List[Any] = None) -> Any:
+        # Gas price quotes are cached for a TTL (rpc.gas_oracle in settings.json)
+        oracle_config = dict(GAS_ORACLE_DEFAULTS, **rpc_config.get('gas_oracle', {}))
+        if warm:
+            self.gas_oracle = warm['gas_oracle']
+        else:
+            self.gas_oracle = GasPriceOracle(
+                lambda: self._make_rpc_call('eth_gasPrice'),
+                ttl=oracle_config['ttl'],
+                default_gwei=settings.transaction.default_gas_price_gwei
+            )
+            if oracle_config['background_refresh']:
+                self.gas_oracle.start(oracle_config['refresh_interval'])
+        if self._warm_key is not None:
+            with _WARM_LOCK:
+                if _WARM_STATE is not None:
+                    state = _WARM_STATE.setdefault(self._warm_key, {
+                        'pool': self.pool, 'session': self.session, 'transports': self.transports,
+                        'cache': self.cache, 'gas_oracle': self.gas_oracle, 'clients': []
+                    })
+                    if state['session'] is self.session:
+                        # The shared oracle fetches through whichever client is still open (see close)
+                        state['clients'].append(self)
+                        self.gas_oracle.fetch = functools.partial(_warm_gas_price, state)
+
+    def _make_rpc_call(self, method: str, params: List[Any] = None, use_cache: bool = True) -> Any:
         """
-        Make a JSON-RPC call with exponential backoff for 429 errors and rate limiting.
+        Make a JSON-RPC call with rate limiting and retries (see RetryPolicy).
+        Cacheable results are answered from the response cache unless use_cache is False,
+        and read-only calls already in flight with the same params are joined instead of resent.
         """
         if params is None:
             params = []
 
-        self.call_count += 1
-        self.request_id += 1
+        if use_cache and self.cache is not None and self.cache.cacheable(method, params):
+            cached = self.cache.get(method, params)
+            if cached is not MISS:
+                logger.info(f"📦 {method} served from cache")
+                return cached
+
+        if method in READ_ONLY_METHODS:
+            return self.single_flight.do(flight_key(method, params), lambda: self._send_call(method, params))
+        return self._send_call(method, params)
+
+    def _send_call(self, method: str, params: List[Any]) -> Any:
+        """Send one JSON-RPC call and unwrap its result."""
         payload = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": self.request_id
+            "id": self._next_request_id()
         }
 
         logger.info(f"🔄 Calling {method} with params: {params}")
 
-        # Enforce minimum interval between requests
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            logger.debug(f"Rate limiting: waiting {sleep_time:.2f}s before request")
-            time.sleep(sleep_time)
+        result = self._post(payload, method)
+        logger.debug(f"Raw response for {method}: {result}")
 
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.post(
-                    self.rpc_url,
-                    headers=self.headers,
-                    data=json.dumps(payload),
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                logger.debug(f"Raw response for {method}: {result}")
-
-                if 'error' in result:
-                    error_msg = result['error'].get('message', 'Unknown error')
-                    logger.error(f"❌ RPC Error {method}: {error_msg}")
-                    raise ValueError(f"RPC error: {error_msg}")
-
-                self.success_count += 1
-                self.last_request_time = time.time()
-                logger.info(f"✅ {method} succeeded")
-                logger.info(f"Raw result for {method}: {result.get('result', 'None')}")
-                return result['result']
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    # Exponential backoff: 5 * 2^attempt seconds
-                    backoff_time = 5 * (2 ** attempt)
-                    logger.warning(f"⏰ 429 Too Many Requests on attempt {attempt + 1}/{self.max_retries}. Waiting {backoff_time}s")
-                    time.sleep(backoff_time)
-                    continue
-                logger.warning(f"🌐 HTTP error on attempt {attempt + 1}: {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(5)
-                    continue
-                raise ConnectionError(f"HTTP error: {e}")
+        if not isinstance(result, dict):
+            raise ValueError(f"Unexpected response for {method}: {result}")
+
+        if 'error' in result:
+            error_msg = result['error'].get('message', 'Unknown error')
+            logger.error(f"❌ RPC Error {method}: {error_msg}")
+            raise ValueError(f"RPC error: {error_msg}")
+
+        self._count_success()
+        logger.info(f"✅ {method} succeeded")
+        logger.info(f"Raw result for {method}: {result.get('result', 'None')}")
+        if self.cache is not None:
+            self.cache.put(method, params, result['result'])
+        return result['result']
 
-            except requests.exceptions.Timeout:
-                logger.warning(f"⏰ Timeout on attempt {attempt + 1}/{self.max_retries}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(5)
+    def batch(self, calls: List[Tuple[str, Optional[List[Any]]]]) -> List[Any]:
+        """
+        Send several JSON-RPC calls as one JSON-RPC array in a single request.
+
+        Args:
+            calls: List of (method, params) tuples
+
+        Returns:
+            Results in the same order as calls. A call that failed on the node is
+            returned as a ValueError instance instead of a result, so one bad call
+            does not fail the whole batch. Cached results are filled in without being sent.
+
+        Raises:
+            ConnectionError: If the batch request fails after retries
+            ValueError: If the node rejects the batch as a whole
+        """
+        if not calls:
+            return []
+
+        results: List[Any] = [MISS] * len(calls)
+        payload = []
+        positions = []
+        for position, (method, params) in enumerate(calls):
+            params = params if params is not None else []
+            if self.cache is not None and self.cache.cacheable(method, params):
+                results[position] = self.cache.get(method, params)
+                if results[position] is not MISS:
                     continue
-                raise ConnectionError("Request timed out after retries")
+            positions.append(position)
+            payload.append({
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+                "id": self._next_request_id()
+            })
+
+        if not payload:
+            logger.info(f"📦 batch of {len(calls)} served from cache")
+            return results
+
+        methods = [item['method'] for item in payload]
+        logger.info(f"🔄 Calling batch of {len(payload)}: {', '.join(methods)}")
+
+        response = self._post(payload, 'batch')
+        logger.debug(f"Raw response for batch: {response}")
+
+        # Some providers answer a rejected batch with a single error object
+        if isinstance(response, dict):
+            error_msg = response.get('error', {}).get('message', 'Unknown error')
+            logger.error(f"❌ RPC Error batch: {error_msg}")
+            raise ValueError(f"RPC error: {error_msg}")
+
+        by_id = {item.get('id'): item for item in response if isinstance(item, dict)}
+        for position, request in zip(positions, payload):
+            item = by_id.get(request['id'])
+            if item is None:
+                results[position] = ValueError(f"RPC error: no response for {request['method']}")
+            elif 'error' in item:
+                error_msg = item['error'].get('message', 'Unknown error')
+                logger.error(f"❌ RPC Error {request['method']}: {error_msg}")
+                results[position] = ValueError(f"RPC error: {error_msg}")
+            else:
+                self._count_success()
+                results[position] = item.get('result')
+                if self.cache is not None:
+                    self.cache.put(request['method'], request['params'], results[position])
+
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        logger.info(f"✅ batch succeeded ({len(results) - failed}/{len(results)} calls ok)")
+        return results
+
+    def map_calls(self, method: str, params_iter: Iterable[List[Any]], max_workers: Optional[int] = None) -> Iterator[Any]:
+        """
+        Run one method for many parameter lists on a thread pool. Calls share this
+        client's rate limiter, connections, cache and retry policy, and run with the
+        caller's priority (e.g. inside rpc_priority(BACKGROUND)).
+
+        Args:
+            method: JSON-RPC method name
+            params_iter: Parameter lists, consumed lazily
+            max_workers: Concurrent calls (defaults to pool_size; more than pool_size
+                opens connections that are not kept alive)
+
+        Yields:
+            Results in the order of params_iter, each one as soon as it and all earlier
+            calls have completed. A call that failed is yielded as its ValueError or
+            ConnectionError instance, so one bad call does not stop the rest.
+        """
+        workers = max_workers or self.pool_size
+        params_iter = iter(params_iter)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rpc-map')
+        pending = deque()
+        try:
+            # Keep a bounded window in flight so huge (or endless) inputs are not submitted all at once
+            for params in itertools.islice(params_iter, workers * 2):
+                pending.append(executor.submit(contextvars.copy_context().run, self._make_rpc_call, method, params))
+            while pending:
+                future = pending.popleft()
+                try:
+                    result = future.result()
+                except (ValueError, ConnectionError) as e:
+                    result = e
+                for params in itertools.islice(params_iter, 1):
+                    pending.append(executor.submit(contextvars.copy_context().run, self._make_rpc_call, method, params))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _next_request_id(self) -> int:
+        """Allocate a JSON-RPC request ID and count the call."""
+        with self._lock:
+            self.call_count += 1
+            self.request_id += 1
+            return self.request_id
+
+    def _count_success(self) -> None:
+        with self._lock:
+            self.success_count += 1
+
+    @staticmethod
+    def _unwrap(results: List[Any]) -> List[Any]:
+        """Raise the first per-item error of a batch, otherwise return the results."""
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _post(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]], label: str) -> Any:
+        """
+        Send a JSON-RPC payload (single call or batch) with rate limiting and retries.
+
+        Returns:
+            Decoded JSON response body
+        """
+        methods = tuple(item['method'] for item in payload) if isinstance(payload, list) else (payload['method'],)
+        # Calls asking for the chain ID are checked by their caller and need no check of their own
+        chain_probe = 'eth_chainId' in methods
+
+        if self.async_client is not None:
+            if not chain_probe and not self.chain_ids.verified(self.rpc_url, self.expected_chain_id):
+                record_round_trip(('eth_chainId',))
+                self._run_async(self.async_client.get_chain_id())
+                self.chain_ids.record(self.rpc_url, self.expected_chain_id)
+            # The async client has its own rate limiting, and retries under the same rpc.retry policy.
+            # Its calls count against the command's call budget here, in the caller's context.
+            record_round_trip(methods)
+            return self._run_async(self.async_client._post(payload, label))
 
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"🌐 Network error on attempt {attempt + 1}: {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(5)
+        group = self.pool.group_for(methods)
+        # State-changing calls always jump the queue
+        priority = CRITICAL if group == 'write' else current_priority(self.priority_settings['default'])
+        hedge = self.hedging['enabled'] and all(method in READ_ONLY_METHODS for method in methods)
+        data = json.dumps(payload)
+        cost = self.costs.payload_cost(payload)
+        tried = set()
+
+        with rpc_priority(priority), self.retry_policy.start() as budget:
+            while True:
+                endpoint = self.pool.select(group, exclude=tried)
+                if endpoint is None:
+                    # Every endpoint failed in this round, start over with the healthiest one
+                    tried.clear()
+                    endpoint = self.pool.select(group)
+                tried.add(endpoint.url)
+                can_fail_over = len(tried) < len(self.pool.members(group))
+                timeout = self.retry_policy.timeout(methods, budget)
+
+                try:
+                    if hedge:
+                        return self._send_hedged(endpoint, group, data, tried, chain_probe, timeout, label, cost,
+                                                 methods)
+                    return self._send_to(endpoint, data, chain_probe=chain_probe, timeout=timeout, label=label,
+                                         cost=cost, methods=methods)
+                except requests.exceptions.RequestException as e:
+                    error = e
+                except json.JSONDecodeError:
+                    raise ValueError("Invalid JSON response from RPC")
+
+                if not self.retry_policy.retryable(methods, error):
+                    logger.error(f"❌ {label} failed on {endpoint.url}, not retrying: {error}")
+                    raise ConnectionError(self._describe_error(error, retried=False))
+                status = getattr(getattr(error, 'response', None), 'status_code', None)
+                if can_fail_over and budget.fail_over():
+                    self.metrics.record_retry(label, endpoint.url, throttled=status == 429)
+                    logger.warning(f"🔀 {self._describe_error(error, retried=False)} from {endpoint.url}. Failing over")
                     continue
-                raise ConnectionError(f"Network error: {e}")
 
-            except json.JSONDecodeError:
-                raise ValueError("Invalid JSON response from RPC")
+                delay = budget.next_delay(retry_after_of(error))
+                if delay is None:
+                    logger.error(f"❌ {label} gave up after {budget.attempt} attempt(s): {error}")
+                    raise ConnectionError(self._describe_error(error, retried=True))
+                self.metrics.record_retry(label, endpoint.url, throttled=status == 429)
+                if status == 429:
+                    logger.warning(f"⏰ 429 Too Many Requests on attempt {budget.attempt}/{budget.max_attempts}. Waiting {delay:.1f}s")
+                else:
+                    logger.warning(f"🌐 {self._describe_error(error, retried=False)} on attempt {budget.attempt}. Waiting {delay:.1f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _describe_error(error: Exception, retried: bool) -> str:
+        if isinstance(error, requests.exceptions.HTTPError):
+            return f"HTTP error: {error}"
+        if isinstance(error, requests.exceptions.Timeout):
+            return "Request timed out after retries" if retried else "Timeout"
+        return f"Network error: {error}"
+
+    def _send_to(self, endpoint: Any, data: str, cancelled: threading.Event = None, chain_probe: bool = False,
+                 timeout: Any = None, label: str = 'call', cost: float = 0, methods: Tuple[str, ...] = (),
+                 sent: threading.Event = None) -> Any:
+        """
+        Send one attempt to an endpoint over its transport and record its health.
+
+        Args:
+            endpoint: Endpoint from the pool
+            data: Serialized JSON-RPC payload
+            cancelled: Set when a hedged duplicate already won; the attempt is then skipped if not yet sent
+            chain_probe: The payload asks for the chain ID itself, so the endpoint is not verified first
+            timeout: (connect, read) timeouts, defaults to the retry policy's
+            label: Method name (or 'batch') the attempt is recorded under in the metrics
+            cost: Compute units of the payload, spent by every attempt
+            methods: Methods of the payload's calls, counted against the current command's call budget
+            sent: Set once the request goes out, after the chain check and the rate limiter
+
+        Returns:
+            Decoded JSON response body
+        """
+        timeout = timeout or self.retry_policy.timeout()
+        try:
+            if not chain_probe:
+                self._verify_endpoint(endpoint, timeout)
+        except requests.exceptions.RequestException:
+            self.pool.record_failure(endpoint)
+            raise
+
+        # Every attempt, including retries, spends a token (or its compute units), taken in priority order
+        waited = self._acquire(endpoint, cost)
+        self.metrics.record_rate_limit_wait(label, endpoint.url, waited)
+        if cancelled is not None and cancelled.is_set():
+            return None
+        bytes_sent = len(data.encode())
+        record_round_trip(methods or (label,))
+        if sent is not None:
+            sent.set()
+        start = time.monotonic()
+        try:
+            result, bytes_received = self.transports[endpoint.url].send(data, timeout)
+        except requests.exceptions.HTTPError as e:
+            self.metrics.record_request(label, endpoint.url, time.monotonic() - start, bytes_sent,
+                                        len(e.response.content or b''), ok=False, compute_units=cost)
+            self.pool.record_failure(endpoint, throttled=e.response.status_code == 429)
+            raise
+        except requests.exceptions.RequestException:
+            self.metrics.record_request(label, endpoint.url, None, bytes_sent, ok=False, compute_units=cost)
+            self.pool.record_failure(endpoint)
+            raise
+        elapsed = time.monotonic() - start
+        self.metrics.record_request(label, endpoint.url, elapsed, bytes_sent, bytes_received, compute_units=cost)
+        self.pool.record_success(endpoint, elapsed)
+        with self._lock:
+            self._latencies.append(elapsed)
+        # A batch carrying eth_chainId verifies the endpoint too, sparing the next call its own check
+        if chain_probe and self._is_expected_chain(self._probed_chain_id(data, result)):
+            self.chain_ids.record(endpoint.url, self.expected_chain_id)
+        return result
+
+    def _acquire(self, endpoint: Any, cost: float) -> float:
+        """
+        Wait for the endpoint's rate limiter at the current priority: one token per request,
+        or the payload's compute units under a compute-unit budget.
+        """
+        scheduler = get_scheduler(endpoint.rate_limiter, self.priority_settings['max_skips'])
+        tokens = cost if self.cu_budget else 1.0
+        return scheduler.acquire(current_priority(self.priority_settings['default']), tokens)
+
+    @staticmethod
+    def _probed_chain_id(data: str, result: Any) -> Any:
+        """The eth_chainId answer in a response to a payload asking for it (single call or batch)."""
+        if isinstance(result, dict):
+            return result.get('result')
+        if not isinstance(result, list):
+            return None
+        probe_ids = {item.get('id') for item in json.loads(data) if item.get('method') == 'eth_chainId'}
+        return next((item.get('result') for item in result
+                     if isinstance(item, dict) and item.get('id') in probe_ids), None)
+
+    def _is_expected_chain(self, chain_id_hex: Any) -> bool:
+        try:
+            return int(chain_id_hex, 16) == self.expected_chain_id
+        except (TypeError, ValueError):
+            return False
+
+    def _verify_endpoint(self, endpoint: Any, timeout: Any = None) -> None:
+        """
+        Make sure an endpoint serves the expected network, asking it at most once per TTL.
+
+        Raises:
+            ValueError: If the endpoint is on another network
+        """
+        if self.chain_ids.verified(endpoint.url, self.expected_chain_id):
+            return
+
+        cost = self.costs.cost('eth_chainId')
+        waited = self._acquire(endpoint, cost)
+        self.metrics.record_rate_limit_wait('eth_chainId', endpoint.url, waited)
+        request_id = self._next_request_id()
+        logger.info(f"🔄 Checking chain ID of {endpoint.url}")
+        data = json.dumps({"jsonrpc": "2.0", "method": "eth_chainId", "params": [], "id": request_id})
+        record_round_trip(('eth_chainId',))
+        start = time.monotonic()
+        try:
+            result, bytes_received = self.transports[endpoint.url].send(data, timeout or self.retry_policy.timeout())
+        except requests.exceptions.RequestException:
+            self.metrics.record_request('eth_chainId', endpoint.url, None, len(data), ok=False, compute_units=cost)
+            raise
+        self.metrics.record_request('eth_chainId', endpoint.url, time.monotonic() - start, len(data), bytes_received,
+                                    compute_units=cost)
+        if not isinstance(result, dict) or 'error' in result:
+            error_msg = result.get('error', {}).get('message', 'Unknown error') if isinstance(result, dict) else result
+            raise ValueError(f"RPC error: {error_msg}")
+        try:
+            self._check_chain_id(result['result'])
+        except ValueError as e:
+            self.chain_ids.forget(endpoint.url)
+            logger.error(f"❌ {endpoint.url}: {e}")
+            raise
+
+        self._count_success()
+        self.chain_ids.record(endpoint.url, self.expected_chain_id)
+        if self.cache is not None:
+            self.cache.put('eth_chainId', [], result['result'])
+        logger.info(f"✅ Connected to {endpoint.url} (Chain ID: {self.expected_chain_id})")
+
+    def _hedge_delay(self) -> float:
+        """Seconds to wait before hedging: the configured percentile of recent latency, clamped."""
+        min_delay = self.hedging['min_delay_ms'] / 1000
+        max_delay = self.hedging['max_delay_ms'] / 1000
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.hedging['min_samples']:
+            return max_delay
+        # Nearest-rank percentile
+        index = max(0, math.ceil(len(samples) * self.hedging['percentile'] / 100) - 1)
+        return min(max(samples[index], min_delay), max_delay)
+
+    def _send_hedged(self, endpoint: Any, group: str, data: str, tried: set, chain_probe: bool = False,
+                     timeout: Any = None, label: str = 'call', cost: float = 0, methods: Tuple[str, ...] = ()) -> Any:
+        """
+        Send a read-only request and, if it is still outstanding after the hedge delay,
+        send a duplicate to a second endpoint. The first successful answer wins and the
+        loser is cancelled: it is never sent if it has not gone out yet, and its result is
+        discarded otherwise. Raises the primary's error if both attempts fail.
+
+        The hedge delay counts from when the primary actually went out, so time spent waiting
+        for a worker, the chain check or the rate limiter never triggers a hedge.
+        """
+        backup = self.pool.select(group, exclude=tried)
+        if backup is None:
+            return self._send_to(endpoint, data, chain_probe=chain_probe, timeout=timeout, label=label, cost=cost,
+                                 methods=methods)
 
-        raise ConnectionError(f"Failed after {self.max_retries} attempts")
+        with self._lock:
+            if self._hedge_executor is None:
+                # A primary and a hedge for each of the pool_size threads sharing the client
+                self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.pool_size,
+                                                          thread_name_prefix='rpc-hedge')
+        cancelled = threading.Event()
+        sent = threading.Event()
+        # Attempts run with the caller's context, so they keep its priority. The primary runs on a
+        # worker too, so that a hedge that wins returns at once instead of after the slow primary.
+        primary = self._hedge_executor.submit(contextvars.copy_context().run, self._send_to, endpoint, data,
+                                              cancelled, chain_probe, timeout, label, cost, methods, sent)
+        primary.add_done_callback(lambda _: sent.set())
+        sent.wait()
+        done, _ = wait([primary], timeout=self._hedge_delay())
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self.hedged_calls += 1
+        tried.add(backup.url)
+        logger.info(f"🪁 Hedging slow call on {endpoint.url} to {backup.url}")
+        hedge = self._hedge_executor.submit(contextvars.copy_context().run, self._send_to, backup, data,
+                                            cancelled, chain_probe, timeout, label, cost, methods)
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    cancelled.set()
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def get_endpoint_health(self) -> List[Dict[str, Any]]:
+        """Latency and error statistics of every configured endpoint."""
+        return self.pool.snapshot()
+
+    def _run_async(self, coroutine: Any) -> Any:
+        """Run a coroutine of the wrapped AsyncRPCClient on the private event loop thread."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='rpc-client-loop',
+                                                     daemon=True)
+                self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
 
     def get_chain_id(self) -> int:
-        """Get and validate the chain ID."""
-        chain_id_hex = self._make_rpc_call('eth_chainId')
+        """Get and validate the chain ID (always asks the node, as it doubles as a connection check)."""
+        chain_id_hex = self._make_rpc_call('eth_chainId', use_cache=False)
+        return self._check_chain_id(chain_id_hex)
+
+    def _check_chain_id(self, chain_id_hex: str) -> int:
+        """Parse an eth_chainId result and make sure it is the expected network."""
         chain_id = int(chain_id_hex, 16)
         if chain_id != self.expected_chain_id:
             raise ValueError(
@@ -164,11 +748,18 @@ class RPCClient:
         return chain_id
 
     def get_network_info(self) -> Dict[str, Any]:
-        """Get basic network information."""
+        """Get basic network information in a single batched round trip (gas price from the oracle when fresh)."""
         try:
-            chain_id = self.get_chain_id()
-            block_number = self.get_block_number()
-            gas_price = self.get_gas_price(unit='gwei')
+            calls = [('eth_chainId', []), ('eth_blockNumber', [])]
+            quote = self.gas_oracle.peek()
+            if quote is None:
+                calls.append(('eth_gasPrice', []))
+            results = self._unwrap(self.batch(calls))
+            if quote is None:
+                quote = self.gas_oracle.update(results[2])
+            chain_id = self._check_chain_id(results[0])
+            block_number = int(results[1], 16)
+            gas_price = self._to_unit(quote.price_wei, 'gwei')
             if gas_price < 0.001:
                 logger.warning(f"Gas price very low ({gas_price:.6f} Gwei) - may cause slow confirmations")
             return {
@@ -188,7 +779,8 @@ class RPCClient:
                 'gas_price_gwei': None
             }
 
-    def _validate_address(self, address: str) -> bool:
+    @staticmethod
+    def _validate_address(address: str) -> bool:
         """Check if address is valid format."""
         return (address.startswith('0x') and
                 len(address) == 42 and
@@ -222,21 +814,23 @@ class RPCClient:
         nonce_hex = self._make_rpc_call('eth_getTransactionCount', [address, 'pending'])
         return int(nonce_hex, 16)
 
-    def get_gas_price(self, unit: str = 'gwei') -> Union[int, float]:
-        """Get current gas price with fallback for zero values only."""
-        with open(CONFIG_PATH, 'r') as f:
-            config = json.load(f)
-        default_gas_price_gwei = config.get('transaction', {}).get('default_gas_price_gwei', 1.0)
-        default_gas_price_wei = default_gas_price_gwei * 1_000_000_000
+    def get_gas_price(self, unit: str = 'gwei', max_age: Optional[float] = None) -> Union[int, float]:
+        """
+        Get current gas price from the gas oracle, with fallback for zero values only.
 
-        gas_price_wei_hex = self._make_rpc_call('eth_gasPrice')
-        logger.info(f"Raw eth_gasPrice hex: {gas_price_wei_hex}")
-        gas_price_wei = int(gas_price_wei_hex, 16)
+        Args:
+            unit: 'wei', 'gwei' or 'ether'
+            max_age: Maximum age of the quote in seconds (default: the oracle TTL); 0 forces a fresh quote
+        """
+        return self._to_unit(self.gas_oracle.quote(max_age).price_wei, unit)
 
-        if gas_price_wei == 0:
-            logger.warning(f"Zero gas price received, using default {default_gas_price_gwei} Gwei")
-            gas_price_wei = default_gas_price_wei
+    def get_gas_price_age(self) -> Optional[float]:
+        """Seconds since the cached gas price was fetched, or None if there is none yet."""
+        return self.gas_oracle.age()
 
+    @staticmethod
+    def _to_unit(gas_price_wei: int, unit: str = 'gwei') -> Union[int, float]:
+        """Convert a price in wei to the requested unit."""
         if unit == 'wei':
             return gas_price_wei
         elif unit == 'gwei':
@@ -262,12 +856,76 @@ class RPCClient:
         except Exception as e:
             logger.warning(f"Gas estimation failed: {e}, using static estimate")
 
+        return self._static_gas_estimate(transaction)
+
+    @staticmethod
+    def _static_gas_estimate(transaction: Dict[str, Any]) -> int:
+        """Intrinsic gas for a plain transfer plus calldata, used when estimation fails."""
         if transaction.get('data') and len(transaction['data']) > 2:
             data_bytes = (len(transaction['data']) - 2) // 2
             return 21_000 + (data_bytes * 16)
         else:
             return 21_000
 
+    def prepare_transaction(self, from_address: str, transaction: Dict[str, Any],
+                            max_gas_price_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fetch everything needed to build a transaction in one batched round trip.
+        The gas price comes from the gas oracle when its quote is fresh enough.
+
+        Args:
+            from_address: Sender address
+            transaction: Call object passed to eth_estimateGas (must contain 'to')
+            max_gas_price_age: Maximum age of a cached gas price in seconds (default: the oracle TTL)
+
+        Returns:
+            Dictionary with 'balance' (wei), 'nonce', 'chain_id', 'gas_price' (wei)
+            and 'gas'. 'nonce' and 'gas' are None when the node could not answer
+            them, so the caller can fall back on its own strategy.
+
+        Raises:
+            ValueError: Invalid input, wrong network or failed balance/gas price lookup
+        """
+        if not self._validate_address(from_address):
+            raise ValueError(f"Invalid address: {from_address}")
+        if 'to' not in transaction:
+            raise ValueError("Transaction missing 'to' address")
+
+        calls = [
+            ('eth_getBalance', [from_address, 'latest']),
+            ('eth_getTransactionCount', [from_address, 'pending']),
+            ('eth_chainId', []),
+            ('eth_estimateGas', [transaction])
+        ]
+        quote = self.gas_oracle.peek(max_gas_price_age)
+        if quote is None:
+            calls.append(('eth_gasPrice', []))
+        results = self.batch(calls)
+        balance_hex, nonce_hex, chain_id_hex, gas_hex = results[:4]
+        self._unwrap([balance_hex, chain_id_hex] + results[4:])
+        if quote is None:
+            quote = self.gas_oracle.update(results[4])
+
+        nonce = None
+        if isinstance(nonce_hex, Exception):
+            logger.warning(f"Nonce lookup failed in batch: {nonce_hex}")
+        else:
+            nonce = int(nonce_hex, 16)
+
+        gas = None
+        if isinstance(gas_hex, Exception):
+            logger.warning(f"Gas estimation failed in batch: {gas_hex}")
+        elif int(gas_hex, 16) > 0:
+            gas = int(gas_hex, 16)
+
+        return {
+            'balance': int(balance_hex, 16),
+            'nonce': nonce,
+            'chain_id': self._check_chain_id(chain_id_hex),
+            'gas_price': quote.price_wei,
+            'gas': gas
+        }
+
     def send_raw_transaction(self, signed_tx_hex: str) -> str:
         """Send a signed transaction to the network."""
         if not signed_tx_hex.startswith('0x'):
@@ -283,35 +941,13 @@ class RPCClient:
     def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
         """
         Check transaction status (pending, confirmed, or not found).
+        The transaction and its receipt are fetched in one batched round trip.
+        A lookup that fails is reported as status 'error' with the reason as its message.
         """
         if not tx_hash.startswith('0x') or len(tx_hash) != 66:
             raise ValueError("Invalid transaction hash")
         try:
-            tx = self._make_rpc_call('eth_getTransactionByHash', [tx_hash])
-            if not tx:
-                return {
-                    'status': 'not_found',
-                    'message': 'Transaction not found',
-                    'gas_used': 0,
-                    'block_number': 'N/A'
-                }
-            receipt = self._make_rpc_call('eth_getTransactionReceipt', [tx_hash])
-            if receipt:
-                status = 'success' if receipt['status'] == '0x1' else 'failed'
-                block_num = int(receipt['blockNumber'], 16) if receipt['blockNumber'] else 0
-                return {
-                    'status': status,
-                    'message': f"Confirmed in block {block_num}",
-                    'gas_used': int(receipt.get('gasUsed', '0x0'), 16),
-                    'block_number': block_num
-                }
-            else:
-                return {
-                    'status': 'pending',
-                    'message': 'Transaction pending',
-                    'gas_used': 0,
-                    'block_number': 'N/A'
-                }
+            return self.fetch_transaction_status(tx_hash)
         except Exception as e:
             return {
                 'status': 'error',
@@ -320,6 +956,43 @@ class RPCClient:
                 'block_number': 'N/A'
             }
 
+    def fetch_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        """
+        Like get_transaction_status, but a lookup that fails raises instead of returning status 'error'.
+
+        Raises:
+            ValueError: If the hash is invalid or the node rejects the calls
+            ConnectionError: If the node cannot be reached
+        """
+        if not tx_hash.startswith('0x') or len(tx_hash) != 66:
+            raise ValueError("Invalid transaction hash")
+        tx, receipt = self._unwrap(self.batch([
+            ('eth_getTransactionByHash', [tx_hash]),
+            ('eth_getTransactionReceipt', [tx_hash])
+        ]))
+        if not tx:
+            return {
+                'status': 'not_found',
+                'message': 'Transaction not found',
+                'gas_used': 0,
+                'block_number': 'N/A'
+            }
+        if receipt:
+            status = 'success' if receipt['status'] == '0x1' else 'failed'
+            block_num = int(receipt['blockNumber'], 16) if receipt['blockNumber'] else 0
+            return {
+                'status': status,
+                'message': f"Confirmed in block {block_num}",
+                'gas_used': int(receipt.get('gasUsed', '0x0'), 16),
+                'block_number': block_num
+            }
+        return {
+            'status': 'pending',
+            'message': 'Transaction pending',
+            'gas_used': 0,
+            'block_number': 'N/A'
+        }
+
     def get_block_number(self) -> int:
         """Get the latest block number."""
         block_hex = self._make_rpc_call('eth_blockNumber')
@@ -345,18 +1018,76 @@ class RPCClient:
         }
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get basic usage statistics."""
+        """
+        Get usage statistics: call counts, hedging, cache and retry totals, plus
+        'methods', 'endpoints' and 'calls' breakdowns with p50/p90/p99 latency.
+        """
+        totals = self.metrics.totals()
         success_rate = (self.success_count / self.call_count * 100) if self.call_count > 0 else 0
         return {
             'total_calls': self.call_count,
             'successful_calls': self.success_count,
             'success_rate': round(success_rate, 1),
-            'network': NETWORK_NAMES.get(self.expected_chain_id, 'Unknown')
+            'hedged_calls': self.hedged_calls,
+            'hedge_wins': self.hedge_wins,
+            'coalesced_calls': self.single_flight.coalesced,
+            'cache_hits': self.cache.hits if self.cache is not None else 0,
+            'cache_misses': self.cache.misses if self.cache is not None else 0,
+            'retries': totals.retries,
+            'throttled': totals.throttled,
+            'rate_limit_wait_s': round(totals.rate_limit_wait_s, 3),
+            'bytes_sent': totals.bytes_sent,
+            'bytes_received': totals.bytes_received,
+            'compute_units': totals.compute_units,
+            'network': NETWORK_NAMES.get(self.expected_chain_id, 'Unknown'),
+            **{key: value for key, value in self.metrics.summary().items() if key != 'commands'}
         }
 
+    def _leave_warm(self) -> bool:
+        """
+        Stop lending this client to the shared gas oracle; returns whether its connections,
+        cache and oracle are shared under keep_warm (and so stay open).
+        """
+        with _WARM_LOCK:
+            state = (_WARM_STATE or {}).get(self._warm_key)
+            if state is None or state['session'] is not self.session:
+                return False
+            if self in state['clients']:
+                state['clients'].remove(self)
+            return True
+
     def close(self):
-        """Clean up resources."""
-        self.session.close()
+        """Clean up resources and add this client's metrics to rpc.metrics.path, if configured."""
+        warm = self._leave_warm()
+        if not warm:
+            self.gas_oracle.stop()
+        totals = self.metrics.totals()
+        command = current_command()
+        if totals.requests:
+            logger.info(f"💰 {command or 'RPC client'}: {totals.compute_units:g} compute units "
+                        f"over {totals.requests} requests")
+            if command:
+                self.metrics.record_command(command, totals.requests, totals.compute_units)
+        if self.metrics_settings['path'] and totals.requests:
+            try:
+                save_metrics(self.metrics, self.metrics_settings['path'], self.metrics_settings['prometheus_textfile'])
+            except OSError as e:
+                logger.warning(f"Could not save RPC metrics: {e}")
+            self.metrics = RPCMetrics()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        if not warm:
+            for transport in self.transports.values():
+                transport.close()
+            self.session.close()
+            if self.cache is not None:
+                self.cache.close()
+        if self._loop is not None:
+            self._run_async(self.async_client.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
         logger.info("RPC Client closed")
 
 if __name__ == '__main__':
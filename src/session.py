@@ -0,0 +1,121 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.networks import client_for
+from src.rpc_client import RPCClient
+from src.settings import as_settings, load_settings
+from src.settings_model import Settings
+from src.transaction import TransactionManager
+from src.wallet import WalletManager
+
+
+class Session:
+    """
+    The CLI's operations as a Python API: one configuration, one RPC client and one wallet store,
+    shared by the wallet and transaction managers. Methods return values and raise exceptions
+    (ValueError for bad input or rejected operations, FileNotFoundError for unknown wallets,
+    ConnectionError when the network cannot be reached) instead of printing and exiting.
+
+    A session is safe to share between threads; keep one open for as long as the service runs so that
+    every operation reuses its connections, response cache and gas price quotes:
+
+        with Session() as session:
+            wei = session.balance('0x...')
+            tx_hash = session.send('0x...', 0.01, password, from_address='0x...')
+    """
+
+    def __init__(self, rpc_url: Optional[str] = None, config: Optional[Union[Settings, Dict[str, Any]]] = None,
+                 wallet_dir: Optional[Union[str, Path]] = None, network: Optional[str] = None, **rpc_options: Any):
+        """
+        Args:
+            rpc_url: RPC endpoint; when omitted, rpc.endpoints in settings.json (falling back to RPC_URL)
+            config: Settings to use instead of settings.json (a Settings object or a dict, validated here)
+            wallet_dir: Directory holding the wallet files (default: wallets/ in the project)
+            network: Profile under networks in the settings (e.g. 'holesky') whose chain, endpoints,
+                explorer and Etherscan API to use instead of the network section
+            **rpc_options: Further RPCClient arguments (timeout, max_retries, pool_size, ...)
+
+        Raises:
+            ValueError: If the settings are missing or invalid, or the network is unknown or has no endpoint set
+        """
+        settings = as_settings(config) if config is not None else load_settings()
+        self.settings = settings.for_network(network) if network else settings
+        rpc_options.setdefault('chain_id', self.settings.network.chain_id)
+        if network and not rpc_url:
+            self.rpc = client_for(network, settings, **rpc_options)
+        else:
+            self.rpc = RPCClient(rpc_url, config=self.settings, **rpc_options)
+        self.wallets = WalletManager(wallet_dir=wallet_dir, rpc_client=self.rpc)
+        self.transactions = TransactionManager(config=self.settings, rpc_client=self.rpc,
+                                               wallet_manager=self.wallets)
+
+    def __enter__(self) -> 'Session':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the RPC client (and with it the session's connections)."""
+        self.transactions.close()
+        self.rpc.close()
+
+    def _address(self, address: Optional[str]) -> str:
+        """The given address, or the default wallet's when none is given."""
+        address = address or self.wallets.get_default_wallet()
+        if not address:
+            raise ValueError("No default wallet set")
+        if not self.wallets._is_valid_address(address):
+            raise ValueError(f"Invalid address: {address}")
+        return address
+
+    # Wallets
+
+    def generate_wallet(self, password: str) -> Dict[str, str]:
+        """Generate and store a new wallet; returns its address and encrypted data."""
+        return self.wallets.generate_wallet(password)
+
+    def import_wallet(self, private_key: str, password: str) -> Dict[str, str]:
+        """Encrypt and store an existing private key; returns its address and encrypted data."""
+        return self.wallets.import_wallet(private_key, password)
+
+    def list_wallets(self) -> List[Dict[str, str]]:
+        """Stored wallets, newest first."""
+        return self.wallets.list_wallets()
+
+    def use_wallet(self, address: str) -> None:
+        """Make address the default wallet."""
+        self.wallets.set_default_wallet(address)
+
+    def default_wallet(self) -> Optional[str]:
+        """Address of the default wallet, if one is set."""
+        return self.wallets.get_default_wallet()
+
+    def wallet_info(self, address: Optional[str] = None, password: Optional[str] = None,
+                    include_balance: bool = True) -> Dict[str, Any]:
+        """Wallet metadata and balance (see WalletManager.get_wallet_info); the private key too with a password."""
+        return self.wallets.get_wallet_info(self._address(address), password, include_balance)
+
+    # Network
+
+    def balance(self, address: Optional[str] = None, unit: str = 'wei') -> Union[int, float]:
+        """Balance of address (default wallet when omitted) in 'wei', 'gwei' or 'ether'."""
+        return self.rpc.get_balance(self._address(address), unit)
+
+    def send(self, to_address: str, amount: float, password: str, from_address: Optional[str] = None) -> str:
+        """Sign and broadcast a transfer of amount ETH from from_address (default wallet); returns the hash."""
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+        return self.transactions.send_transaction(self._address(from_address), to_address, amount, password)
+
+    def tx_status(self, tx_hash: str) -> Dict[str, Any]:
+        """Status of a transaction: 'status', 'message' and, once mined, 'gas_used' and 'block_number'."""
+        return self.rpc.fetch_transaction_status(tx_hash)
+
+    def tx_history(self, address: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Transactions of address (default wallet) from Etherscan, newest first."""
+        return self.transactions.get_transaction_history(self._address(address))
+
+    def export_history(self, address: Optional[str] = None, output_file: Optional[str] = None) -> Path:
+        """Write the transaction history of address (default wallet) to a JSON file; returns its path."""
+        return self.transactions.export_transaction_history(self._address(address), output_file)
@@ -0,0 +1,153 @@
+import contextlib
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:  # pydantic is imported by load_settings, so that reading raw settings stays cheap
+    from src.settings_model import Settings
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+
+# Environment variables overriding single settings: CLI_SETTINGS_<SECTION>__<KEY>[__<KEY>...], with
+# values parsed as JSON when they are valid JSON (CLI_SETTINGS_RPC__CACHE__ENABLED=false) and as strings otherwise
+ENV_PREFIX = 'CLI_SETTINGS_'
+
+# A file modified this recently (seconds) may be rewritten again within the same mtime tick, so its
+# cached contents are not trusted; settings edited by hand are older than this by the next read
+RACY_WINDOW = 1.0
+
+# Parsed and typed settings per file, with the (mtime, size, overrides) stamp they were read at
+_RAW: Dict[Path, Tuple[Tuple, Dict[str, Any]]] = {}
+_TYPED: Dict[Path, Tuple[Tuple, 'Settings']] = {}
+_LOCK = threading.Lock()
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Replace path with text in one step (readers see the old or the new file, never a partial one), mode 0600."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _env_overrides() -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, value) for name, value in os.environ.items() if name.startswith(ENV_PREFIX)))
+
+
+def _apply_overrides(config: Dict[str, Any], overrides: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    if not overrides:
+        return config
+    config = copy.deepcopy(config)
+    for name, value in overrides:
+        *sections, key = name[len(ENV_PREFIX):].lower().split('__')
+        target = config
+        for section in sections:
+            if not isinstance(target.get(section), dict):
+                target[section] = {}
+            target = target[section]
+        try:
+            target[key] = json.loads(value)
+        except ValueError:
+            target[key] = value
+    return config
+
+
+def _stamp(path: Path) -> Tuple[Tuple, bool]:
+    """
+    What a cached read of path is valid for, and whether it may be cached at all.
+
+    Raises:
+        ValueError: If the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise ValueError(f"Configuration file not found at: {path}")
+    racy = time.time() - stat.st_mtime < RACY_WINDOW
+    return (stat.st_mtime_ns, stat.st_size, _env_overrides()), not racy
+
+
+def read_settings(path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """
+    settings.json as parsed JSON with the CLI_SETTINGS_* overrides applied, read again only after the
+    file or the overrides change. The dictionary is shared between callers and must not be modified.
+
+    Raises:
+        ValueError: If the file is missing or not valid JSON
+    """
+    path = Path(path or CONFIG_PATH)
+    stamp, cacheable = _stamp(path)
+    with _LOCK:
+        cached = _RAW.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Configuration file not found at: {path}")
+    except json.JSONDecodeError:
+        raise ValueError(f"Invalid JSON format in configuration file: {path}")
+    if not isinstance(config, dict):
+        raise ValueError(f"Invalid JSON format in configuration file: {path}")
+    config = _apply_overrides(config, stamp[2])
+    if cacheable:
+        with _LOCK:
+            _RAW[path] = (stamp, config)
+    return config
+
+
+def load_settings(path: Optional[Union[str, Path]] = None) -> 'Settings':
+    """
+    settings.json as a validated, typed Settings object, cached like read_settings.
+
+    Raises:
+        ValueError: If the file is missing, not valid JSON or has invalid values
+    """
+    path = Path(path or CONFIG_PATH)
+    stamp, cacheable = _stamp(path)
+    with _LOCK:
+        cached = _TYPED.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    settings = as_settings(read_settings(path), source=path)
+    if cacheable:
+        with _LOCK:
+            _TYPED[path] = (stamp, settings)
+    return settings
+
+
+def as_settings(config: Union['Settings', Dict[str, Any]], source: Any = 'settings') -> 'Settings':
+    """
+    Settings from already parsed settings (e.g. passed to a Session), validated if needed.
+
+    Raises:
+        ValueError: If a value has the wrong type or is out of range
+    """
+    from pydantic import ValidationError
+    from src.settings_model import Settings
+    if isinstance(config, Settings):
+        return config
+    try:
+        return Settings.model_validate(config)
+    except ValidationError as e:
+        problems = '; '.join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        raise ValueError(f"Invalid settings in {source}: {problems}") from None
+
+
+def clear_cache() -> None:
+    """Forget every cached read, e.g. after changing settings files within the same mtime tick."""
+    with _LOCK:
+        _RAW.clear()
+        _TYPED.clear()
@@ -0,0 +1,134 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic import (BaseModel, ConfigDict, Field, NonNegativeFloat, NonNegativeInt, PositiveFloat, PositiveInt,
+                      with_config)
+from typing_extensions import Annotated, Required, TypedDict
+
+# Typed view of settings.json, built by src.settings.load_settings (which caches it). Sections and keys
+# not described here are kept as they are; the rpc.* sections are merged with the *_DEFAULTS of the
+# module that reads them (rpc.cache with rpc_cache.py, rpc.retry with retry.py, ...).
+
+
+class _Section(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+
+
+# The rpc.* sections stay plain dicts, which their modules merge over their *_DEFAULTS, so keys are
+# typed here without defaults: a key left out takes the module's default, a key set is checked.
+_RPC_SECTION = ConfigDict(extra='allow')
+
+
+@with_config(_RPC_SECTION)
+class EndpointSettings(TypedDict, total=False):
+    url: Required[str]    # May reference environment variables: "${RPC_URL}"
+    weight: PositiveFloat
+    groups: List[Literal['read', 'write']]
+
+
+@with_config(_RPC_SECTION)
+class RetrySettings(TypedDict, total=False):
+    deadline: PositiveFloat
+    max_attempts: PositiveInt
+    base_delay: NonNegativeFloat
+    max_delay: NonNegativeFloat
+    connect_timeout: PositiveFloat
+    read_timeout: PositiveFloat
+    heavy_read_timeout: PositiveFloat
+    heavy_methods: List[str]
+
+
+@with_config(_RPC_SECTION)
+class CacheSettings(TypedDict, total=False):
+    enabled: bool
+    max_entries: NonNegativeInt
+    latest_ttl: NonNegativeFloat
+    finality_depth: NonNegativeInt
+    path: Optional[str]
+
+
+@with_config(_RPC_SECTION)
+class RateSettings(TypedDict, total=False):
+    rate: NonNegativeFloat   # 0 turns the limit off
+    burst: NonNegativeFloat
+    shared: bool
+
+
+@with_config(_RPC_SECTION)
+class RateLimitSettings(TypedDict, total=False):
+    default: RateSettings
+    endpoints: Dict[str, RateSettings]
+    shared: bool
+    state_dir: Optional[str]
+
+
+@with_config(_RPC_SECTION)
+class HedgingSettings(TypedDict, total=False):
+    enabled: bool
+    percentile: Annotated[float, Field(gt=0, le=100)]
+    min_delay_ms: NonNegativeFloat
+    max_delay_ms: NonNegativeFloat
+    min_samples: NonNegativeInt
+    window: PositiveInt
+
+
+@with_config(_RPC_SECTION)
+class MetricsSettings(TypedDict, total=False):
+    path: Optional[str]
+    prometheus_textfile: Optional[str]
+
+
+@with_config(_RPC_SECTION)
+class RPCSettings(TypedDict, total=False):
+    endpoints: List[EndpointSettings]
+    retry: RetrySettings
+    cache: CacheSettings
+    rate_limit: RateLimitSettings
+    hedging: HedgingSettings
+    metrics: MetricsSettings
+
+
+class NetworkSettings(_Section):
+    name: str = 'Sepolia Testnet'
+    chain_id: PositiveInt = 11155111
+    currency_symbol: str = 'ETH'
+    block_explorer: str = 'https://sepolia.etherscan.io'
+
+
+class NetworkProfile(NetworkSettings):
+    etherscan_api_url: Optional[str] = None
+    # Same entries as rpc.endpoints ({"url": "${HOLESKY_RPC_URL}", "weight": ..., "groups": [...]})
+    endpoints: List[EndpointSettings] = Field(default_factory=list)
+
+
+class WalletSettings(_Section):
+    storage_path: str = './wallet'
+
+
+class TransactionSettings(_Section):
+    default_gas_limit: PositiveInt = 21000
+    max_gas_price_gwei: PositiveFloat = 100
+    default_gas_price_gwei: PositiveFloat = 1.0
+    etherscan_api_url: Optional[str] = None
+
+
+class Settings(_Section):
+    network: NetworkSettings = Field(default_factory=NetworkSettings)
+    wallet: WalletSettings = Field(default_factory=WalletSettings)
+    transaction: TransactionSettings = Field(default_factory=TransactionSettings)
+    rpc: RPCSettings = Field(default_factory=dict)
+    networks: Dict[str, NetworkProfile] = Field(default_factory=dict)
+
+    def for_network(self, name: str) -> 'Settings':
+        """
+        These settings pointed at the networks.<name> profile: its chain, explorer, Etherscan API and endpoints.
+
+        Raises:
+            ValueError: If no profile has that name
+        """
+        if name not in self.networks:
+            raise ValueError(f"Unknown network: {name} (configured: {', '.join(self.networks) or 'none'})")
+        profile = self.networks[name]
+        network = NetworkSettings(**profile.model_dump(exclude={'etherscan_api_url', 'endpoints'}))
+        transaction = self.transaction.model_copy(update={'etherscan_api_url': profile.etherscan_api_url})
+        return self.model_copy(update={'network': network, 'transaction': transaction,
+                                       'rpc': dict(self.rpc, endpoints=profile.endpoints)})
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def flight_key(method: str, params: List[Any]) -> str:
+    """Key of a call: method plus canonicalized params (key order and whitespace do not matter)."""
+    return f"{method}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls from threads: the first caller for a key
+    runs the call, callers arriving while it is in flight wait for its result (or
+    error) instead of sending their own request.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self._flights[key] = flight = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._land(key)
+            flight.set_exception(e)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: str) -> None:
+        # Callers arriving from now on start a new flight
+        with self._lock:
+            self._flights.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines sharing one event loop."""
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            # A waiter being cancelled must not cancel the shared call
+            return await asyncio.shield(flight)
+
+        flight = asyncio.get_running_loop().create_future()
+        # Errors nobody else waited for are already raised to the leader
+        flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._flights[key] = flight
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._flights.pop(key, None)
+            flight.cancel()
+            raise
+        except BaseException as e:
+            self._flights.pop(key, None)
+            flight.set_exception(e)
+            raise
+        self._flights.pop(key, None)
+        flight.set_result(result)
+        return result
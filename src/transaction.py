@@ -1,21 +1,27 @@
 import json
 import logging
 import os
-import time
 from pathlib import Path
-from typing import Dict, Any
-import rlp
+from typing import TYPE_CHECKING, Dict, Any, Optional, Union
 import requests
 from dotenv import load_dotenv
-from eth_account import Account
 from eth_utils import to_bytes, to_hex, to_checksum_address
 load_dotenv()
 from src.rpc_client import RPCClient
+from src.retry import RetryPolicy
+from src.cassette import cassette_settings, get_json
+from src.priority import CRITICAL, rpc_priority
 from src.wallet import WalletManager
+from src.settings import as_settings, load_settings, read_settings
+
+if TYPE_CHECKING:
+    from src.settings_model import Settings
 
 # Configuration path
 CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
 EXPORT_PATH = Path('/Users/parsaoryani/PycharmProjects/ethereum-cli/exports')
+# Etherscan API serving transaction history (transaction.etherscan_api_url or ETHERSCAN_API_URL override it)
+ETHERSCAN_API_URL = "https://api-sepolia.etherscan.io/api"
 
 # Setup logging
 logging.basicConfig(
@@ -25,39 +31,47 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class TransactionManager:
-    def __init__(self):
+    def __init__(self, config: Optional[Union['Settings', Dict[str, Any]]] = None,
+                 rpc_client: Optional[RPCClient] = None, wallet_manager: Optional[WalletManager] = None):
         """
         Initialize TransactionManager with configuration and dependencies.
-        Loads network settings from config file and initializes RPC client and wallet manager.
+        Loads network settings from config file and initializes RPC client and wallet manager,
+        unless they are passed in (e.g. by a Session sharing them between managers).
         """
         try:
-            with open(CONFIG_PATH, 'r') as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            logger.error("Configuration file not found at: %s", CONFIG_PATH)
-            raise ValueError(f"Configuration file not found at: {CONFIG_PATH}")
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON format in configuration file: %s", CONFIG_PATH)
-            raise ValueError(f"Invalid JSON format in configuration file: {CONFIG_PATH}")
-
-        required_keys = ['network', 'transaction']
-        for key in required_keys:
-            if key not in self.config:
-                logger.error("Missing required configuration key: %s", key)
-                raise ValueError(f"Missing required configuration key: {key}")
-
-        self.rpc_client = RPCClient(
-            rpc_url=os.getenv('RPC_URL'),
-            chain_id=self.config['network'].get('chain_id', 0),
-            timeout=10,
-            max_retries=3
+            raw = config if config is not None else read_settings(CONFIG_PATH)
+            if isinstance(raw, dict):
+                for key in ('network', 'transaction'):
+                    if key not in raw:
+                        raise ValueError(f"Missing required configuration key: {key}")
+            # Typed, validated and cached until settings.json changes
+            self.settings = as_settings(raw) if config is not None else load_settings(CONFIG_PATH)
+        except ValueError as e:
+            logger.error(str(e))
+            raise
+
+        # Endpoints come from rpc.endpoints in settings.json, falling back to RPC_URL; a client
+        # passed in belongs to the caller, who closes it
+        self._owns_rpc_client = rpc_client is None
+        self.rpc_client = rpc_client or RPCClient(
+            chain_id=self.settings.network.chain_id,
+            max_retries=3,
+            config=self.settings
         )
-        self.wallet_manager = WalletManager()
-
-        self.default_gas_limit = self.config['transaction'].get('default_gas_limit', 21000)
-        self.max_gas_price_gwei = self.config['transaction'].get('max_gas_price_gwei', 100)
-        self.default_gas_price_gwei = self.config['transaction'].get('default_gas_price_gwei', 1.0)
+        # Balance lookups of the wallet manager go through the same client
+        self.wallet_manager = wallet_manager or WalletManager(rpc_client=self.rpc_client)
+        # Shared by the nonce, broadcast and Etherscan retries; RPC calls made inside them
+        # draw from the same deadline instead of stacking their own waits on top
+        self.retry_policy = RetryPolicy.from_config(self.settings.rpc.get('retry'), max_attempts=3)
+        # Etherscan lookups are recorded and replayed with the RPC calls (rpc.cassette)
+        self.cassette = cassette_settings(self.settings.rpc.get('cassette'))
+
+        self.default_gas_limit = self.settings.transaction.default_gas_limit
+        self.max_gas_price_gwei = self.settings.transaction.max_gas_price_gwei
+        self.default_gas_price_gwei = self.settings.transaction.default_gas_price_gwei
         self.etherscan_api_key = os.getenv('ETHERSCAN_API_KEY', "")
+        self.etherscan_api_url = os.getenv('ETHERSCAN_API_URL') or \
+            self.settings.transaction.etherscan_api_url or ETHERSCAN_API_URL
 
         if not self.etherscan_api_key:
             logger.warning("Etherscan API key not configured in settings.json")
@@ -67,7 +81,8 @@ class TransactionManager:
     def _build_transaction(self, from_address: str, to_address: str, value_ether: float) -> Dict[str, Any]:
         """
         Build a raw Ethereum transaction with custom gas estimation.
-        Validates addresses and amount, fetches nonce, and estimates gas.
+        Validates addresses and amount, then fetches balance, nonce, chain ID,
+        gas price and gas estimate in a single batched RPC round trip.
         """
         if not self.wallet_manager._is_valid_address(to_address):
             raise ValueError(f"Invalid recipient address: {to_address}")
@@ -79,36 +94,34 @@ class TransactionManager:
         to_address = to_checksum_address(to_address)
         from_address = to_checksum_address(from_address)
         value_wei = int(value_ether * 1_000_000_000_000_000_000)
-        balance_wei = self.rpc_client.get_balance(from_address, 'wei')
+
+        # Balance, nonce, chain ID, gas price and gas estimate in one round trip
+        params = self.rpc_client.prepare_transaction(from_address, {
+            'to': to_address,
+            'value': to_hex(value_wei),
+            'from': from_address
+        })
+        balance_wei = params['balance']
         if balance_wei < value_wei:
             raise ValueError(f"Insufficient balance: {balance_wei / 1e18:.6f} ETH available")
 
-        # Fetch nonce with retry logic
-        nonce = None
-        for attempt in range(3):
+        # Fall back to fetching the nonce with retry logic if the batch could not answer it
+        nonce = params['nonce']
+        if nonce is None:
             try:
-                nonce = self.rpc_client.get_nonce(from_address)
-                break
-            except Exception as e:
-                logger.warning(f"Nonce fetch attempt {attempt + 1} failed: {e}")
-                if attempt == 2:
-                    raise ValueError("Failed to fetch nonce after retries")
-                time.sleep(1)
-
-        chain_id = self.rpc_client.get_chain_id()
+                nonce = self.retry_policy.call(lambda: self.rpc_client.get_nonce(from_address), label="Nonce fetch")
+            except Exception:
+                raise ValueError("Failed to fetch nonce after retries")
+
+        chain_id = params['chain_id']
         gas_price = int(max(
-            min(self.rpc_client.get_gas_price('gwei'), self.max_gas_price_gwei),
+            min(params['gas_price'] / 1_000_000_000, self.max_gas_price_gwei),
             self.default_gas_price_gwei
         ) * 1_000_000_000)
 
-        try:
-            gas_limit = self.rpc_client.estimate_gas({
-                'to': to_address,
-                'value': to_hex(value_wei),
-                'from': from_address
-            })
-        except Exception as e:
-            logger.warning(f"Gas estimation failed: {e}, using default gas limit {self.default_gas_limit}")
+        gas_limit = params['gas']
+        if gas_limit is None:
+            logger.warning(f"Gas estimation failed, using default gas limit {self.default_gas_limit}")
             gas_limit = self.default_gas_limit
 
         gas_cost_wei = gas_limit * gas_price
@@ -135,6 +148,10 @@ class TransactionManager:
         Sign a transaction with manual RLP encoding for compliance with task requirements.
         Validates private key and transaction fields, then signs and serializes the transaction.
         """
+        # eth_account and rlp take about a second to import; only sending needs them
+        import rlp
+        from eth_account import Account
+
         try:
             private_key = to_bytes(hexstr=private_key_hex)
             account = Account.from_key(private_key)
@@ -192,13 +209,17 @@ class TransactionManager:
         Supports CLI command: ./cli send --to [address] --amount [eth_amount]
         """
         logger.info(f"Attempting to get wallet info for {from_address}")
-        wallet_info = self.wallet_manager.get_wallet_info(from_address, password)
+        # Only the key is needed here; the balance comes with the batched build below
+        wallet_info = self.wallet_manager.get_wallet_info(from_address, password, include_balance=False)
         logger.info(f"Wallet info retrieved: private_key_available={wallet_info.get('private_key_available')}")
         if not wallet_info.get('private_key_available', False):
             raise ValueError(wallet_info.get('decryption_error', 'Failed to access private key'))
 
         logger.info("Building transaction...")
-        transaction = self._build_transaction(from_address, to_address, value_ether)
+        # Balance, nonce and gas reads go ahead of any background reads sharing the rate limit
+        # (the broadcast itself is a write and always critical)
+        with rpc_priority(CRITICAL):
+            transaction = self._build_transaction(from_address, to_address, value_ether)
 
         # Convert bytes and numeric fields to hex for JSON serialization
         log_transaction = transaction.copy()
@@ -216,17 +237,18 @@ class TransactionManager:
         logger.info(f"Signed transaction hex: {signed_tx_hex[:50]}...")
 
         logger.info("Sending transaction to network...")
-        for attempt in range(3):
-            try:
-                tx_hash = self.rpc_client.send_raw_transaction(signed_tx_hex)
-                logger.info(f"Transaction sent: {from_address} -> {to_address}, amount={value_ether} ETH, tx_hash={tx_hash}")
-                return tx_hash
-            except ValueError as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt == 2:
-                    raise
-                time.sleep(5)  # Increased delay for rate limiting
-        raise ValueError("Failed to send transaction after retries")
+        # Transport failures are retried within the shared deadline; a rejection by the node
+        # (ValueError) is final, as resending the same signed transaction cannot change it
+        try:
+            tx_hash = self.retry_policy.call(
+                lambda: self.rpc_client.send_raw_transaction(signed_tx_hex),
+                retry_on=(ConnectionError,),
+                label="Broadcast"
+            )
+        except ConnectionError as e:
+            raise ValueError(f"Failed to send transaction after retries: {e}")
+        logger.info(f"Transaction sent: {from_address} -> {to_address}, amount={value_ether} ETH, tx_hash={tx_hash}")
+        return tx_hash
 
     def check_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
         """
@@ -255,42 +277,42 @@ class TransactionManager:
 
         address = to_checksum_address(address)
         url = (
-            f"https://api-sepolia.etherscan.io/api?module=account&action=txlist"
+            f"{self.etherscan_api_url}?module=account&action=txlist"
             f"&address={address}&sort=desc&apikey={self.etherscan_api_key}"
         )
         logger.info(f"Fetching transaction history for {address} from Etherscan")
-        for attempt in range(3):
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data.get('status') != '1':
-                    error_message = data.get('message', 'Unknown Etherscan API error')
-                    error_result = data.get('result', 'No details provided')
-                    logger.error(f"Etherscan API error: {error_message}, details: {error_result}")
-                    raise ValueError(f"Etherscan API error: {error_message}, details: {error_result}")
-                transactions = [{
-                    'hash': tx['hash'],
-                    'from': to_checksum_address(tx['from']),
-                    'to': to_checksum_address(tx['to']) if tx.get('to') else '',
-                    'value': int(tx['value']) / 1e18,  # Convert wei to ETH
-                    'gas': int(tx['gasUsed']),
-                    'gasPrice': int(tx['gasPrice']),
-                    'blockNumber': int(tx['blockNumber'])
-                } for tx in data['result']]
-                logger.info(f"Retrieved {len(transactions)} transactions for {address}")
-                return transactions
-            except requests.RequestException as e:
-                logger.warning(f"Etherscan fetch attempt {attempt + 1} failed: {e}")
-                if attempt == 2:
-                    raise ValueError(f"Failed to fetch transaction history after retries: {str(e)}")
-                time.sleep(1)  # Delay to avoid rate limiting
-        raise ValueError("Failed to fetch transaction history after retries")
-
-    def export_transaction_history(self, address: str, output_file: str = None) -> None:
+
+        def fetch() -> list:
+            data = get_json(url, self.retry_policy.timeout(), self.cassette)
+            if data.get('status') != '1':
+                error_message = data.get('message', 'Unknown Etherscan API error')
+                error_result = data.get('result', 'No details provided')
+                logger.error(f"Etherscan API error: {error_message}, details: {error_result}")
+                raise ValueError(f"Etherscan API error: {error_message}, details: {error_result}")
+            return data['result']
+
+        try:
+            result = self.retry_policy.call(fetch, retry_on=(requests.RequestException,), label="Etherscan fetch")
+        except requests.RequestException as e:
+            raise ValueError(f"Failed to fetch transaction history after retries: {str(e)}")
+
+        transactions = [{
+            'hash': tx['hash'],
+            'from': to_checksum_address(tx['from']),
+            'to': to_checksum_address(tx['to']) if tx.get('to') else '',
+            'value': int(tx['value']) / 1e18,  # Convert wei to ETH
+            'gas': int(tx['gasUsed']),
+            'gasPrice': int(tx['gasPrice']),
+            'blockNumber': int(tx['blockNumber'])
+        } for tx in result]
+        logger.info(f"Retrieved {len(transactions)} transactions for {address}")
+        return transactions
+
+    def export_transaction_history(self, address: str, output_file: str = None) -> Path:
         """
         Export transaction history to a JSON file in the specified exports directory.
         Supports CLI command: ./cli tx export --output [filename]
+        Returns the path written.
         """
         transactions = self.get_transaction_history(address)
         # Use full wallet address in filename if output_file not provided
@@ -305,12 +327,14 @@ class TransactionManager:
         except Exception as e:
             logger.error(f"Failed to export transactions: {e}")
             raise ValueError(f"Failed to export transactions: {e}")
+        return output_path
 
     def close(self):
         """
-        Clean up resources by closing the RPC client.
+        Clean up resources by closing the RPC client, unless it was passed in.
         """
-        self.rpc_client.close()
+        if self._owns_rpc_client:
+            self.rpc_client.close()
         logger.info("TransactionManager closed")
 
 # CLI Interface for transaction commands
@@ -335,18 +359,23 @@ def transaction_send(to_address: str, amount: float, password: str, from_address
 
         tx_hash = manager.send_transaction(from_address, to_address, amount, password)
         print(f"Transaction sent successfully! Hash: {tx_hash}")
-        print(f"Check transaction on Sepolia Etherscan: https://sepolia.etherscan.io/tx/{tx_hash}")
+        network = manager.settings.network
+        if network.block_explorer:
+            print(f"Check transaction on {network.name}: {network.block_explorer.rstrip('/')}/tx/{tx_hash}")
     except ValueError as e:
         print(f"Error: {e}")
         exit(1)
     finally:
         manager.close()
 
-def transaction_status(tx_hash: str) -> None:
+def transaction_status(tx_hash: str, networks: str = None) -> None:
     """
-    CLI command: Check transaction status.
-    Supports: ./cli tx status --hash [tx_hash]
+    CLI command: Check transaction status, on one network or on several at once.
+    Supports: ./cli tx status --hash [tx_hash] [--networks all|sepolia,holesky,...]
     """
+    if networks:
+        _transaction_status_on_networks(tx_hash, networks)
+        return
     try:
         manager = TransactionManager()
         status = manager.check_transaction_status(tx_hash)
@@ -362,6 +391,35 @@ def transaction_status(tx_hash: str) -> None:
     finally:
         manager.close()
 
+def _transaction_status_on_networks(tx_hash: str, networks: str) -> None:
+    """Look a transaction up on every selected network concurrently; exits 1 if a selected network could not answer."""
+    from src.networks import fan_out, network_settings, resolve_networks, skipped_networks
+    try:
+        if not tx_hash.startswith('0x') or len(tx_hash) != 66:
+            raise ValueError("Invalid transaction hash")
+        settings = network_settings()
+        results = fan_out(resolve_networks(networks, settings), lambda client: client.get_transaction_status(tx_hash),
+                          settings)
+        skipped = skipped_networks(networks, settings)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+    print(f"Transaction Hash: {tx_hash}")
+    failed = False
+    for name, status in results.items():
+        label = f"{name} ({settings.networks[name].name})"
+        if isinstance(status, Exception) or status['status'] == 'error':
+            failed = True
+            print(f"{label}: Error: {status if isinstance(status, Exception) else status['message']}")
+        elif status['status'] == 'success':
+            print(f"{label}: {status['status']} - {status['message']}, gas used {status.get('gas_used', 0):,}")
+        else:
+            print(f"{label}: {status['status']} - {status['message']}")
+    if skipped:
+        print(f"Skipped (no RPC endpoint set): {', '.join(skipped)}")
+    if failed:
+        exit(1)
+
 def transaction_history(address: str = None) -> None:
     """
     CLI command: Show transaction history for an address.
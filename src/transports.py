@@ -0,0 +1,348 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import select
+import socket
+import ssl
+import threading
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# RFC 6455 constants
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_OP_CONTINUATION, _OP_TEXT, _OP_BINARY, _OP_CLOSE, _OP_PING, _OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+def _split_timeout(timeout: Any) -> Tuple[Optional[float], Optional[float]]:
+    """(connect, read) from a requests-style timeout: a pair, a single number or None."""
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def is_ipc_url(url: str) -> bool:
+    """Whether an RPC URL names a Unix domain socket (ipc:///path, or a path to a geth-style .ipc file)."""
+    url = url or ''
+    parts = urlsplit(url)
+    if parts.scheme == 'ipc':
+        return True
+    return not parts.scheme and (url.startswith('/') or url.endswith('.ipc'))
+
+
+class HTTPTransport:
+    """JSON-RPC over HTTP POST through the client's requests.Session."""
+
+    def __init__(self, url: str, session: requests.Session, headers: dict):
+        self.url = url
+        self.session = session
+        self.headers = headers
+
+    def send(self, data: str, timeout: Any = None) -> Tuple[Any, int]:
+        """
+        Send a serialized payload.
+
+        Returns:
+            (decoded JSON response, response size in bytes)
+
+        Raises:
+            requests.exceptions.RequestException: On HTTP or network errors
+        """
+        response = self.session.post(self.url, headers=self.headers, data=data, timeout=timeout)
+        response.raise_for_status()
+        return response.json(), len(response.content or b'')
+
+    def close(self) -> None:
+        # The session belongs to the client, which closes it
+        pass
+
+
+class _Connection:
+    """A socket plus the bytes read from it but not consumed yet."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = bytearray()
+
+    def recv_exact(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                raise ConnectionResetError("connection closed by the node")
+            self.buffer += chunk
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def is_stale(self) -> bool:
+        """An idle connection that is readable was closed by the other side (or got unsolicited data)."""
+        if self.buffer:
+            return True
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class _SocketTransport:
+    """
+    Base for transports keeping persistent sockets: one request in flight per connection,
+    idle connections kept for reuse (up to pool_size). Socket errors are raised as requests
+    exceptions so that retries and failover treat every transport alike.
+    """
+
+    def __init__(self, url: str, pool_size: int = 10):
+        self.url = url
+        self.pool_size = pool_size
+        self._idle: List[_Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self, timeout: Optional[float]) -> _Connection:
+        raise NotImplementedError
+
+    def _exchange(self, connection: _Connection, payload: bytes) -> Tuple[Any, int]:
+        raise NotImplementedError
+
+    def _checkout(self, timeout: Optional[float]) -> _Connection:
+        with self._lock:
+            while self._idle:
+                connection = self._idle.pop()
+                if not connection.is_stale():
+                    return connection
+                connection.close()
+        try:
+            connection = self._connect(timeout)
+        except socket.timeout as e:
+            raise requests.exceptions.ConnectTimeout(f"Connecting to {self.url} timed out") from e
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(f"Cannot connect to {self.url}: {e}") from e
+        logger.info(f"🔌 Connected to {self.url}")
+        return connection
+
+    def _checkin(self, connection: _Connection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def send(self, data: str, timeout: Any = None) -> Tuple[Any, int]:
+        """
+        Send a serialized payload over a pooled connection.
+
+        Returns:
+            (decoded JSON response, response size in bytes)
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors and timeouts
+        """
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        connection = self._checkout(connect_timeout)
+        try:
+            connection.sock.settimeout(read_timeout)
+            result = self._exchange(connection, data.encode())
+        except socket.timeout as e:
+            connection.close()
+            raise requests.exceptions.ReadTimeout(f"No response from {self.url} in time") from e
+        except OSError as e:
+            connection.close()
+            raise requests.exceptions.ConnectionError(f"Connection to {self.url} failed: {e}") from e
+        except BaseException:
+            connection.close()
+            raise
+        self._checkin(connection)
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class IPCTransport(_SocketTransport):
+    """
+    JSON-RPC over a Unix domain socket (geth-style .ipc). Messages carry no framing:
+    a response ends where its JSON value does.
+    """
+
+    def __init__(self, url: str, pool_size: int = 10):
+        super().__init__(url, pool_size)
+        parts = urlsplit(url)
+        self.path = parts.path if parts.scheme == 'ipc' else url
+
+    def _connect(self, timeout: Optional[float]) -> _Connection:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(os.path.expanduser(self.path))
+        except OSError:
+            sock.close()
+            raise
+        return _Connection(sock)
+
+    def _exchange(self, connection: _Connection, payload: bytes) -> Tuple[Any, int]:
+        connection.sock.sendall(payload)
+        decoder = json.JSONDecoder()
+        while True:
+            text = bytes(connection.buffer).lstrip()
+            # Only try to parse once the buffer could hold a complete object or array
+            if text.rstrip()[-1:] in (b'}', b']'):
+                try:
+                    decoded = text.decode()
+                    result, end = decoder.raw_decode(decoded)
+                except ValueError:
+                    pass
+                else:
+                    consumed = len(decoded[:end].encode())
+                    connection.buffer = bytearray(text[consumed:].lstrip())
+                    return result, consumed
+            chunk = connection.sock.recv(65536)
+            if not chunk:
+                raise ConnectionResetError("connection closed by the node")
+            connection.buffer += chunk
+
+
+def _mask(payload: bytes, key: bytes) -> bytes:
+    """XOR payload with the repeating 4-byte masking key (RFC 6455, section 5.3)."""
+    if not payload:
+        return b''
+    stream = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(len(payload), 'big')
+
+
+class WebSocketTransport(_SocketTransport):
+    """JSON-RPC over persistent WebSocket connections (ws:// and wss://), one text message per payload."""
+
+    def _connect(self, timeout: Optional[float]) -> _Connection:
+        parts = urlsplit(self.url)
+        secure = parts.scheme == 'wss'
+        host = parts.hostname
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+            connection = _Connection(sock)
+            self._handshake(connection, parts, host, port)
+        except BaseException:
+            sock.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _handshake(connection: _Connection, parts: Any, host: str, port: int) -> None:
+        key = base64.b64encode(os.urandom(16)).decode()
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        host_header = host if parts.port is None else f"{host}:{port}"
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        connection.sock.sendall(request.encode())
+        while b'\r\n\r\n' not in connection.buffer:
+            chunk = connection.sock.recv(4096)
+            if not chunk:
+                raise ConnectionResetError("connection closed during the WebSocket handshake")
+            connection.buffer += chunk
+        head, _, rest = bytes(connection.buffer).partition(b'\r\n\r\n')
+        connection.buffer = bytearray(rest)
+        lines = head.decode('latin-1').split('\r\n')
+        status = lines[0].split()
+        if len(status) < 2 or status[1] != '101':
+            raise requests.exceptions.ConnectionError(f"WebSocket handshake refused: {lines[0]}")
+        headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(':') for line in lines[1:])}
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        if headers.get('sec-websocket-accept') != expected:
+            raise requests.exceptions.ConnectionError("WebSocket handshake failed: bad Sec-WebSocket-Accept")
+
+    @staticmethod
+    def _send_frame(connection: _Connection, opcode: int, payload: bytes) -> None:
+        # Client frames are always masked
+        header = bytearray([0x80 | opcode])
+        size = len(payload)
+        if size < 126:
+            header.append(0x80 | size)
+        elif size < 1 << 16:
+            header.append(0x80 | 126)
+            header += size.to_bytes(2, 'big')
+        else:
+            header.append(0x80 | 127)
+            header += size.to_bytes(8, 'big')
+        key = os.urandom(4)
+        connection.sock.sendall(bytes(header) + key + _mask(payload, key))
+
+    @staticmethod
+    def _read_frame(connection: _Connection) -> Tuple[bool, int, bytes]:
+        first, second = connection.recv_exact(2)
+        size = second & 0x7F
+        if size == 126:
+            size = int.from_bytes(connection.recv_exact(2), 'big')
+        elif size == 127:
+            size = int.from_bytes(connection.recv_exact(8), 'big')
+        key = connection.recv_exact(4) if second & 0x80 else None
+        payload = connection.recv_exact(size)
+        if key is not None:
+            payload = _mask(payload, key)
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def _exchange(self, connection: _Connection, payload: bytes) -> Tuple[Any, int]:
+        self._send_frame(connection, _OP_TEXT, payload)
+        message = bytearray()
+        while True:
+            fin, opcode, data = self._read_frame(connection)
+            if opcode == _OP_PING:
+                self._send_frame(connection, _OP_PONG, data)
+                continue
+            if opcode == _OP_PONG:
+                continue
+            if opcode == _OP_CLOSE:
+                raise ConnectionResetError("WebSocket closed by the node")
+            message += data
+            if fin:
+                return json.loads(message.decode()), len(message)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            try:
+                self._send_frame(connection, _OP_CLOSE, (1000).to_bytes(2, 'big'))
+            except OSError:
+                pass
+            connection.close()
+
+
+def transport_for(url: str, session: requests.Session, headers: dict, pool_size: int = 10) -> Any:
+    """
+    Pick the transport for an RPC URL by its scheme: http(s)://, ws(s):// or ipc:///path
+    (a bare path to a .ipc file works too).
+
+    Raises:
+        ValueError: If the scheme is not supported
+    """
+    if is_ipc_url(url):
+        return IPCTransport(url, pool_size)
+    scheme = urlsplit(url or '').scheme
+    if scheme in ('ws', 'wss'):
+        return WebSocketTransport(url, pool_size)
+    if scheme in ('http', 'https', ''):
+        return HTTPTransport(url, session, headers)
+    raise ValueError(f"Unsupported RPC URL scheme: {scheme}")
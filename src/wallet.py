@@ -6,11 +6,10 @@ import base64
 from pathlib import Path
 from typing import Dict, Tuple, Optional, List, Any
 
-from _pysha3 import keccak_256
-from ecdsa import SigningKey, SECP256k1
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.fernet import Fernet
+from src.settings import atomic_write, read_settings
+
+# ecdsa, _pysha3 and cryptography are imported by the methods that use them, so commands
+# that only read wallet files (wallet list, wallet use) start without loading them
 
 # Wallet storage configuration
 WALLET_DIR = Path(__file__).parent.parent / 'wallets'
@@ -29,23 +28,27 @@ class WalletManager:
     with PBKDF2 key derivation from user passwords.
     """
 
-    def __init__(self):
+    def __init__(self, wallet_dir: Optional[Path] = None, rpc_client: Any = None):
         """
         Initialize WalletManager.
 
-        Creates necessary directories and loads configuration.
-        """
-        # Load configuration
-        with open(CONFIG_PATH, 'r') as f:
-            self.config = json.load(f)
+        Reads no settings and writes nothing: the default wallet lives in its own state file
+        (default.txt in the wallet directory), written only by set_default_wallet.
 
+        Args:
+            wallet_dir: Directory holding the wallet files (default: wallets/ in the project)
+            rpc_client: RPCClient to fetch balances with; without one, each balance lookup
+                opens and closes its own client
+        """
         # Wallet storage settings
-        self.wallet_dir = WALLET_DIR
-        self.default_wallet_file = DEFAULT_WALLET_FILE
+        self.wallet_dir = Path(wallet_dir) if wallet_dir else WALLET_DIR
+        self.default_wallet_file = self.wallet_dir / 'default.txt' if wallet_dir else DEFAULT_WALLET_FILE
+        self.rpc_client = rpc_client
 
-        # Ensure default wallet file exists
-        if not self.default_wallet_file.exists():
-            self.default_wallet_file.write_text('')
+    @property
+    def config(self) -> Dict[str, Any]:
+        """settings.json, read on first use and cached until it changes (wallet operations need none of it)."""
+        return read_settings(CONFIG_PATH)
 
     def generate_wallet(self, password: str) -> Dict[str, str]:
         """
@@ -60,6 +63,9 @@ class WalletManager:
         Raises:
             ValueError: If password is too weak
         """
+        from _pysha3 import keccak_256
+        from ecdsa import SigningKey, SECP256k1
+
         # Validate password strength
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
@@ -159,13 +165,16 @@ class WalletManager:
             'message': 'Wallet imported successfully. Save your password securely!'
         }
 
-    def get_wallet_info(self, address: str, password: Optional[str] = None) -> Dict[str, Any]:
+    def get_wallet_info(self, address: str, password: Optional[str] = None,
+                        include_balance: bool = True) -> Dict[str, Any]:
         """
         Get wallet information including balance and metadata.
 
         Args:
             address: Ethereum wallet address
             password: Password to decrypt private key (optional)
+            include_balance: Fetch the balance from the network (callers that fetch it
+                themselves, like sending, skip the round trip)
 
         Returns:
             Dictionary with wallet information and balance
@@ -177,29 +186,31 @@ class WalletManager:
         # Load wallet metadata from secure JSON file
         wallet_data = self._load_wallet(address)
 
-        # Get current balance from Ethereum network using RPC client
-        from src.rpc_client import RPCClient
-        client = RPCClient()
-        try:
-            # Get balance in different units
-            balance_eth = client.get_balance(address, 'ether')  # Human readable
-            balance_wei = client.get_balance(address, 'wei')  # Smallest unit
-        finally:
-            client.close()  # Always close RPC connection
-
         # Prepare base wallet information structure
         wallet_info = {
             'address': address,
-            'balance': {
-                'ether': round(balance_eth, 6),  # 6 decimal places for display
-                'wei': balance_wei,  # Raw wei value
-                'gwei': round(balance_wei / 1_000_000_000, 2)  # Gwei for gas calculations
-            },
             'created_at': wallet_data.get('created_at', 'Unknown'),  # Creation timestamp
             'imported': wallet_data.get('imported', False),  # Generated vs imported
             'private_key_available': password is not None  # Whether private key can be decrypted
         }
 
+        if include_balance:
+            # Get current balance from Ethereum network using RPC client, in one call (in wei)
+            if self.rpc_client is not None:
+                balance_wei = self.rpc_client.get_balance(address, 'wei')
+            else:
+                from src.rpc_client import RPCClient
+                client = RPCClient()
+                try:
+                    balance_wei = client.get_balance(address, 'wei')
+                finally:
+                    client.close()  # Always close RPC connection
+            wallet_info['balance'] = {
+                'ether': round(balance_wei / 1_000_000_000_000_000_000, 6),  # 6 decimal places for display
+                'wei': balance_wei,  # Raw wei value
+                'gwei': round(balance_wei / 1_000_000_000, 2)  # Gwei for gas calculations
+            }
+
         # Attempt to decrypt private key if password provided
         if password:
             try:
@@ -247,10 +258,8 @@ class WalletManager:
             raise ValueError("Invalid address")
         if not self._wallet_file_exists(address):
             raise FileNotFoundError(f"Wallet file not found for address: {address}")
-        self.default_wallet_file.write_text(address)
-        self.config['wallet']['default_wallet'] = address
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        # Replaced in one step, so concurrent commands read the old or the new default, never a partial one
+        atomic_write(self.default_wallet_file, address)
         return True
 
     def get_default_wallet(self) -> Optional[str]:
@@ -281,6 +290,9 @@ class WalletManager:
         Returns:
             40-character hexadecimal Ethereum address
         """
+        from _pysha3 import keccak_256
+        from ecdsa import SigningKey, SECP256k1
+
         # Create signing key
         signing_key = SigningKey.from_string(private_key_bytes, curve=SECP256k1)
         verifying_key = signing_key.verifying_key
@@ -331,9 +343,8 @@ class WalletManager:
         """
         wallet_file = self.wallet_dir / f"{address}.json"
 
-        # Ensure file permissions are secure (owner read/write only)
-        wallet_file.write_text(json.dumps(wallet_data, indent=2))
-        os.chmod(wallet_file, 0o600)  # Owner read/write only
+        # Written in one step to a file that is owner read/write only (0600) from the start
+        atomic_write(wallet_file, json.dumps(wallet_data, indent=2))
 
     def _load_wallet(self, address: str) -> Dict[str, Any]:
         """
@@ -368,6 +379,10 @@ class WalletManager:
         Returns:
             Dictionary with salt and encrypted key
         """
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        from cryptography.fernet import Fernet
+
         # Generate random salt for PBKDF2
         salt = os.urandom(16)
 
@@ -406,6 +421,10 @@ class WalletManager:
         Raises:
             ValueError: Invalid password or corrupted data
         """
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        from cryptography.fernet import Fernet
+
         try:
             # Convert hex strings back to bytes
             salt = bytes.fromhex(wallet_data['salt'])
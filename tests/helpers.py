@@ -0,0 +1,19 @@
+import time
+from typing import Callable
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic tests: pass it as clock=..., then move clock.now."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Poll predicate until it holds or timeout seconds have passed; the caller asserts what it needs."""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.async_rpc_client import AsyncRPCClient
+from src.call_budget import command_usage, reset_usage
+from src.metrics import set_command
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Minimal JSON-RPC stand-in answering a few eth_* methods."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _answer(self, request):
+        results = {
+            'eth_chainId': '0xaa36a7',
+            'eth_getBalance': '0x1bc16d674ec80000',  # 2 ETH
+            'eth_getTransactionCount': '0x5',
+            'eth_gasPrice': self.server.gas_price,
+            'eth_blockNumber': '0x123',
+        }
+        if request['method'] not in results:
+            return {"jsonrpc": "2.0", "id": request['id'], "error": {"code": -32601, "message": "method not found"}}
+        return {"jsonrpc": "2.0", "id": request['id'], "result": results[request['method']]}
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests += 1
+            server.hosts.append(self.headers['Host'])
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            throttled = server.throttle_next > 0
+            if throttled:
+                server.throttle_next -= 1
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+
+        if throttled:
+            self.send_response(429, 'Too Many Requests')
+            if server.retry_after is not None:
+                self.send_header('Retry-After', server.retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if isinstance(body, list):
+            response = [self._answer(item) for item in reversed(body)]
+        else:
+            response = self._answer(body)
+        data = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestAsyncRPCClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.throttle_next = 0
+        self.server.retry_after = None
+        self.server.latency = 0.0
+        self.server.gas_price = '0x3b9aca00'  # 1 Gwei
+        self.server.hosts = []
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _client(self, **kwargs):
+        return AsyncRPCClient(rpc_url=self.url, chain_id=11155111, rate_limiter=NullRateLimiter(), **kwargs)
+
+    def test_read_methods(self):
+        """Test that the async client mirrors the sync read methods."""
+        async def scenario():
+            async with self._client() as client:
+                return (
+                    await client.get_chain_id(),
+                    await client.get_balance("0x1234567890123456789012345678901234567890", 'ether'),
+                    await client.get_nonce("0x1234567890123456789012345678901234567890"),
+                    await client.get_gas_price('gwei'),
+                    await client.get_block_number(),
+                    client.get_stats()
+                )
+
+        chain_id, balance, nonce, gas_price, block, stats = asyncio.run(scenario())
+        self.assertEqual(chain_id, 11155111)
+        self.assertEqual(balance, 2.0)
+        self.assertEqual(nonce, 5)
+        self.assertEqual(gas_price, 1.0)
+        self.assertEqual(block, 0x123)
+        self.assertEqual(stats['total_calls'], 5)
+        self.assertEqual(stats['successful_calls'], 5)
+
+    def test_batch_order_and_item_errors(self):
+        """Test that batch results come back in request order with per-item errors."""
+        async def scenario():
+            async with self._client() as client:
+                return await client.batch([('eth_blockNumber', []), ('eth_unknown', []), ('eth_chainId', [])])
+
+        results = asyncio.run(scenario())
+        self.assertEqual(results[0], '0x123')
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], '0xaa36a7')
+
+    def test_concurrency_is_bounded(self):
+        """Test that the semaphore caps the number of in-flight requests."""
+        self.server.latency = 0.05
+
+        async def scenario():
+            async with self._client(max_concurrency=3) as client:
+                return await asyncio.gather(*(client.get_balance(f"0x{i:040x}") for i in range(12)))
+
+        results = asyncio.run(scenario())
+        self.assertEqual(results, [2.0] * 12)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_identical_calls_are_coalesced(self):
+        """Test that identical concurrent read-only calls share one request."""
+        self.server.latency = 0.05
+
+        async def scenario():
+            async with self._client() as client:
+                results = await asyncio.gather(*(client.get_block_number() for _ in range(12)))
+                return results, client.get_stats()
+
+        results, stats = asyncio.run(scenario())
+        self.assertEqual(results, [0x123] * 12)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(stats['coalesced_calls'], 11)
+
+    def test_retry_on_429(self):
+        """Test that 429s are retried under the retry policy, honoring Retry-After."""
+        self.server.throttle_next = 2
+        self.server.retry_after = '3'
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async def scenario():
+            async with self._client(max_retries=3) as client:
+                with patch('src.async_rpc_client.asyncio.sleep', new=fake_sleep):
+                    return await client.get_block_number(), client.retry_policy
+
+        block, policy = asyncio.run(scenario())
+        self.assertEqual(block, 0x123)
+        self.assertEqual(len(sleeps), 2)
+        for delay in sleeps:
+            self.assertGreaterEqual(delay, 3)
+            self.assertLess(delay, policy.deadline)
+
+    def test_retries_stop_at_max_attempts(self):
+        """Test that a node that keeps throttling fails the call after max_attempts, with jittered waits."""
+        self.server.throttle_next = 10
+
+        async def fake_sleep(delay):
+            pass
+
+        async def scenario():
+            async with self._client(max_retries=2) as client:
+                with patch('src.async_rpc_client.asyncio.sleep', new=fake_sleep):
+                    return await client.get_block_number()
+
+        with self.assertRaisesRegex(ConnectionError, "429"):
+            asyncio.run(scenario())
+        self.assertEqual(self.server.requests, 2)
+
+    def test_zero_gas_price_falls_back_to_int_wei(self):
+        """Test that the default gas price used for a zero quote is a whole number of wei."""
+        self.server.gas_price = '0x0'
+
+        async def scenario():
+            async with self._client() as client:
+                return await client.get_gas_price('wei')
+
+        gas_price = asyncio.run(scenario())
+        self.assertIsInstance(gas_price, int)
+        self.assertGreater(gas_price, 0)
+
+    def test_host_header_keeps_the_port(self):
+        """Test that the Host header names a non-default port."""
+        async def scenario():
+            async with self._client() as client:
+                return await client.get_block_number()
+
+        asyncio.run(scenario())
+        self.assertEqual(self.server.hosts, [f"127.0.0.1:{self.server.server_address[1]}"])
+
+    def test_unsupported_url(self):
+        """Test that non-HTTP URLs are rejected."""
+        with self.assertRaises(ValueError):
+            AsyncRPCClient(rpc_url="ftp://example.org", chain_id=11155111)
+
+    def test_sync_client_wraps_async_client(self):
+        """Test that RPCClient keeps its blocking API when backed by an AsyncRPCClient."""
+        client = RPCClient(chain_id=11155111, async_client=self._client())
+        try:
+            self.assertEqual(client.rpc_url, self.url)
+            self.assertEqual(client.get_balance("0x1234567890123456789012345678901234567890", 'wei'),
+                             2000000000000000000)
+            self.assertEqual(client.get_network_info()['latest_block'], 0x123)
+        finally:
+            client.close()
+
+    def test_sync_client_counts_async_calls_against_the_budget(self):
+        """Test that calls sent through a wrapped AsyncRPCClient count for the current command."""
+        set_command('balance')
+        client = RPCClient(chain_id=11155111, async_client=self._client())
+        try:
+            client.get_balance("0x1234567890123456789012345678901234567890", 'wei')
+            usage = command_usage('balance')
+            self.assertEqual((usage.round_trips, usage.calls['eth_getBalance']), (2, 1))
+        finally:
+            client.close()
+            set_command(None)
+            reset_usage()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from eth_account import Account
+
+from src.call_budget import (CALL_BUDGET_DEFAULTS, CallBudgetExceeded, check_budget, command_usage,
+                             record_round_trip, reset_usage)
+from src.metrics import set_command
+from src.mock_node import MockNode
+
+# The CLI imports its modules the way ./cli does, with src on the path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+from src import main  # noqa: E402
+import wallet as cli_wallet  # noqa: E402
+from src import wallet as src_wallet  # noqa: E402
+
+PRIVATE_KEY = "22" * 32
+PASSWORD = "Budget1234!"
+SENDER = Account.from_key(PRIVATE_KEY).address
+RECIPIENT = "0x0987654321098765432109876543210987654321"
+
+
+class TestCallUsage(unittest.TestCase):
+    def tearDown(self):
+        set_command(None)
+        reset_usage()
+
+    def test_usage_is_counted_per_command(self):
+        """Test that calls and round trips are attributed to the command running."""
+        set_command('balance')
+        record_round_trip(('eth_chainId',))
+        record_round_trip(('eth_getBalance', 'eth_getTransactionCount'))
+        set_command('tx status')
+        record_round_trip(('eth_getTransactionReceipt',))
+
+        usage = command_usage('balance')
+        self.assertEqual((usage.total_calls, usage.round_trips), (3, 2))
+        self.assertEqual(usage.describe(), "3 calls in 2 round trips "
+                                           "(eth_chainId x1, eth_getBalance x1, eth_getTransactionCount x1)")
+        self.assertEqual(command_usage('tx status').round_trips, 1)
+
+    def test_budget_check(self):
+        """Test that going over either limit fails, and commands without a budget pass."""
+        set_command('balance')
+        record_round_trip(('eth_chainId',))
+        record_round_trip(('eth_getBalance',))
+        check_budget('balance')
+        record_round_trip(('eth_getBalance',))
+        with self.assertRaises(CallBudgetExceeded) as cm:
+            check_budget('balance')
+        self.assertIn("3 calls > 2; 3 round trips > 2", str(cm.exception))
+        check_budget('balance', {'balance': {'calls': 5}})
+        check_budget('stats')
+
+
+class TestCommandBudgets(unittest.TestCase):
+    """Every budgeted CLI command, run cold against the mock node, stays within its budget."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        wallet_dir = Path(self.tmp.name)
+        self.patchers = [patch.object(module, name, value) for module in (cli_wallet, src_wallet)
+                         for name, value in (('WALLET_DIR', wallet_dir), ('DEFAULT_WALLET_FILE', wallet_dir / 'default.txt'))]
+        for patcher in self.patchers:
+            patcher.start()
+        src_wallet.WalletManager().import_wallet(PRIVATE_KEY, PASSWORD)
+        self.node = MockNode(accounts={SENDER: 10 ** 18}).start()
+        self.env = patch.dict(os.environ, {'RPC_URL': self.node.url, 'RPC_CALL_BUDGET': 'enforce'})
+        self.env.start()
+        reset_usage()
+
+    def tearDown(self):
+        self.env.stop()
+        self.node.stop()
+        for patcher in self.patchers:
+            patcher.stop()
+        set_command(None)
+        reset_usage()
+        self.tmp.cleanup()
+
+    def _run(self, *argv):
+        with patch.object(sys, 'argv', ['cli', *argv]), contextlib.redirect_stdout(io.StringIO()) as output:
+            try:
+                main.run()
+            except SystemExit as e:
+                self.fail(f"{' '.join(argv)} exited with {e.code}: {output.getvalue()}")
+        return output.getvalue()
+
+    def _assert_usage(self, command, calls, round_trips):
+        usage = command_usage(command)
+        budget = CALL_BUDGET_DEFAULTS['budgets'][command]
+        self.assertEqual((usage.total_calls, usage.round_trips), (calls, round_trips), usage.describe())
+        self.assertLessEqual(usage.total_calls, budget['calls'])
+        self.assertLessEqual(usage.round_trips, budget['round_trips'])
+
+    def test_balance(self):
+        output = self._run('balance', '--address', SENDER)
+        self.assertIn("Balance: 1.000000 ETH", output)
+        self._assert_usage('balance', 2, 2)
+
+    def test_wallet_show(self):
+        output = self._run('wallet', 'show', '--address', SENDER.lower())
+        self.assertIn("Balance: 1.000000 ETH", output)
+        self._assert_usage('wallet show', 2, 2)
+
+    def test_send(self):
+        output = self._run('send', '--to', RECIPIENT, '--amount', '0.1', '--from', SENDER.lower(),
+                           '--password', PASSWORD)
+        self.assertIn("Transaction sent successfully", output)
+        self.assertEqual(self.node.chain.balance(RECIPIENT), 10 ** 17)
+        self._assert_usage('send', 6, 2)
+
+    def test_tx_status(self):
+        tx = Account.sign_transaction({'nonce': 0, 'gasPrice': 10 ** 9, 'gas': 21000, 'to': RECIPIENT,
+                                       'value': 1, 'data': b'', 'chainId': 11155111}, "0x" + PRIVATE_KEY)
+        tx_hash = self.node.chain.submit(tx.raw_transaction)
+        output = self._run('tx', 'status', '--hash', tx_hash)
+        self.assertIn("Status: success", output)
+        self._assert_usage('tx status', 3, 2)
+
+    def test_enforcement_fails_the_command(self):
+        """Test that a command over a budget from settings.json exits with an error when enforcement is on."""
+        settings_file = Path(self.tmp.name) / 'settings.json'
+        settings_file.write_text(json.dumps({'rpc': {'call_budget': {'budgets': {'balance': {'calls': 1}}}}}))
+        with patch('src.call_budget.CONFIG_PATH', settings_file), \
+                patch.object(sys, 'argv', ['cli', 'balance', '--address', SENDER]), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            with self.assertRaises(SystemExit):
+                main.run()
+        self.assertIn("over its RPC budget", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
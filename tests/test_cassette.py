@@ -0,0 +1,203 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src import cassette as cassette_module
+from src.cassette import (Cassette, CassetteMiss, RecordingTransport, ReplayTransport, cassette_settings,
+                          get_json, redact_url)
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+class EchoTransport:
+    """Answers every call with a fixed result per method, echoing request ids."""
+
+    def __init__(self, results):
+        self.results = results
+        self.closed = False
+
+    def send(self, data, timeout=None):
+        request = json.loads(data)
+        if isinstance(request, list):
+            return [{"jsonrpc": "2.0", "id": item['id'], "result": self.results[item['method']]}
+                    for item in reversed(request)], 100
+        return {"jsonrpc": "2.0", "id": request['id'], "result": self.results[request['method']]}, 50
+
+    def close(self):
+        self.closed = True
+
+
+def _payload(method, params, request_id):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'session.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self, payloads, results):
+        cassette = Cassette(self.path)
+        recorder = RecordingTransport(EchoTransport(results), cassette)
+        for payload in payloads:
+            recorder.send(payload)
+        recorder.close()
+        self.assertTrue(recorder.inner.closed)
+        return Cassette.load(self.path)
+
+    def test_replay_matches_on_method_and_params(self):
+        """Test that replay answers with the recording of the same call, under the new request id."""
+        cassette = self._record([_payload('eth_blockNumber', [], 1), _payload('eth_getBalance', [ADDRESS, 'latest'], 2)],
+                                {'eth_blockNumber': '0x10', 'eth_getBalance': '0x1'})
+        replay = ReplayTransport(cassette, speed=0)
+
+        result, size = replay.send(_payload('eth_getBalance', [ADDRESS, 'latest'], 41))
+        self.assertEqual(result, {"jsonrpc": "2.0", "id": 41, "result": '0x1'})
+        self.assertEqual(size, 50)
+        with self.assertRaises(CassetteMiss):
+            replay.send(_payload('eth_getBalance', [ADDRESS, 'pending'], 42))
+
+    def test_repeated_calls_replay_in_order_then_repeat_the_last(self):
+        """Test that a polled call sees its recorded answers in order, then the last one."""
+        cassette = Cassette(self.path)
+        key = '{"method"}'
+        for result in (None, '0xreceipt'):
+            cassette.record(key, {}, 0.0, {"id": 1, "result": result}, 10)
+        self.assertEqual([cassette.play(key)['response']['result'] for _ in range(3)], [None, '0xreceipt', '0xreceipt'])
+
+    def test_batch_ids_are_mapped(self):
+        """Test that a batch answered out of order gets the replayed request's ids back."""
+        cassette = self._record([json.dumps([
+            {"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1},
+            {"jsonrpc": "2.0", "method": "eth_chainId", "params": [], "id": 2}
+        ])], {'eth_blockNumber': '0x10', 'eth_chainId': '0xaa36a7'})
+
+        result, _ = ReplayTransport(cassette, speed=0).send(json.dumps([
+            {"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 7},
+            {"jsonrpc": "2.0", "method": "eth_chainId", "params": [], "id": 8}
+        ]))
+        self.assertEqual({item['id']: item['result'] for item in result}, {7: '0x10', 8: '0xaa36a7'})
+
+    @patch('src.cassette.time.sleep')
+    def test_recorded_latency_scaled_by_speed(self, mock_sleep):
+        """Test that replay waits the recorded latency divided by speed, and not at all at speed 0."""
+        cassette = Cassette(self.path)
+        cassette.record('eth_blockNumber:[]', {"id": 1}, 0.2, {"id": 1, "result": "0x1"}, 10)
+        ReplayTransport(cassette, speed=2.0).send(_payload('eth_blockNumber', [], 3))
+        mock_sleep.assert_called_once_with(0.1)
+        ReplayTransport(cassette, speed=0).send(_payload('eth_blockNumber', [], 4))
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_recorded_errors_are_raised_again(self):
+        """Test that HTTP errors replay with their status and Retry-After, network errors with their type."""
+        cassette = Cassette(self.path)
+        cassette.record('eth_blockNumber:[]', {}, 0.0,
+                        error={'type': 'HTTPError', 'status': 429, 'body': 'slow down', 'headers': {'Retry-After': '1'}})
+        cassette.record('eth_chainId:[]', {}, 0.0, error={'type': 'ReadTimeout', 'message': 'timed out'})
+        replay = ReplayTransport(cassette, speed=0)
+
+        with self.assertRaises(requests.exceptions.HTTPError) as cm:
+            replay.send(_payload('eth_blockNumber', [], 1))
+        self.assertEqual(cm.exception.response.status_code, 429)
+        self.assertEqual(cm.exception.response.headers['Retry-After'], '1')
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            replay.send(_payload('eth_chainId', [], 2))
+
+    def test_missing_cassette(self):
+        """Test that replaying a missing file fails clearly, while recording starts an empty cassette."""
+        with self.assertRaises(ValueError):
+            Cassette.load(self.path)
+        self.assertEqual(Cassette.load(self.path, missing_ok=True).interactions, [])
+
+
+class TestCassetteSettings(unittest.TestCase):
+    def test_environment_overrides_settings(self):
+        """Test RPC_CASSETTE and RPC_CASSETTE_SPEED, and validation of the mode."""
+        with patch.dict(os.environ, {'RPC_CASSETTE': 'replay:/tmp/send.json', 'RPC_CASSETTE_SPEED': '0'}):
+            self.assertEqual(cassette_settings({'mode': 'off'}), {'mode': 'replay', 'path': '/tmp/send.json', 'speed': 0.0})
+        with patch.dict(os.environ, {'RPC_CASSETTE': ''}):
+            self.assertIsNone(cassette_settings()['mode'])
+            with self.assertRaises(ValueError):
+                cassette_settings({'mode': 'rewind', 'path': '/tmp/x.json'})
+            with self.assertRaises(ValueError):
+                cassette_settings({'mode': 'record'})
+
+    def test_api_keys_are_redacted(self):
+        """Test that API keys never reach the cassette."""
+        self.assertEqual(redact_url("https://api.example/api?module=account&apikey=SECRET&sort=desc"),
+                         "https://api.example/api?module=account&sort=desc")
+
+
+class TestRPCClientCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cassette_path = os.path.join(self.tmp.name, 'session.json')
+        self.cassettes_patcher = patch.dict(cassette_module._CASSETTES, clear=True)
+        self.cassettes_patcher.start()
+
+    def tearDown(self):
+        self.cassettes_patcher.stop()
+        self.tmp.cleanup()
+
+    def _client(self, mode):
+        settings = Path(self.tmp.name) / f'{mode}.json'
+        settings.write_text(json.dumps({
+            'network': {'chain_id': 11155111},
+            'rpc': {'cache': {'enabled': False}, 'cassette': {'mode': mode, 'path': self.cassette_path, 'speed': 0}}
+        }))
+        with patch('src.rpc_client.CONFIG_PATH', settings):
+            return RPCClient(rpc_url="https://recorded.example", chain_id=11155111, rate_limiter=NullRateLimiter())
+
+    @patch('requests.Session.post')
+    def test_record_then_replay_offline(self, mock_post):
+        """Test that a recorded session, chain ID check included, replays with the network down."""
+        def node(url, headers=None, data=None, timeout=None):
+            request = json.loads(data)
+            response = MagicMock()
+            response.content = b'{}'
+            results = {'eth_chainId': '0xaa36a7', 'eth_getBalance': '0xde0b6b3a7640000'}
+            response.json.return_value = {"jsonrpc": "2.0", "id": request['id'], "result": results[request['method']]}
+            return response
+        mock_post.side_effect = node
+
+        client = self._client('record')
+        self.assertEqual(client.get_balance(ADDRESS, 'wei'), 10 ** 18)
+        client.close()
+        recorded = json.loads(Path(self.cassette_path).read_text())['interactions']
+        self.assertEqual([item['request']['method'] for item in recorded], ['eth_chainId', 'eth_getBalance'])
+
+        cassette_module._CASSETTES.clear()
+        mock_post.reset_mock()
+        mock_post.side_effect = requests.exceptions.ConnectionError("offline")
+        client = self._client('replay')
+        self.assertEqual(client.get_balance(ADDRESS, 'wei'), 10 ** 18)
+        client.close()
+        mock_post.assert_not_called()
+
+    @patch('requests.get')
+    def test_get_json_records_without_api_key(self, mock_get):
+        """Test that Etherscan-style lookups are recorded under the redacted URL and replayed."""
+        mock_get.return_value.json.return_value = {'status': '1', 'result': []}
+        mock_get.return_value.content = b'{}'
+        url = "https://api.example/api?module=account&address=0x1&apikey=SECRET"
+        settings = {'mode': 'record', 'path': self.cassette_path, 'speed': 0}
+        self.assertEqual(get_json(url, 5, settings), {'status': '1', 'result': []})
+        self.assertNotIn('SECRET', Path(self.cassette_path).read_text())
+
+        cassette_module._CASSETTES.clear()
+        mock_get.side_effect = requests.exceptions.ConnectionError("offline")
+        self.assertEqual(get_json(url, 5, dict(settings, mode='replay')), {'status': '1', 'result': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.chain_check import ChainIdCache, get_chain_id_cache
+from tests.helpers import FakeClock
+
+
+class TestChainIdCache(unittest.TestCase):
+    def test_check_expires_after_ttl(self):
+        """Test that a check is valid for the TTL and only for the recorded chain."""
+        clock = FakeClock()
+        cache = ChainIdCache(ttl=60, clock=clock)
+        self.assertFalse(cache.verified("https://node.example", 11155111))
+        cache.record("https://node.example", 11155111)
+        self.assertTrue(cache.verified("https://node.example", 11155111))
+        self.assertFalse(cache.verified("https://node.example", 1))
+        clock.now += 61
+        self.assertFalse(cache.verified("https://node.example", 11155111))
+
+    def test_forget(self):
+        """Test that a forgotten endpoint has to be checked again."""
+        cache = ChainIdCache()
+        cache.record("https://node.example", 11155111)
+        cache.forget("https://node.example")
+        self.assertFalse(cache.verified("https://node.example", 11155111))
+
+    def test_persisted_between_instances(self):
+        """Test that checks are shared through the file without storing the URL."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'chain-ids.json'
+            first = ChainIdCache(path=str(path))
+            second = ChainIdCache(path=str(path))
+            first.record("https://node.example/v1/secret-key", 11155111)
+            self.assertTrue(second.verified("https://node.example/v1/secret-key", 11155111))
+            self.assertNotIn('secret-key', path.read_text())
+            self.assertEqual(len(json.loads(path.read_text())), 1)
+
+    def test_unreadable_file_is_ignored(self):
+        """Test that a corrupt cache file means 'not verified' rather than an error."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'chain-ids.json'
+            path.write_text("not json")
+            self.assertFalse(ChainIdCache(path=str(path)).verified("https://node.example", 1))
+
+    def test_process_wide_cache(self):
+        """Test that clients with the same settings share one cache."""
+        self.assertIs(get_chain_id_cache({'ttl': 120}), get_chain_id_cache({'ttl': 120}))
+        self.assertIsNot(get_chain_id_cache({'ttl': 120}), get_chain_id_cache({'ttl': 30}))
+
+
+if __name__ == '__main__':
+    unittest.main()
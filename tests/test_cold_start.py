@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Wall time of an offline command, interpreter start included, at most this many seconds over a bare
+# `python -c pass` (offline commands take 80-90ms over it and balance about 0.5s; it took over a second
+# when src.main imported every command module up front). The baseline runs none of the code under test,
+# so an eager import added to src.main or anything it loads shows up in full.
+COLD_START_MARGIN = 0.150
+
+# Modules only network and signing commands may load
+HEAVY_MODULES = ('eth_account', 'eth_utils', 'eth_keys', 'rlp', 'requests', 'cryptography', 'ecdsa', '_pysha3',
+                 'dotenv', 'rpc_client', 'src.rpc_client', 'transaction', 'src.transaction')
+
+# Runs a command the way ./cli does, with the wallet directory in a workspace, and reports to a file
+CHILD = """
+import json, os, sys
+sys.path.insert(0, os.path.join({root!r}, 'src'))
+sys.argv = ['cli'] + {argv!r}
+from src import main
+import wallet
+wallet.WALLET_DIR = wallet.Path({workspace!r})
+wallet.DEFAULT_WALLET_FILE = wallet.WALLET_DIR / 'default.txt'
+try:
+    main.run()
+except SystemExit:
+    pass
+with open({report!r}, 'w') as f:
+    json.dump(sorted(sys.modules), f)
+"""
+
+
+class TestColdStart(unittest.TestCase):
+    """Offline commands import only what they need (see benchmarks/bench_import.py for the breakdown)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, argv=None):
+        """
+        Wall time of a fresh interpreter running a command and the modules it loaded,
+        or of a bare interpreter (python -c pass) when argv is None.
+        """
+        report = os.path.join(self.tmp.name, 'report.json')
+        code = 'pass' if argv is None else CHILD.format(root=str(PROJECT_ROOT), argv=argv, workspace=self.tmp.name,
+                                                          report=report)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], capture_output=True, check=True, cwd=PROJECT_ROOT)
+        elapsed = time.perf_counter() - start
+        if argv is None:
+            return elapsed, []
+        with open(report) as f:
+            return elapsed, json.load(f)
+
+    def test_offline_commands(self):
+        """Test that --help, wallet list, wallet use and stats skip the heavy imports and start within budget."""
+        baseline = min(self._run()[0] for _ in range(3))
+        for argv in (['--help'], ['wallet', 'list'], ['wallet', 'use', '--address', '0x' + '00' * 20], ['stats']):
+            with self.subTest(command=' '.join(argv)):
+                runs = [self._run(argv) for _ in range(3)]
+                loaded = [name for name in HEAVY_MODULES if name in runs[0][1]]
+                self.assertEqual(loaded, [], f"{' '.join(argv)} imported {loaded}")
+                elapsed = min(run[0] for run in runs)
+                self.assertLess(elapsed - baseline, COLD_START_MARGIN,
+                                f"{' '.join(argv)} took {elapsed - baseline:.3f}s over a bare interpreter")
+
+
+if __name__ == '__main__':
+    unittest.main()
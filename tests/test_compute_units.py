@@ -0,0 +1,88 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.compute_units import CostTable
+from src.metrics import set_command
+from src.priority import get_scheduler
+from src.rate_limiter import TokenBucket, get_rate_limiter
+from src.rpc_client import RPCClient
+
+
+class TestCostTable(unittest.TestCase):
+    def setUp(self):
+        self.costs = CostTable.from_config({'costs': {'eth_getLogs': 100}, 'default_cost': 5})
+
+    def test_method_costs(self):
+        """Test listed, overridden and unknown methods."""
+        self.assertEqual(self.costs.cost('eth_blockNumber'), 10)
+        self.assertEqual(self.costs.cost('eth_getLogs', [{}]), 100)
+        self.assertEqual(self.costs.cost('debug_traceTransaction'), 5)
+
+    def test_full_blocks_cost_more(self):
+        """Test that blocks with full transactions use the ':full' price."""
+        self.assertEqual(self.costs.cost('eth_getBlockByNumber', ['0x10', False]), 16)
+        self.assertEqual(self.costs.cost('eth_getBlockByNumber', ['0x10', True]), 60)
+
+    def test_batch_costs_the_sum(self):
+        """Test that a batch is billed per call."""
+        payload = [{'method': 'eth_blockNumber', 'params': []}, {'method': 'eth_getBalance', 'params': ['0x1']}]
+        self.assertEqual(self.costs.payload_cost(payload), 29)
+
+    def test_budget_buckets_are_separate_from_request_buckets(self):
+        """Test that a compute-unit bucket never shares state with a request bucket of the same numbers."""
+        config = {'default': {'rate': 50, 'burst': 50}}
+        self.assertIsNot(get_rate_limiter("https://shared.example", config),
+                         get_rate_limiter("https://shared.example", config, unit='compute_units'))
+
+
+class TestComputeUnitBudget(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = Path(self.tmp.name) / 'settings.json'
+        settings.write_text(json.dumps({
+            'network': {'chain_id': 11155111},
+            'rpc': {'compute_units': {'enabled': True, 'budget': {'default': {'rate': 1000, 'burst': 1000}}}}
+        }))
+        self.config_patcher = patch('src.rpc_client.CONFIG_PATH', settings)
+        self.config_patcher.start()
+        self.post_patcher = patch('requests.Session.post')
+        self.mock_post = self.post_patcher.start()
+        self.mock_post.return_value.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1bc16d674ec80000"}
+        self.client = RPCClient(rpc_url="https://cu-budget.example", chain_id=11155111)
+        self.client.chain_ids.record("https://cu-budget.example", 11155111)
+
+    def tearDown(self):
+        set_command(None)
+        self.post_patcher.stop()
+        self.config_patcher.stop()
+        self.tmp.cleanup()
+
+    def test_calls_spend_their_cost(self):
+        """Test that the endpoint bucket is debited in compute units, and spend is reported."""
+        limiter = self.client.pool.endpoints[0].rate_limiter
+        self.assertIsInstance(limiter, TokenBucket)
+        self.assertEqual(limiter.rate, 1000)
+
+        self.client.get_balance("0x1234567890123456789012345678901234567890")
+
+        self.assertAlmostEqual(limiter._tokens, 1000 - 19, delta=1)
+        self.assertEqual(get_scheduler(limiter).limiter, limiter)
+        stats = self.client.get_stats()
+        self.assertEqual(stats['compute_units'], 19)
+        self.assertEqual(stats['endpoints']['cu-budget.example']['compute_units'], 19)
+
+    def test_spend_is_reported_per_command(self):
+        """Test that closing a client adds its spend to the running CLI command."""
+        set_command('balance')
+        self.client.get_balance("0x1234567890123456789012345678901234567890")
+        with self.assertLogs('src.rpc_client', level='INFO') as logs:
+            self.client.close()
+        self.assertTrue(any("balance: 19 compute units over 1 requests" in line for line in logs.output))
+        self.assertEqual(self.client.metrics.summary()['commands'], {'balance': {'requests': 1, 'compute_units': 19}})
+
+
+if __name__ == '__main__':
+    unittest.main()
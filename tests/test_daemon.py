@@ -0,0 +1,182 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from src.call_budget import command_usage, reset_usage
+from src.daemon import (PROJECT_ROOT, Daemon, _client_env, _exchange, daemon_request, default_socket_path,
+                        forward_to_daemon)
+from src.mock_node import MockNode
+from src.rpc_client import RPCClient, keep_warm, warm_configurations
+
+# The daemon runs commands the way ./cli does, with src on the path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import wallet as cli_wallet  # noqa: E402
+from src import wallet as src_wallet  # noqa: E402
+
+ACCOUNTS = {f"0x{index:040x}": index * 10 ** 18 for index in range(1, 9)}
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        wallet_dir = Path(self.tmp.name)
+        self.patchers = [patch.object(module, name, value) for module in (cli_wallet, src_wallet)
+                         for name, value in (('WALLET_DIR', wallet_dir), ('DEFAULT_WALLET_FILE', wallet_dir / 'default.txt'))]
+        self.node = MockNode(accounts=ACCOUNTS).start()
+        self.socket = os.path.join(self.tmp.name, 'cli.sock')
+        self.patchers.append(patch.dict(os.environ, {'RPC_URL': self.node.url, 'CLI_DAEMON_SOCKET': self.socket}))
+        for patcher in self.patchers:
+            patcher.start()
+        self.daemon = Daemon(workers=4).start()
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.node.stop()
+        for patcher in self.patchers:
+            patcher.stop()
+        reset_usage()
+        self.tmp.cleanup()
+
+    def _request(self, *argv):
+        return _exchange(self.socket, {'argv': list(argv), 'env': _client_env(), 'root': PROJECT_ROOT})
+
+    def test_runs_commands(self):
+        """Test that a command runs in the daemon and its output and exit code come back."""
+        reply = self._request('balance', '--address', '0x' + '0' * 39 + '1')
+        self.assertEqual(reply['exit_code'], 0)
+        self.assertIn("Balance: 1.000000 ETH", reply['stdout'])
+
+        reply = self._request('balance', '--address', 'not-an-address')
+        self.assertEqual(reply['exit_code'], 1)
+        self.assertIn("Error: Invalid address", reply['stdout'])
+
+    def test_concurrent_requests_are_isolated(self):
+        """Test that concurrent clients each get their own output, and their calls never count for the process."""
+        with ThreadPoolExecutor(max_workers=len(ACCOUNTS)) as executor:
+            replies = dict(zip(ACCOUNTS, executor.map(lambda address: self._request('balance', '--address', address),
+                                                      ACCOUNTS)))
+        for index, (address, reply) in enumerate(replies.items(), start=1):
+            self.assertEqual(reply['exit_code'], 0)
+            self.assertEqual(reply['stdout'].count("Address:"), 1)
+            self.assertIn(f"Address: {address}", reply['stdout'])
+            self.assertIn(f"Balance: {index}.000000 ETH", reply['stdout'])
+        self.assertEqual(command_usage('balance').round_trips, 0)
+        self.assertEqual(daemon_request('status', self.socket)['served'], len(ACCOUNTS))
+
+    def test_clients_share_warm_connections(self):
+        """Test that clients built from the same settings share one session, cache and gas oracle."""
+        self._request('balance', '--address', '0x' + '0' * 39 + '1')
+        first, second = RPCClient(), RPCClient()
+        try:
+            self.assertIs(first.session, second.session)
+            self.assertIs(first.cache, second.cache)
+            self.assertIs(first.gas_oracle, second.gas_oracle)
+            self.assertEqual(warm_configurations(), 1)
+        finally:
+            first.close()
+            second.close()
+        self.assertEqual(first.get_chain_id(), 11155111)  # Still open for the next client
+
+    def test_falls_back_when_settings_differ(self):
+        """Test that clients with another RPC_URL or checkout are told to run the command themselves."""
+        with patch.dict(os.environ, {'RPC_URL': 'http://127.0.0.1:1'}):
+            self.assertIn("RPC_URL", self._request('stats')['fallback'])
+            self.assertIsNone(forward_to_daemon(['stats']))
+        reply = _exchange(self.socket, {'argv': ['stats'], 'env': _client_env(), 'root': '/elsewhere'})
+        self.assertIn('fallback', reply)
+
+    def test_forwarding_without_a_daemon(self):
+        """Test that the CLI runs commands itself when no daemon listens or forwarding is off."""
+        with patch.dict(os.environ, {'CLI_DAEMON_SOCKET': os.path.join(self.tmp.name, 'none.sock')}):
+            self.assertIsNone(forward_to_daemon(['stats']))
+        with patch.dict(os.environ, {'CLI_NO_DAEMON': '1'}):
+            self.assertIsNone(forward_to_daemon(['stats']))
+
+    def test_only_this_users_socket_is_used(self):
+        """Test that the client sends nothing to a path that is not a socket, or is another user's."""
+        impostor = os.path.join(self.tmp.name, 'impostor.sock')
+        Path(impostor).write_text('')
+        with patch.dict(os.environ, {'CLI_DAEMON_SOCKET': impostor}):
+            self.assertIsNone(forward_to_daemon(['stats']))
+        with self.assertRaisesRegex(ConnectionError, "not a socket of this user's daemon"):
+            _exchange(impostor, {'op': 'status'})
+        with patch('src.daemon.os.getuid', return_value=os.getuid() + 1):
+            self.assertIsNone(forward_to_daemon(['stats']))
+        self.assertEqual(daemon_request('status', self.socket)['served'], 0)
+
+    def test_other_users_are_refused(self):
+        """Test that the daemon drops connections whose peer credentials name another user."""
+        with patch('src.daemon._peer_uid', return_value=os.getuid() + 1):
+            with self.assertRaises(ConnectionError):
+                daemon_request('status', self.socket)
+            self.assertIsNone(forward_to_daemon(['stats']))
+        self.assertEqual(daemon_request('status', self.socket)['served'], 0)
+
+    def test_default_socket_is_in_a_private_directory(self):
+        """Test that the default socket lives in $XDG_RUNTIME_DIR, or else in a 0700 directory of this user."""
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.tmp.name}):
+            self.assertEqual(os.path.dirname(default_socket_path()), self.tmp.name)
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': ''}), \
+                patch('src.daemon.tempfile.gettempdir', return_value=self.tmp.name):
+            path = default_socket_path()
+            self.assertEqual(os.path.dirname(path), os.path.join(self.tmp.name, f"ethereum-cli-{os.getuid()}"))
+            daemon = Daemon(path).start()
+            try:
+                self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+                self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            finally:
+                daemon.stop()
+
+        shared = os.path.join(self.tmp.name, 'shared')
+        os.mkdir(shared)
+        os.chmod(shared, 0o777)
+        with self.assertRaisesRegex(ConnectionError, "not a private directory"):
+            Daemon(os.path.join(shared, 'cli.sock')).start()
+
+    def test_status_and_stop(self):
+        """Test the control requests, and that stopping removes the socket and the warm clients."""
+        status = daemon_request('status', self.socket)
+        self.assertEqual((status['pid'], status['workers']), (os.getpid(), 4))
+        self.assertTrue(daemon_request('stop', self.socket)['stopping'])
+        deadline = time.monotonic() + 5
+        while os.path.exists(self.socket) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(os.path.exists(self.socket))
+        with self.assertRaises(ConnectionError):
+            daemon_request('status', self.socket)
+        self.assertEqual(warm_configurations(), 0)
+
+
+class TestKeepWarm(unittest.TestCase):
+    def test_off_by_default(self):
+        """Test that clients share nothing unless keep_warm is on."""
+        keep_warm(False)
+        first, second = RPCClient('http://127.0.0.1:1'), RPCClient('http://127.0.0.1:1')
+        self.assertIsNot(first.session, second.session)
+        first.close()
+        second.close()
+
+    def test_shared_gas_oracle_never_fetches_through_a_closed_client(self):
+        """Test that the shared oracle refreshes through a client still open, and fails cleanly once all are closed."""
+        node = MockNode(gas_price_wei=3_000_000_000).start()
+        keep_warm(True)
+        try:
+            first, second = RPCClient(node.url), RPCClient(node.url)
+            self.assertIs(first.gas_oracle, second.gas_oracle)
+            second.close()
+            self.assertEqual(first.gas_oracle.quote(max_age=0).price_wei, 3_000_000_000)
+            first.close()
+            with self.assertRaisesRegex(ConnectionError, "No open RPC client"):
+                first.gas_oracle.quote(max_age=0)
+        finally:
+            keep_warm(False)
+            node.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
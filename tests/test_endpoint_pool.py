@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src.endpoint_pool import Endpoint, EndpointPool
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+from tests.helpers import FakeClock
+
+
+def _endpoint(url, weight=1.0, groups=('read', 'write')):
+    return Endpoint(url, weight=weight, groups=groups, rate_limiter=NullRateLimiter())
+
+
+def _response(result=None, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} Error", response=response
+        )
+    response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": result}
+    return response
+
+
+class TestEndpointPool(unittest.TestCase):
+    def test_routes_to_lowest_latency(self):
+        """Test that the endpoint with the lower moving latency wins."""
+        fast, slow = _endpoint("https://fast"), _endpoint("https://slow")
+        pool = EndpointPool([slow, fast])
+        pool.record_success(slow, 0.5)
+        pool.record_success(fast, 0.05)
+        self.assertIs(pool.select('read'), fast)
+
+    def test_weight_scales_score(self):
+        """Test that a heavier weight can outweigh a small latency difference."""
+        light, heavy = _endpoint("https://light"), _endpoint("https://heavy", weight=4)
+        pool = EndpointPool([light, heavy])
+        pool.record_success(light, 0.10)
+        pool.record_success(heavy, 0.20)
+        self.assertIs(pool.select('read'), heavy)
+
+    def test_groups(self):
+        """Test that writes only go to endpoints in the write group."""
+        reader = _endpoint("https://reader", groups=['read'])
+        writer = _endpoint("https://writer", groups=['write'])
+        pool = EndpointPool([reader, writer])
+        self.assertEqual(pool.group_for(['eth_getBalance']), 'read')
+        self.assertEqual(pool.group_for(['eth_chainId', 'eth_sendRawTransaction']), 'write')
+        self.assertIs(pool.select('read'), reader)
+        self.assertIs(pool.select('write'), writer)
+
+    def test_missing_group_rejected(self):
+        """Test that a pool without a write endpoint is rejected."""
+        with self.assertRaises(ValueError):
+            EndpointPool([_endpoint("https://reader", groups=['read'])])
+
+    def test_throttled_endpoint_cools_down(self):
+        """Test that a 429 moves traffic away until the cooldown expires."""
+        clock = FakeClock()
+        first, second = _endpoint("https://first"), _endpoint("https://second")
+        pool = EndpointPool([first, second], clock=clock)
+        pool.record_success(first, 0.01)
+        pool.record_success(second, 0.2)
+        pool.record_failure(first, throttled=True)
+        self.assertIs(pool.select('read'), second)
+        clock.now += 60
+        for _ in range(20):
+            pool.record_success(first, 0.01)
+        self.assertIs(pool.select('read'), first)
+
+    def test_select_excludes_tried(self):
+        """Test that select skips endpoints already tried and returns None when exhausted."""
+        first, second = _endpoint("https://first"), _endpoint("https://second")
+        pool = EndpointPool([first, second])
+        self.assertIs(pool.select('read', exclude={"https://first"}), second)
+        self.assertIsNone(pool.select('read', exclude={"https://first", "https://second"}))
+
+    @patch.dict(os.environ, {"PRIMARY_RPC": "https://primary.example"})
+    def test_from_config(self):
+        """Test building a pool from settings with environment variables in URLs."""
+        pool = EndpointPool.from_config({"endpoints": [
+            {"url": "${PRIMARY_RPC}", "weight": 2},
+            {"url": "https://reads.example", "groups": ["read"]},
+            {"url": "${UNSET_RPC_VARIABLE}"}
+        ]})
+        self.assertEqual([endpoint.url for endpoint in pool.endpoints],
+                         ["https://primary.example", "https://reads.example"])
+        self.assertEqual(pool.endpoints[0].weight, 2.0)
+        self.assertEqual(pool.endpoints[1].groups, frozenset(['read']))
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_no_endpoint_configured(self):
+        """Test that a pool without rpc.endpoints, RPC_URL or an explicit URL is a configuration error."""
+        with self.assertRaisesRegex(ValueError, "No RPC endpoint configured: set RPC_URL or rpc.endpoints"):
+            EndpointPool.from_config({"endpoints": [{"url": "${UNSET_RPC_VARIABLE}"}]})
+
+    def test_explicit_url_wins(self):
+        """Test that an explicit URL replaces the configured endpoints."""
+        pool = EndpointPool.from_config({"endpoints": [{"url": "https://configured"}]}, "https://explicit")
+        self.assertEqual([endpoint.url for endpoint in pool.endpoints], ["https://explicit"])
+
+
+class TestRPCClientFailover(unittest.TestCase):
+    def setUp(self):
+        self.primary = _endpoint("https://primary", weight=2)
+        self.backup = _endpoint("https://backup")
+        self.patcher = patch('requests.Session.post')
+        self.mock_post = self.patcher.start()
+        self.mock_post.return_value = _response("0xaa36a7")
+        self.client = RPCClient(chain_id=11155111, pool=EndpointPool([self.primary, self.backup]))
+        for endpoint in (self.primary, self.backup):
+            self.client.chain_ids.record(endpoint.url, 11155111)
+        self.client.pool.record_success(self.primary, 0.05)
+        self.client.pool.record_success(self.backup, 0.05)
+        self.mock_post.reset_mock()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    @patch('src.rpc_client.time.sleep')
+    def test_fails_over_without_sleeping(self, mock_sleep):
+        """Test that a 429 on one endpoint is retried on the next one immediately."""
+        self.mock_post.side_effect = [_response(status_code=429), _response("0x123")]
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        self.assertEqual([call.args[0] for call in self.mock_post.call_args_list],
+                         ["https://primary", "https://backup"])
+        mock_sleep.assert_not_called()
+        self.assertEqual(self.client.pool.select('read'), self.backup)
+
+    @patch('src.rpc_client.time.sleep')
+    def test_sleeps_only_when_all_endpoints_failed(self, mock_sleep):
+        """Test that backoff only happens after every endpoint has been tried."""
+        self.mock_post.side_effect = [
+            requests.exceptions.ConnectionError("down"),
+            requests.exceptions.ConnectionError("down"),
+            _response("0x123")
+        ]
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        mock_sleep.assert_called_once()
+        self.assertLessEqual(mock_sleep.call_args.args[0], self.client.retry_policy.max_delay)
+
+    def test_write_group_routing(self):
+        """Test that eth_sendRawTransaction goes to the write group."""
+        client = RPCClient(chain_id=11155111, pool=EndpointPool([
+            _endpoint("https://reader", groups=['read']),
+            _endpoint("https://writer", groups=['write'])
+        ]))
+        client.chain_ids.record("https://writer", 11155111)
+        self.mock_post.reset_mock()
+        self.mock_post.return_value = _response("0x" + "1" * 64)
+        client.send_raw_transaction("0x" + "f" * 100)
+        self.assertEqual(self.mock_post.call_args.args[0], "https://writer")
+        self.assertEqual(json.loads(self.mock_post.call_args.kwargs['data'])['method'], 'eth_sendRawTransaction')
+
+
+class TestRPCClientHedging(unittest.TestCase):
+    def setUp(self):
+        self.primary = _endpoint("https://primary", weight=2)
+        self.backup = _endpoint("https://backup")
+        self.release = threading.Event()
+        self.patcher = patch('requests.Session.post')
+        self.mock_post = self.patcher.start()
+        self.mock_post.return_value = _response("0xaa36a7")
+        self.client = RPCClient(chain_id=11155111, pool=EndpointPool([self.primary, self.backup]))
+        for endpoint in (self.primary, self.backup):
+            self.client.chain_ids.record(endpoint.url, 11155111)
+        self.client.pool.record_success(self.primary, 0.05)
+        self.client.pool.record_success(self.backup, 0.05)
+        self.client.hedging.update(enabled=True, min_delay_ms=10, max_delay_ms=20)
+        self.mock_post.reset_mock()
+
+    def tearDown(self):
+        self.release.set()
+        self.client.close()
+        self.patcher.stop()
+
+    def _slow_primary(self, url, **kwargs):
+        """Primary hangs until released, backup answers at once."""
+        if url == "https://primary":
+            self.release.wait(5)
+            return _response("0x1")
+        return _response("0x2")
+
+    def test_slow_read_is_hedged(self):
+        """Test that a slow read-only call is duplicated and the backup's answer wins."""
+        self.mock_post.side_effect = self._slow_primary
+        self.assertEqual(self.client.get_block_number(), 0x2)
+        stats = self.client.get_stats()
+        self.assertEqual((stats['hedged_calls'], stats['hedge_wins']), (1, 1))
+
+    def test_fast_read_is_not_hedged(self):
+        """Test that calls answered within the hedge delay go to one endpoint only."""
+        self.mock_post.return_value = _response("0x123")
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        self.assertEqual(self.mock_post.call_count, 1)
+        self.assertEqual(self.client.get_stats()['hedged_calls'], 0)
+
+    def test_waiting_for_a_worker_does_not_trigger_hedges(self):
+        """Test that the hedge delay starts when the primary is sent, not while it queues behind other callers."""
+        def answer(url, **kwargs):
+            time.sleep(0.02)
+            return _response("0x1")
+
+        self.mock_post.side_effect = answer
+        self.client.pool_size = 1  # Two hedge workers for 32 concurrent callers
+        self.client.hedging.update(min_delay_ms=100, max_delay_ms=100)
+        params = ([f"0x{index:040x}", 'latest'] for index in range(32))
+        self.assertEqual(len(list(self.client.map_calls('eth_getBalance', params, max_workers=32))), 32)
+        self.assertEqual(self.client.get_stats()['hedged_calls'], 0)
+
+    def test_writes_are_never_hedged(self):
+        """Test that eth_sendRawTransaction is sent once even when slow."""
+        def slow_write(url, **kwargs):
+            time.sleep(0.1)
+            return _response("0x" + "1" * 64)
+
+        self.mock_post.side_effect = slow_write
+        self.client.send_raw_transaction("0x" + "f" * 100)
+        self.assertEqual(self.mock_post.call_count, 1)
+        self.assertEqual(self.client.get_stats()['hedged_calls'], 0)
+
+    def test_hedge_delay_uses_percentile(self):
+        """Test that the hedge delay follows recent latency once enough samples exist."""
+        self.client.hedging.update(percentile=90, min_delay_ms=1, max_delay_ms=1000, min_samples=10)
+        self.client._latencies.clear()
+        self.assertEqual(self.client._hedge_delay(), 1.0)
+        self.client._latencies.extend([0.01 * i for i in range(1, 11)])
+        self.assertAlmostEqual(self.client._hedge_delay(), 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from src.gas_oracle import GasPriceOracle
+from tests.helpers import FakeClock
+
+
+class TestGasPriceOracle(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.fetches = []
+        self.oracle = GasPriceOracle(self._fetch, ttl=12, default_gwei=1.5, clock=self.clock)
+
+    def _fetch(self):
+        self.fetches.append(self.clock.now)
+        return hex(2_000_000_000)
+
+    def test_quote_is_cached_for_ttl(self):
+        """Test that quotes are reused within the TTL and refetched after it."""
+        self.assertEqual(self.oracle.quote().price_wei, 2_000_000_000)
+        self.clock.now += 10
+        self.oracle.quote()
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual(self.oracle.age(), 10)
+        self.clock.now += 5
+        self.oracle.quote()
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_max_age_demands_freshness(self):
+        """Test that callers can ask for a quote fresher than the TTL."""
+        self.oracle.quote()
+        self.clock.now += 3
+        self.assertIsNotNone(self.oracle.peek())
+        self.assertIsNone(self.oracle.peek(max_age=2))
+        self.oracle.quote(max_age=0)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_zero_price_uses_default(self):
+        """Test that a zero quote from the node is replaced with the default."""
+        self.assertEqual(self.oracle.update('0x0').price_wei, 1_500_000_000)
+
+    def test_age_before_first_quote(self):
+        """Test that there is no age before anything was fetched."""
+        self.assertIsNone(self.oracle.age())
+        self.assertIsNone(self.oracle.peek())
+
+    def test_background_refresh(self):
+        """Test that the refresh thread keeps fetching until stopped."""
+        refreshed = threading.Event()
+
+        def fetch():
+            if len(self.fetches) >= 2:
+                refreshed.set()
+            return self._fetch()
+
+        oracle = GasPriceOracle(fetch, ttl=12)
+        oracle.start(interval=0.01)
+        try:
+            self.assertTrue(refreshed.wait(5))
+        finally:
+            oracle.stop()
+        self.assertGreaterEqual(len(self.fetches), 3)
+        self.assertIsNotNone(oracle.peek())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.metrics import Histogram, RPCMetrics, endpoint_label, load_metrics, save_metrics
+
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        """Test quantile estimates interpolated inside buckets."""
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.observe(0.02)
+        for _ in range(10):
+            histogram.observe(0.4)
+        self.assertLessEqual(histogram.quantile(0.5), 0.025)
+        self.assertGreater(histogram.quantile(0.99), 0.25)
+        self.assertLessEqual(histogram.quantile(0.99), 0.5)
+        self.assertAlmostEqual(histogram.total, 90 * 0.02 + 10 * 0.4)
+
+    def test_empty(self):
+        """Test that an empty histogram has no quantiles."""
+        self.assertIsNone(Histogram().quantile(0.5))
+
+
+class TestRPCMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = RPCMetrics()
+        self.metrics.record_request('eth_getBalance', 'https://node.example/v3/secret-key', 0.05, 100, 60)
+        self.metrics.record_request('eth_getBalance', 'https://node.example/v3/secret-key', None, 100, ok=False)
+        self.metrics.record_retry('eth_getBalance', 'https://node.example/v3/secret-key', throttled=True)
+        self.metrics.record_rate_limit_wait('eth_getBalance', 'https://node.example/v3/secret-key', 0.25)
+
+    def test_endpoint_label_hides_api_keys(self):
+        """Test that only the host of an endpoint is used as a label."""
+        self.assertEqual(endpoint_label('https://node.example/v3/secret-key'), 'node.example')
+        self.assertNotIn('secret-key', json.dumps(self.metrics.to_dict()))
+        self.assertNotIn('secret-key', self.metrics.to_prometheus())
+
+    def test_summary(self):
+        """Test per-method and per-endpoint summaries."""
+        summary = self.metrics.summary()
+        balance = summary['methods']['eth_getBalance']
+        self.assertEqual(balance['requests'], 2)
+        self.assertEqual(balance['errors'], 1)
+        self.assertEqual(balance['retries'], 1)
+        self.assertEqual(balance['throttled'], 1)
+        self.assertEqual(balance['rate_limit_wait_s'], 0.25)
+        self.assertEqual(balance['bytes_sent'], 200)
+        self.assertEqual(balance['bytes_received'], 60)
+        self.assertIsNotNone(balance['p50_ms'])
+        self.assertEqual(list(summary['endpoints']), ['node.example'])
+
+    def test_prometheus_format(self):
+        """Test counters and a cumulative histogram in the text exposition format."""
+        text = self.metrics.to_prometheus()
+        self.assertIn('# TYPE ethereum_cli_rpc_requests_total counter', text)
+        self.assertIn('ethereum_cli_rpc_requests_total{method="eth_getBalance",endpoint="node.example"} 2', text)
+        self.assertIn('ethereum_cli_rpc_latency_seconds_bucket{method="eth_getBalance",endpoint="node.example",le="+Inf"} 1',
+                      text)
+        self.assertIn('ethereum_cli_rpc_latency_seconds_count{method="eth_getBalance",endpoint="node.example"} 1', text)
+
+    def test_save_accumulates_across_runs(self):
+        """Test that saving adds to what earlier runs stored."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'metrics.json'
+            textfile = Path(tmp) / 'rpc.prom'
+            save_metrics(self.metrics, str(path))
+            save_metrics(self.metrics, str(path), str(textfile))
+            stored = load_metrics(str(path)).summary()['methods']['eth_getBalance']
+            self.assertEqual(stored['requests'], 4)
+            self.assertEqual(stored['throttled'], 2)
+            self.assertIn('requests_total', textfile.read_text())
+
+    def test_unreadable_file_is_ignored(self):
+        """Test that a corrupt metrics file loads as empty."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'metrics.json'
+            path.write_text('not json')
+            self.assertEqual(load_metrics(str(path)).summary()['calls'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
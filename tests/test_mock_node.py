@@ -0,0 +1,159 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from eth_account import Account
+from eth_utils import to_hex
+
+from src.mock_node import MockChain, MockEtherscan, MockNode, RPCError
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+from src.transaction import TransactionManager
+
+PRIVATE_KEY = "0x" + "11" * 32
+SENDER = Account.from_key(PRIVATE_KEY).address
+RECIPIENT = "0x0987654321098765432109876543210987654321"
+
+
+def _sign(nonce, value=10 ** 17, chain_id=11155111, gas=21000, gas_price=10 ** 9):
+    signed = Account.sign_transaction({'nonce': nonce, 'gasPrice': gas_price, 'gas': gas, 'to': RECIPIENT,
+                                       'value': value, 'data': b'', 'chainId': chain_id}, PRIVATE_KEY)
+    return signed.raw_transaction
+
+
+class TestMockChain(unittest.TestCase):
+    def setUp(self):
+        self.chain = MockChain(accounts={SENDER: 10 ** 18})
+
+    def test_transfer_is_mined(self):
+        """Test that a signed transfer moves value, charges gas and bumps the nonce in a new block."""
+        tx_hash = self.chain.submit(_sign(0))
+        self.assertEqual(self.chain.block_number(), 1)
+        self.assertEqual(self.chain.balance(RECIPIENT), 10 ** 17)
+        self.assertEqual(self.chain.balance(SENDER), 10 ** 18 - 10 ** 17 - 21000 * 10 ** 9)
+        self.assertEqual(self.chain.nonce(SENDER), 1)
+        self.assertEqual(self.chain.receipts[tx_hash]['status'], '0x1')
+
+    def test_pending_nonce(self):
+        """Test that without automine the pending nonce runs ahead of the mined one."""
+        self.chain.automine = False
+        self.chain.submit(_sign(0))
+        self.assertEqual((self.chain.nonce(SENDER), self.chain.nonce(SENDER, pending=True)), (0, 1))
+        self.chain.mine()
+        self.assertEqual(self.chain.nonce(SENDER), 1)
+
+    def test_rejections(self):
+        """Test the mempool checks a real node makes."""
+        self.chain.submit(_sign(0))
+        for raw, message in [(_sign(0, value=1), 'nonce too low'), (_sign(5), 'nonce too high'),
+                             (_sign(1, chain_id=1), 'invalid chain id'), (_sign(1, gas=20000), 'intrinsic gas too low'),
+                             (_sign(1, value=10 ** 19), 'insufficient funds'), (b'\x01\x02', 'invalid transaction')]:
+            with self.assertRaises(RPCError) as cm:
+                self.chain.submit(raw)
+            self.assertIn(message, str(cm.exception))
+
+
+class TestMockNode(unittest.TestCase):
+    def setUp(self):
+        self.node = MockNode(accounts={SENDER: 10 ** 18}, hang=1.0).start()
+        self.client = RPCClient(rpc_url=self.node.url, chain_id=11155111, timeout=0.3,
+                                rate_limiter=NullRateLimiter())
+
+    def tearDown(self):
+        self.client.close()
+        self.node.stop()
+
+    def test_reads_and_batches(self):
+        """Test single calls, batches and unknown methods against the node."""
+        self.assertEqual(self.client.get_balance(SENDER, 'wei'), 10 ** 18)
+        self.assertEqual(self.client.get_nonce(SENDER), 0)
+        self.assertEqual(self.client.get_network_info()['latest_block'], 0)
+        self.assertEqual(self.client.get_block_info(0)['transaction_count'], 0)
+        with self.assertRaises(ValueError):
+            self.client._make_rpc_call('eth_unknownMethod')
+
+    def test_send_and_status(self):
+        """Test a raw transaction through the client: accepted, mined and reported as successful."""
+        tx_hash = self.client.send_raw_transaction(to_hex(_sign(0)))
+        status = self.client.get_transaction_status(tx_hash)
+        self.assertEqual((status['status'], status['block_number'], status['gas_used']), ('success', 1, 21000))
+        with self.assertRaises(ValueError) as cm:
+            self.client.send_raw_transaction(to_hex(_sign(0)))
+        self.assertIn('already known', str(cm.exception))
+
+    @patch('src.rpc_client.time.sleep')
+    def test_rate_limit_burst_is_retried(self, mock_sleep):
+        """Test that a 429 burst is waited out with Retry-After and counted as throttling."""
+        self.client.get_chain_id()
+        self.node.inject('rate_limit', 2)
+        self.assertEqual(self.client.get_block_number(), 0)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(self.client.get_stats()['throttled'], 2)
+        self.assertEqual(self.node.faults['rate_limit'], 2)
+
+    @patch('src.rpc_client.time.sleep')
+    def test_transport_faults_are_retried(self, mock_sleep):
+        """Test that dropped connections, timeouts and 503s are retried."""
+        self.client.get_chain_id()
+        for fault in ('disconnect', 'timeout', 'server_error'):
+            self.node.inject(fault)
+            self.assertEqual(self.client.get_balance(SENDER, 'wei'), 10 ** 18)
+            self.client.cache.clear()
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    @patch('src.rpc_client.time.sleep')
+    def test_malformed_response(self, mock_sleep):
+        """Test that a body that is not JSON is retried, and surfaces as an error once retries run out."""
+        self.client.get_chain_id()
+        self.node.inject('malformed')
+        self.assertEqual(self.client.get_block_number(), 0)
+        self.client.cache.clear()
+        self.node.inject('malformed', 5)
+        with self.assertRaises(ConnectionError):
+            self.client.get_block_number()
+
+    def test_concurrent_calls(self):
+        """Test that the node serves concurrent calls and counts them per method."""
+        self.client.get_chain_id()
+        addresses = [[f"0x{i:040x}", 'latest'] for i in range(40)]
+        results = list(self.client.map_calls('eth_getBalance', addresses, max_workers=8))
+        self.assertEqual(results, ['0x0'] * 40)
+        self.assertEqual(self.node.calls['eth_getBalance'], 40)
+
+
+class TestTransactionManagerOnMockNode(unittest.TestCase):
+    @patch('src.transaction.WalletManager')
+    def test_send_end_to_end(self, mock_wallet_manager):
+        """Test TransactionManager.send_transaction against the node: build, sign, broadcast and confirm."""
+        mock_wallet_manager.return_value.get_wallet_info.return_value = {
+            'private_key_available': True, 'private_key': PRIVATE_KEY
+        }
+        with MockNode(accounts={SENDER: 10 ** 18}) as node, patch.dict(os.environ, {'RPC_URL': node.url}):
+            manager = TransactionManager()
+            tx_hash = manager.send_transaction(SENDER, RECIPIENT, 0.1, "password")
+            self.assertEqual(manager.check_transaction_status(tx_hash)['status'], 'success')
+            self.assertEqual(node.chain.balance(RECIPIENT), 10 ** 17)
+            manager.rpc_client.close()
+
+    @patch('src.transaction.WalletManager')
+    def test_history_from_mock_etherscan(self, mock_wallet_manager):
+        """Test that history is fetched from ETHERSCAN_API_URL: generated transfers plus mined ones, newest first."""
+        mock_wallet_manager.return_value._is_valid_address.return_value = True
+        with MockNode(accounts={SENDER: 10 ** 18}) as node, \
+                MockEtherscan(chain=node.chain, history_size=3) as etherscan, \
+                patch.dict(os.environ, {'RPC_URL': node.url, 'ETHERSCAN_API_URL': etherscan.url,
+                                        'ETHERSCAN_API_KEY': 'test-key'}):
+            tx_hash = node.chain.submit(_sign(0))
+            manager = TransactionManager()
+            history = manager.get_transaction_history(SENDER)
+            manager.rpc_client.close()
+        self.assertEqual(len(history), 4)
+        self.assertEqual((history[0]['hash'], history[0]['value'], history[0]['gas']), (tx_hash, 0.1, 21000))
+        self.assertEqual([tx['blockNumber'] for tx in history], [4, 3, 2, 1])
+        self.assertEqual(etherscan.requests, 1)
+        self.assertEqual(etherscan.handle_query({'module': 'account', 'action': 'txlist', 'address': RECIPIENT[:-1]})
+                         ['status'], '0')
+
+
+if __name__ == '__main__':
+    unittest.main()
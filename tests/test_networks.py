@@ -0,0 +1,188 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.call_budget import command_usage, reset_usage
+from src.metrics import set_command
+from src.mock_node import MockNode
+from src.networks import client_for, fan_out, resolve_networks, skipped_networks
+from src.session import Session
+from src.settings import as_settings, clear_cache
+
+# main's commands import the wallet module the way ./cli does, with src on the path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+from src import main  # noqa: E402
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+TX_HASH = "0x" + "ab" * 32
+LATENCY = 0.2
+
+
+class TestNetworks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Three chains, each answering every request LATENCY seconds late
+        cls.nodes = {
+            'sepolia': MockNode(chain_id=11155111, latency=LATENCY, accounts={ADDRESS: 10 ** 18}).start(),
+            'holesky': MockNode(chain_id=17000, latency=LATENCY, accounts={ADDRESS: 2 * 10 ** 18}).start(),
+            'local': MockNode(chain_id=31337, latency=LATENCY, accounts={ADDRESS: 3 * 10 ** 18}).start()
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        for node in cls.nodes.values():
+            node.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        networks = {
+            name: {'name': name.title(), 'chain_id': node.chain.chain_id, 'currency_symbol': 'ETH',
+                   'block_explorer': f"https://{name}.example", 'etherscan_api_url': f"https://api-{name}.example/api",
+                   'endpoints': [{'url': node.url}]}
+            for name, node in self.nodes.items()
+        }
+        networks['mainnet'] = {'name': 'Ethereum Mainnet', 'chain_id': 1,
+                               'endpoints': [{'url': '${TEST_NETWORKS_MAINNET_RPC_URL}'}]}
+        self.config = {'network': {'chain_id': 11155111}, 'networks': networks,
+                       'rpc': {'endpoints': [{'url': self.nodes['sepolia'].url}]}}
+        self.settings = as_settings(self.config)
+
+    def tearDown(self):
+        reset_usage()
+        set_command(None)
+        clear_cache()
+        self.tmp.cleanup()
+
+    def test_profiles(self):
+        """Test that a profile brings its own chain, explorer, Etherscan API and endpoints."""
+        holesky = self.settings.for_network('holesky')
+        self.assertEqual((holesky.network.chain_id, holesky.network.block_explorer), (17000, 'https://holesky.example'))
+        self.assertEqual(holesky.transaction.etherscan_api_url, 'https://api-holesky.example/api')
+        self.assertEqual(holesky.rpc['endpoints'], [{'url': self.nodes['holesky'].url}])
+        self.assertEqual(self.settings.network.chain_id, 11155111)
+        with self.assertRaisesRegex(ValueError, "Unknown network: goerli"):
+            self.settings.for_network('goerli')
+
+    def test_resolve_networks(self):
+        """Test 'all' (profiles without an endpoint left out), comma-separated lists and unknown names."""
+        self.assertEqual(resolve_networks('all', self.settings), ['sepolia', 'holesky', 'local'])
+        self.assertEqual(skipped_networks('all', self.settings), ['mainnet'])
+        with patch.dict(os.environ, {'TEST_NETWORKS_MAINNET_RPC_URL': 'https://mainnet.example'}):
+            self.assertEqual(resolve_networks('all', self.settings), ['sepolia', 'holesky', 'local', 'mainnet'])
+            self.assertEqual(skipped_networks('all', self.settings), [])
+        self.assertEqual(resolve_networks('mainnet', self.settings), ['mainnet'])
+        self.assertEqual(skipped_networks('mainnet', self.settings), [])
+        self.assertEqual(resolve_networks('local, sepolia,local', self.settings), ['local', 'sepolia'])
+        with self.assertRaisesRegex(ValueError, "Unknown network: goerli"):
+            resolve_networks('sepolia,goerli', self.settings)
+        with self.assertRaises(ValueError):
+            resolve_networks(' , ', self.settings)
+        only_mainnet = as_settings({'networks': {'mainnet': self.config['networks']['mainnet']}})
+        with self.assertRaisesRegex(ValueError, r"No network has an RPC endpoint set \(unset: mainnet\)"):
+            resolve_networks('all', only_mainnet)
+
+    def test_one_client_per_chain(self):
+        """Test that each network's client checks its own chain ID and keeps its own cache namespace."""
+        client = client_for('holesky', self.settings)
+        try:
+            self.assertEqual(client.rpc_url, self.nodes['holesky'].url)
+            self.assertEqual(client.expected_chain_id, 17000)
+            self.assertEqual(client.cache.chain_id, 17000)
+            self.assertEqual(client.get_balance(ADDRESS, 'wei'), 2 * 10 ** 18)
+        finally:
+            client.close()
+        with self.assertRaisesRegex(ValueError, r"No RPC endpoint for network mainnet .*MAINNET_RPC_URL"):
+            client_for('mainnet', self.settings)
+
+    def test_fan_out_takes_as_long_as_the_slowest_chain(self):
+        """Test that networks are queried at the same time, and that failures are kept per network."""
+        started = time.monotonic()
+        results = fan_out(['sepolia', 'holesky', 'local', 'mainnet'],
+                          lambda client: client.get_balance(ADDRESS, 'wei'), self.settings)
+        elapsed = time.monotonic() - started
+        self.assertEqual([results['sepolia'], results['holesky'], results['local']],
+                         [10 ** 18, 2 * 10 ** 18, 3 * 10 ** 18])
+        self.assertIsInstance(results['mainnet'], ValueError)
+        # Two round trips per chain (chain ID check, balance): one chain's worth, not three
+        self.assertLess(elapsed, 4 * LATENCY)
+
+    def test_wrong_chain_is_reported_for_that_network_only(self):
+        """Test that a profile pointing at another chain fails on its own."""
+        self.config['networks']['holesky']['endpoints'] = [{'url': self.nodes['local'].url}]
+        results = fan_out(['sepolia', 'holesky'], lambda client: client.get_balance(ADDRESS, 'wei'),
+                          as_settings(self.config))
+        self.assertEqual(results['sepolia'], 10 ** 18)
+        self.assertRegex(str(results['holesky']), "Wrong network")
+
+    def test_call_budget_applies_per_network(self):
+        """Test that each chain's calls are checked against the budget alone and not counted for the command."""
+        set_command('balance')
+        with patch.dict(os.environ, {'RPC_CALL_BUDGET': 'enforce'}):
+            results = fan_out(['sepolia', 'holesky', 'local'], lambda client: client.get_balance(ADDRESS, 'wei'),
+                              self.settings)
+        self.assertFalse([result for result in results.values() if isinstance(result, Exception)])
+        self.assertEqual(command_usage('balance').round_trips, 0)
+
+    def _cli(self, *argv):
+        """Run ./cli with argv against the test profiles; returns its exit code and output."""
+        path = Path(self.tmp.name) / 'settings.json'
+        path.write_text(json.dumps(self.config))
+        output = io.StringIO()
+        exit_code = 0
+        with patch('src.networks.CONFIG_PATH', path), contextlib.redirect_stdout(output):
+            try:
+                main.run(list(argv), forward=False)
+            except SystemExit as e:
+                exit_code = e.code
+        return exit_code, output.getvalue()
+
+    def test_cli_balance(self):
+        """Test ./cli balance --networks: one line per network, exit 1 when any selected one failed."""
+        exit_code, output = self._cli('balance', '--address', ADDRESS, '--networks', 'sepolia,holesky')
+        self.assertEqual(exit_code, 0)
+        self.assertIn("sepolia (Sepolia): 1.000000 ETH (1,000,000,000,000,000,000 Wei)", output)
+        self.assertIn("holesky (Holesky): 2.000000 ETH", output)
+
+        exit_code, output = self._cli('balance', '--address', ADDRESS, '--networks', 'all')
+        self.assertEqual(exit_code, 0)
+        self.assertIn("local (Local): 3.000000 ETH", output)
+        self.assertNotIn("mainnet (Ethereum Mainnet)", output)
+        self.assertIn("Skipped (no RPC endpoint set): mainnet", output)
+
+        exit_code, output = self._cli('balance', '--address', ADDRESS, '--networks', 'sepolia,mainnet')
+        self.assertEqual(exit_code, 1)
+        self.assertIn("sepolia (Sepolia): 1.000000 ETH", output)
+        self.assertIn("mainnet (Ethereum Mainnet): Error: No RPC endpoint", output)
+
+        exit_code, output = self._cli('balance', '--address', ADDRESS, '--networks', 'goerli')
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Error: Unknown network: goerli", output)
+
+    def test_cli_tx_status(self):
+        """Test ./cli tx status --networks: the transaction's status on every network."""
+        exit_code, output = self._cli('tx', 'status', '--hash', TX_HASH, '--networks', 'sepolia,local')
+        self.assertEqual(exit_code, 0)
+        self.assertIn(f"Transaction Hash: {TX_HASH}", output)
+        self.assertIn("sepolia (Sepolia): not_found - Transaction not found", output)
+        self.assertIn("local (Local): not_found - Transaction not found", output)
+
+        exit_code, output = self._cli('tx', 'status', '--hash', '0x1234', '--networks', 'all')
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Error: Invalid transaction hash", output)
+
+    def test_session_on_a_network(self):
+        """Test that a Session can be opened on a profile instead of the network section."""
+        with Session(config=self.config, wallet_dir=self.tmp.name, network='local') as session:
+            self.assertEqual(session.settings.network.chain_id, 31337)
+            self.assertEqual(session.balance(ADDRESS), 3 * 10 ** 18)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import threading
+import unittest
+
+from src.priority import (BACKGROUND, CRITICAL, INTERACTIVE, PriorityScheduler, current_priority,
+                          rpc_priority)
+from src.rate_limiter import NullRateLimiter
+from tests.helpers import wait_for
+
+
+class GatedLimiter:
+    """Limiter that records who was dispatched and holds each caller until released."""
+
+    def __init__(self):
+        self.order = []
+        self.gate = threading.Semaphore(0)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        self.order.append(threading.current_thread().name)
+        self.gate.acquire()
+        return 0.0
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    def setUp(self):
+        self.limiter = GatedLimiter()
+        self.threads = []
+
+    def tearDown(self):
+        for _ in range(len(self.threads) + 1):
+            self.limiter.gate.release()
+        for thread in self.threads:
+            thread.join(5)
+
+    def _queue(self, scheduler, name, priority):
+        thread = threading.Thread(target=scheduler.acquire, args=(priority,), name=name)
+        waiting = len(scheduler._waiting)
+        thread.start()
+        self.threads.append(thread)
+        wait_for(lambda: len(scheduler._waiting) > waiting)
+
+    def _drain(self, scheduler, count):
+        for _ in range(count):
+            dispatched = len(self.limiter.order)
+            self.limiter.gate.release()
+            wait_for(lambda: len(self.limiter.order) > dispatched)
+
+    def test_higher_priorities_go_first(self):
+        """Test that queued calls are dispatched by class, first come first served within a class."""
+        scheduler = PriorityScheduler(self.limiter, max_skips=100)
+        blocker = threading.Thread(target=scheduler.acquire, args=(BACKGROUND,), name='blocker')
+        blocker.start()
+        self.threads.append(blocker)
+        wait_for(lambda: self.limiter.order == ['blocker'])
+
+        for index in range(3):
+            self._queue(scheduler, f'scan-{index}', BACKGROUND)
+        self._queue(scheduler, 'show', INTERACTIVE)
+        self._queue(scheduler, 'nonce', CRITICAL)
+        self._drain(scheduler, 5)
+
+        self.assertEqual(self.limiter.order, ['blocker', 'nonce', 'show', 'scan-0', 'scan-1', 'scan-2'])
+        self.assertEqual(scheduler.dispatched, {CRITICAL: 1, INTERACTIVE: 1, BACKGROUND: 4})
+
+    def test_starvation_is_bounded(self):
+        """Test that a background call goes next once it has been passed over max_skips times."""
+        scheduler = PriorityScheduler(self.limiter, max_skips=2)
+        blocker = threading.Thread(target=scheduler.acquire, args=(CRITICAL,), name='blocker')
+        blocker.start()
+        self.threads.append(blocker)
+        wait_for(lambda: self.limiter.order == ['blocker'])
+
+        self._queue(scheduler, 'scan', BACKGROUND)
+        for index in range(4):
+            self._queue(scheduler, f'send-{index}', CRITICAL)
+        self._drain(scheduler, 5)
+
+        self.assertEqual(self.limiter.order, ['blocker', 'send-0', 'send-1', 'scan', 'send-2', 'send-3'])
+
+    def test_null_limiter_never_queues(self):
+        """Test that unlimited endpoints skip the queue."""
+        scheduler = PriorityScheduler(NullRateLimiter())
+        self.assertEqual(scheduler.acquire(BACKGROUND), 0.0)
+
+
+class TestRPCPriority(unittest.TestCase):
+    def test_context(self):
+        """Test that rpc_priority sets the priority for the block only, and rejects unknown classes."""
+        self.assertEqual(current_priority(), INTERACTIVE)
+        with rpc_priority(BACKGROUND):
+            self.assertEqual(current_priority(), BACKGROUND)
+            with rpc_priority(CRITICAL):
+                self.assertEqual(current_priority(), CRITICAL)
+            self.assertEqual(current_priority(), BACKGROUND)
+        self.assertEqual(current_priority(), INTERACTIVE)
+        with self.assertRaises(ValueError):
+            with rpc_priority('urgent'):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
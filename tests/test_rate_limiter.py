@@ -0,0 +1,143 @@
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.rate_limiter import TokenBucket, FileTokenBucket, NullRateLimiter, get_rate_limiter
+from tests.helpers import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst and then spaces requests at the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_refill_is_capped_at_burst(self):
+        """Test that idle time never accumulates more than burst tokens."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        clock.now += 60
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_invalid_settings(self):
+        """Test rejection of non-positive rates and bursts below one."""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0.5)
+
+    def test_thread_safety(self):
+        """Test that concurrent reservations are all accounted for."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, burst=1, clock=clock)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                wait = bucket.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 400 reservations at 100/s with one free token: the last waits 3.99s, all distinct
+        self.assertEqual(len(waits), 400)
+        self.assertAlmostEqual(max(waits), 3.99)
+        self.assertEqual(len({round(wait, 6) for wait in waits}), 400)
+
+    @patch('src.rate_limiter.time.sleep')
+    def test_acquire_sleeps(self, mock_sleep):
+        """Test that acquire sleeps for the reserved wait."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4, burst=1, clock=clock)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.25)
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.25)
+
+
+class TestFileTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'endpoint.bucket'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_buckets_share_state(self):
+        """Test that two buckets on the same file draw from one budget."""
+        clock = FakeClock()
+        first = FileTokenBucket(self.path, rate=10, burst=2, clock=clock)
+        second = FileTokenBucket(self.path, rate=10, burst=2, clock=clock)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+        self.assertAlmostEqual(first.reserve(), 0.1)
+        self.assertAlmostEqual(second.reserve(), 0.2)
+
+    def test_shared_across_processes(self):
+        """Test that a separate process sees reservations made here."""
+        bucket = FileTokenBucket(self.path, rate=1, burst=1)
+        self.assertEqual(bucket.reserve(), 0.0)
+        code = (
+            "import sys; from src.rate_limiter import FileTokenBucket; "
+            "print(FileTokenBucket(sys.argv[1], rate=1, burst=1).reserve())"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code, str(self.path)],
+            cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertGreater(float(output), 0.5)
+
+
+class TestGetRateLimiter(unittest.TestCase):
+    def test_defaults_without_config(self):
+        """Test that a missing config keeps the historical one request per 0.5s."""
+        limiter = get_rate_limiter("https://defaults.example/rpc")
+        self.assertIsInstance(limiter, TokenBucket)
+        self.assertEqual((limiter.rate, limiter.burst), (2.0, 1.0))
+
+    def test_endpoint_override_by_host(self):
+        """Test that endpoint settings can be matched by host name."""
+        config = {"default": {"rate": 5, "burst": 5},
+                  "endpoints": {"fast.example": {"rate": 25, "burst": 10}}}
+        fast = get_rate_limiter("https://fast.example/v1/secret-key", config)
+        slow = get_rate_limiter("https://slow.example/rpc", config)
+        self.assertEqual((fast.rate, fast.burst), (25.0, 10.0))
+        self.assertEqual((slow.rate, slow.burst), (5.0, 5.0))
+
+    def test_same_endpoint_shares_limiter(self):
+        """Test that clients of the same endpoint in one process share a bucket."""
+        config = {"default": {"rate": 7, "burst": 1}}
+        self.assertIs(get_rate_limiter("https://shared.example", config),
+                      get_rate_limiter("https://shared.example", config))
+
+    def test_zero_rate_disables_limiting(self):
+        """Test that rate 0 yields a limiter that never waits."""
+        limiter = get_rate_limiter("http://localhost:8545", {"default": {"rate": 0}})
+        self.assertIsInstance(limiter, NullRateLimiter)
+        self.assertEqual(limiter.acquire(), 0.0)
+
+    def test_shared_uses_state_file(self):
+        """Test that shared limiting keeps its state under state_dir."""
+        with tempfile.TemporaryDirectory() as tmp:
+            limiter = get_rate_limiter("https://cron.example", {"shared": True, "state_dir": tmp})
+            self.assertIsInstance(limiter, FileTokenBucket)
+            limiter.reserve()
+            self.assertEqual(len(list(Path(tmp).glob('*.bucket'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src.endpoint_pool import Endpoint, EndpointPool
+from src.rate_limiter import NullRateLimiter
+from src.retry import RetryPolicy, parse_retry_after
+from src.rpc_client import RPCClient
+from tests.helpers import FakeClock
+
+
+def _http_error(status_code, retry_after=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {'Retry-After': retry_after} if retry_after else {}
+    return requests.exceptions.HTTPError(f"{status_code} Error", response=response)
+
+
+def _upper(low, high):
+    """Deterministic jitter: always the largest allowed wait."""
+    return high
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_parse_retry_after(self):
+        """Test Retry-After in seconds, as an HTTP date and malformed."""
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertAlmostEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=lambda: 1445412480.0), 10.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_decorrelated_jitter_is_capped(self):
+        """Test that waits grow from base_delay by at most 3x and stay under max_delay."""
+        policy = RetryPolicy(deadline=1000, max_attempts=10, base_delay=0.5, max_delay=4, rng=_upper)
+        budget = policy.start()
+        self.assertEqual([budget.next_delay() for _ in range(4)], [1.5, 4, 4, 4])
+
+    def test_deadline_stops_retries(self):
+        """Test that no wait is granted once it would cross the deadline."""
+        clock = FakeClock()
+        policy = RetryPolicy(deadline=5, max_attempts=10, base_delay=1, max_delay=2, clock=clock, rng=_upper)
+        budget = policy.start()
+        self.assertEqual(budget.next_delay(), 2)
+        clock.now += 4
+        self.assertIsNone(budget.next_delay())
+
+    def test_max_attempts(self):
+        """Test that max_attempts counts the first attempt."""
+        budget = RetryPolicy(max_attempts=2, rng=_upper).start()
+        self.assertIsNotNone(budget.next_delay())
+        self.assertIsNone(budget.next_delay())
+
+    def test_retry_after_is_honored(self):
+        """Test that a longer Retry-After wins over the jitter, within the deadline."""
+        policy = RetryPolicy(deadline=30, base_delay=0.5, max_delay=2, rng=_upper)
+        self.assertEqual(policy.start().next_delay(retry_after=10), 10)
+        self.assertIsNone(policy.start().next_delay(retry_after=60))
+
+    def test_nested_budget_shares_deadline(self):
+        """Test that a budget started inside another never outlives the outer deadline."""
+        clock = FakeClock()
+        outer_policy = RetryPolicy(deadline=10, clock=clock)
+        inner_policy = RetryPolicy(deadline=30, clock=clock)
+        with outer_policy.start() as outer:
+            inner = inner_policy.start()
+            self.assertEqual(inner.deadline_at, outer.deadline_at)
+        self.assertEqual(inner_policy.start().deadline_at, clock.now + 30)
+
+    def test_retryable(self):
+        """Test per-status and per-method retryability."""
+        retryable = RetryPolicy.retryable
+        self.assertTrue(retryable(['eth_getBalance'], _http_error(429)))
+        self.assertTrue(retryable(['eth_getBalance'], _http_error(503)))
+        self.assertFalse(retryable(['eth_getBalance'], _http_error(401)))
+        self.assertTrue(retryable(['eth_getBalance'], requests.exceptions.ReadTimeout()))
+        self.assertFalse(retryable(['eth_sendTransaction'], requests.exceptions.ReadTimeout()))
+        self.assertTrue(retryable(['eth_sendTransaction'], requests.exceptions.ConnectionError()))
+
+    def test_heavy_methods_get_longer_timeouts(self):
+        """Test separate connect/read timeouts, longer reads for heavy methods, capped by the budget."""
+        clock = FakeClock()
+        policy = RetryPolicy(deadline=20, connect_timeout=3, read_timeout=10, heavy_read_timeout=60,
+                             heavy_methods=['eth_getLogs'], clock=clock)
+        self.assertEqual(policy.timeout(['eth_getBalance']), (3, 10))
+        self.assertEqual(policy.timeout(['eth_getLogs']), (3, 60))
+        self.assertEqual(policy.timeout(['eth_getLogs'], policy.start()), (3, 20))
+
+    @patch('src.retry.time.sleep')
+    def test_call_retries_until_success(self, mock_sleep):
+        """Test the generic retry helper used by TransactionManager."""
+        func = MagicMock(side_effect=[ConnectionError("down"), ConnectionError("down"), "ok"])
+        self.assertEqual(RetryPolicy(max_attempts=3).call(func, retry_on=(ConnectionError,)), "ok")
+        self.assertEqual(mock_sleep.call_count, 2)
+        func = MagicMock(side_effect=ValueError("rejected"))
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=3).call(func, retry_on=(ConnectionError,))
+        self.assertEqual(func.call_count, 1)
+
+
+class TestRPCClientRetries(unittest.TestCase):
+    def setUp(self):
+        self.patcher = patch('requests.Session.post')
+        self.mock_post = self.patcher.start()
+        endpoint = Endpoint("https://only", rate_limiter=NullRateLimiter())
+        self.client = RPCClient(chain_id=11155111, pool=EndpointPool([endpoint]))
+        self.client.chain_ids.record("https://only", 11155111)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def _response(self, error=None):
+        response = MagicMock()
+        if error is not None:
+            response.raise_for_status.side_effect = error
+        response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x123"}
+        return response
+
+    @patch('src.rpc_client.time.sleep')
+    def test_retry_after_header(self, mock_sleep):
+        """Test that a 429 with Retry-After waits at least that long."""
+        self.mock_post.side_effect = [self._response(_http_error(429, retry_after="3")), self._response()]
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 3)
+
+    @patch('src.rpc_client.time.sleep')
+    def test_client_errors_are_not_retried(self, mock_sleep):
+        """Test that a 401 fails at once."""
+        self.mock_post.return_value = self._response(_http_error(401))
+        with self.assertRaises(ConnectionError):
+            self.client.get_block_number()
+        self.assertEqual(self.mock_post.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch('src.rpc_client.time.sleep')
+    def test_connect_and_read_timeouts(self, mock_sleep):
+        """Test that requests are sent with a (connect, read) timeout pair."""
+        self.mock_post.return_value = self._response()
+        self.client.get_block_number()
+        connect, read = self.mock_post.call_args.kwargs['timeout']
+        self.assertLess(connect, read)
+
+
+if __name__ == '__main__':
+    unittest.main()
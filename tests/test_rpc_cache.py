@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.rpc_cache import ResponseCache, MISS, IMMUTABLE, TTL, CACHE_DEFAULTS
+from tests.helpers import FakeClock
+
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(11155111, finality_depth=64, latest_ttl=2.0, clock=self.clock)
+        # Head at block 1000, so everything up to 936 is treated as final
+        self.cache.put('eth_blockNumber', [], hex(1000))
+
+    def test_policies(self):
+        """Test the cacheability policy of common calls."""
+        policy = self.cache.policy
+        self.assertEqual(policy('eth_chainId', [], '0xaa36a7'), IMMUTABLE)
+        self.assertEqual(policy('eth_getBlockByNumber', [hex(900), False], {'number': hex(900)}), IMMUTABLE)
+        self.assertEqual(policy('eth_getBlockByNumber', [hex(990), False], {'number': hex(990)}), TTL)
+        self.assertEqual(policy('eth_getBlockByNumber', ['latest', False], {'number': hex(1000)}), TTL)
+        self.assertEqual(policy('eth_getTransactionReceipt', ['0xabc'], {'blockNumber': hex(900)}), IMMUTABLE)
+        self.assertIsNone(policy('eth_getTransactionReceipt', ['0xabc'], {'blockNumber': hex(999)}))
+        self.assertIsNone(policy('eth_getTransactionReceipt', ['0xabc'], None))
+        self.assertEqual(policy('eth_getBalance', [ADDRESS, 'latest'], '0x1'), TTL)
+        self.assertEqual(policy('eth_getBalance', [ADDRESS, hex(900)], '0x1'), IMMUTABLE)
+        self.assertIsNone(policy('eth_getTransactionCount', [ADDRESS, 'pending'], '0x1'))
+        self.assertIsNone(policy('eth_sendRawTransaction', ['0xf8'], '0xabc'))
+
+    def test_latest_results_expire(self):
+        """Test that head-following results are served only within the TTL."""
+        self.cache.put('eth_getBalance', [ADDRESS, 'latest'], '0x1')
+        self.assertEqual(self.cache.get('eth_getBalance', [ADDRESS, 'latest']), '0x1')
+        self.clock.now += 3
+        self.assertIs(self.cache.get('eth_getBalance', [ADDRESS, 'latest']), MISS)
+
+    def test_immutable_results_never_expire(self):
+        """Test that immutable results outlive the TTL and are counted as hits."""
+        self.cache.put('eth_chainId', [], '0xaa36a7')
+        self.clock.now += 3600
+        self.assertEqual(self.cache.get('eth_chainId', []), '0xaa36a7')
+        self.assertIs(self.cache.get('eth_gasPrice', []), MISS)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(11155111, max_entries=2, clock=self.clock)
+        cache.put('eth_getBlockByHash', ['0x01', False], {'number': '0x1'})
+        cache.put('eth_getBlockByHash', ['0x02', False], {'number': '0x2'})
+        cache.get('eth_getBlockByHash', ['0x01', False])
+        cache.put('eth_getBlockByHash', ['0x03', False], {'number': '0x3'})
+        self.assertIsNot(cache.get('eth_getBlockByHash', ['0x01', False]), MISS)
+        self.assertIs(cache.get('eth_getBlockByHash', ['0x02', False]), MISS)
+
+    def test_finalized_tag_updates_head(self):
+        """Test that a 'finalized' block raises the finalized head."""
+        cache = ResponseCache(11155111, clock=self.clock)
+        self.assertEqual(cache.policy('eth_getBlockByNumber', [hex(50), False], {'number': hex(50)}), TTL)
+        cache.put('eth_getBlockByNumber', ['finalized', False], {'number': hex(100)})
+        self.assertEqual(cache.policy('eth_getBlockByNumber', [hex(50), False], {'number': hex(50)}), IMMUTABLE)
+
+    def test_disk_store_persists_immutable_results(self):
+        """Test that immutable results survive a restart while TTL results do not."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'cache.sqlite'
+            first = ResponseCache(11155111, path=str(path), clock=self.clock)
+            first.put('eth_chainId', [], '0xaa36a7')
+            first.put('eth_gasPrice', [], '0x1')
+            first.close()
+
+            second = ResponseCache(11155111, path=str(path), clock=self.clock)
+            self.assertEqual(second.get('eth_chainId', []), '0xaa36a7')
+            self.assertIs(second.get('eth_gasPrice', []), MISS)
+            # Keys include the chain ID, so another network never sees these results
+            other = ResponseCache(1, path=str(path), clock=self.clock)
+            self.assertIs(other.get('eth_chainId', []), MISS)
+            second.close()
+            other.close()
+
+    def test_from_config(self):
+        """Test building from settings and disabling the cache."""
+        self.assertIsNone(ResponseCache.from_config(11155111, {'enabled': False}))
+        cache = ResponseCache.from_config(11155111, {'latest_ttl': 5})
+        self.assertEqual(cache.latest_ttl, 5)
+        self.assertEqual(cache.max_entries, CACHE_DEFAULTS['max_entries'])
+
+
+if __name__ == '__main__':
+    unittest.main()
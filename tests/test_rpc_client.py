@@ -1,9 +1,13 @@
 import unittest
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 import requests
 
+from src.priority import BACKGROUND, CRITICAL, get_scheduler, rpc_priority
+from src.rate_limiter import NullRateLimiter
 from src.rpc_client import RPCClient
 from pathlib import Path
 
@@ -72,7 +76,8 @@ class TestRPCClient(unittest.TestCase):
             self.patcher1 = patch('src.rpc_client.CONFIG_PATH', self.settings_file)
             self.patcher2 = patch('requests.Session.post', new=MagicMock())
             self.patcher1.start()
-            self.patcher2.start()
+            # new= is one MagicMock, so later tests configure it directly instead of starting the patch again
+            self.mock_post = self.patcher2.start()
 
             # Verify CONFIG_PATH patch
             import src.rpc_client
@@ -83,10 +88,11 @@ class TestRPCClient(unittest.TestCase):
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0xaa36a7"}  # Chain ID 11155111
-            self.patcher2.start().return_value = mock_response
+            self.mock_post.return_value = mock_response
 
-            # Initialize RPCClient with mock settings
+            # Initialize RPCClient with mock settings and verify its network while eth_chainId is mocked
             self.client = RPCClient(rpc_url="https://mock-rpc-url", chain_id=11155111)
+            self.client.get_chain_id()
         except Exception as e:
             self.fail(f"Failed to initialize RPCClient: {e}")
 
@@ -131,16 +137,71 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
-        # Test initialization
+        # Test initialization: the chain ID is only checked before the first call
+        mock_post = self.mock_post
+        mock_post.reset_mock()
         client = RPCClient(rpc_url="https://mock-rpc-url", chain_id=1)
         self.assertEqual(client.rpc_url, "https://mock-rpc-url")
         self.assertEqual(client.expected_chain_id, 1)
         self.assertEqual(client.timeout, 10)
         self.assertEqual(client.max_retries, 5)
-        self.assertEqual(client.call_count, 1)
-        self.assertEqual(client.success_count, 1)
+        self.assertEqual(client.call_count, 0)
+        mock_post.assert_not_called()
+
+    def test_retry_settings_apply_unless_overridden(self):
+        """Test that rpc.retry.read_timeout and max_attempts apply, and explicit arguments win over them."""
+        config = {'rpc': {'retry': {'read_timeout': 42.0, 'max_attempts': 2}}}
+        client = RPCClient(rpc_url="https://mock-rpc-url", config=config)
+        self.assertEqual((client.timeout, client.max_retries), (42.0, 2))
+        self.assertEqual(client.retry_policy.timeout(['eth_getBalance'])[1], 42.0)
+        client = RPCClient(rpc_url="https://mock-rpc-url", config=config, timeout=7, max_retries=4)
+        self.assertEqual((client.retry_policy.read_timeout, client.retry_policy.max_attempts), (7, 4))
+
+    def test_lazy_chain_id_check(self):
+        """Test that the first call verifies the endpoint once and later calls skip the check."""
+        responses = [
+            {"jsonrpc": "2.0", "id": 1, "result": "0x5"},      # eth_chainId of a fresh endpoint
+            {"jsonrpc": "2.0", "id": 2, "result": "0x123"},
+            {"jsonrpc": "2.0", "id": 3, "result": "0x3b9aca00"}
+        ]
+        mock_post = self.mock_post
+        mock_post.return_value.json.side_effect = responses
+        mock_post.reset_mock()
+
+        client = RPCClient(rpc_url="https://lazy-check-rpc", chain_id=5)
+        self.assertEqual(client.get_block_number(), 0x123)
+        client.get_gas_price('wei')
+        sent = [json.loads(call.kwargs['data'])['method'] for call in mock_post.call_args_list]
+        self.assertEqual(sent, ['eth_chainId', 'eth_blockNumber', 'eth_gasPrice'])
+
+    def test_batch_with_chain_id_verifies_endpoint(self):
+        """Test that a batch asking for the chain ID counts as the check, so the next call sends no check of its own."""
+        mock_post = self.mock_post
+        mock_post.return_value.json.side_effect = [
+            [{"jsonrpc": "2.0", "id": 2, "result": "0x5"}, {"jsonrpc": "2.0", "id": 1, "result": "0x10"}],
+            {"jsonrpc": "2.0", "id": 3, "result": "0x" + "1" * 64}
+        ]
+        mock_post.reset_mock()
+
+        client = RPCClient(rpc_url="https://batch-probe-rpc", chain_id=5)
+        self.assertEqual(client.batch([('eth_getTransactionCount', ["0x" + "0" * 40, 'pending']), ('eth_chainId', [])]),
+                         ['0x10', '0x5'])
+        client.send_raw_transaction("0x" + "ab" * 60)
+        sent = [json.loads(call.kwargs['data']) for call in mock_post.call_args_list]
+        self.assertEqual(['batch' if isinstance(call, list) else call['method'] for call in sent],
+                         ['batch', 'eth_sendRawTransaction'])
+
+    def test_lazy_chain_id_check_wrong_network(self):
+        """Test that the first call fails when the endpoint serves another network."""
+        mock_post = self.mock_post
+        mock_post.return_value.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+        client = RPCClient(rpc_url="https://wrong-network-rpc", chain_id=11155111)
+        with self.assertRaises(ValueError) as cm:
+            client.get_block_number()
+        self.assertIn("Wrong network! Expected 11155111", str(cm.exception))
 
     def test_get_chain_id_success(self):
         """Test retrieving chain ID successfully."""
@@ -148,7 +209,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0xaa36a7"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         chain_id = self.client.get_chain_id()
         self.assertEqual(chain_id, 11155111)
@@ -159,25 +220,24 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         with self.assertRaises(ValueError) as cm:
             self.client.get_chain_id()
         self.assertIn("Wrong network! Expected 11155111", str(cm.exception))
 
     def test_get_network_info_success(self):
-        """Test retrieving network information successfully."""
-        # Mock responses
-        mock_response_chain = MagicMock()
-        mock_response_chain.status_code = 200
-        mock_response_chain.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0xaa36a7"}
-        mock_response_block = MagicMock()
-        mock_response_block.status_code = 200
-        mock_response_block.json.return_value = {"jsonrpc": "2.0", "id": 2, "result": "0x123"}
-        mock_response_gas = MagicMock()
-        mock_response_gas.status_code = 200
-        mock_response_gas.json.return_value = {"jsonrpc": "2.0", "id": 3, "result": "0x3b9aca00"}  # 1 Gwei
-        self.patcher2.start().side_effect = [mock_response_chain, mock_response_block, mock_response_gas]
+        """Test retrieving network information in one batched request."""
+        # Mock batch response (deliberately out of order); the chain ID is cached from the connection check
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 3, "result": "0x3b9aca00"},  # 1 Gwei
+            {"jsonrpc": "2.0", "id": 2, "result": "0x123"}
+        ]
+        mock_post = self.mock_post
+        mock_post.return_value = mock_response
+        mock_post.reset_mock()
 
         info = self.client.get_network_info()
         self.assertEqual(info, {
@@ -186,13 +246,16 @@ class TestRPCClient(unittest.TestCase):
             'latest_block': 0x123,
             'gas_price_gwei': 1.0
         })
+        self.assertEqual(mock_post.call_count, 1)
+        sent = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual([item['method'] for item in sent], ['eth_blockNumber', 'eth_gasPrice'])
 
     def test_get_network_info_failure(self):
         """Test network info retrieval with network error."""
         # Mock failure with RequestException
         mock_response = MagicMock()
         mock_response.side_effect = requests.exceptions.RequestException("Network error")
-        self.patcher2.start().side_effect = mock_response
+        self.mock_post.side_effect = mock_response
 
         info = self.client.get_network_info()
         self.assertEqual(info['connected'], False)
@@ -205,7 +268,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1bc16d674ec80000"}  # 2 ETH
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         balance = self.client.get_balance("0x1234567890123456789012345678901234567890", unit='ether')
         self.assertEqual(balance, 2.0)
@@ -234,7 +297,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x5"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         nonce = self.client.get_nonce("0x1234567890123456789012345678901234567890")
         self.assertEqual(nonce, 5)
@@ -251,7 +314,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x3b9aca00"}  # 1 Gwei
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         gas_price = self.client.get_gas_price(unit='gwei')
         self.assertEqual(gas_price, 1.0)
@@ -268,7 +331,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x0"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         gas_price = self.client.get_gas_price(unit='gwei')
         self.assertEqual(gas_price, 1.0)  # Should use default from test_settings.json
@@ -279,7 +342,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x5208"}  # 21000
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         tx = {"to": "0x1234567890123456789012345678901234567890", "value": "0x1"}
         gas = self.client.estimate_gas(tx)
@@ -301,7 +364,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x" + "1" * 64}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         tx_hash = self.client.send_raw_transaction("0x" + "f" * 100)
         self.assertEqual(tx_hash, "0x" + "1" * 64)
@@ -314,20 +377,18 @@ class TestRPCClient(unittest.TestCase):
 
     def test_get_transaction_status_success(self):
         """Test retrieving successful transaction status."""
-        # Mock eth_getTransactionByHash and eth_getTransactionReceipt
-        mock_response_tx = MagicMock()
-        mock_response_tx.status_code = 200
-        mock_response_tx.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": {"hash": "0x" + "1" * 64}}
-        mock_response_receipt = MagicMock()
-        mock_response_receipt.status_code = 200
-        mock_response_receipt.json.return_value = {
-            "jsonrpc": "2.0", "id": 2, "result": {
+        # Mock eth_getTransactionByHash and eth_getTransactionReceipt in one batch
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 2, "result": {"hash": "0x" + "1" * 64}},
+            {"jsonrpc": "2.0", "id": 3, "result": {
                 "status": "0x1",
                 "blockNumber": "0x123",
                 "gasUsed": "0x5208"
-            }
-        }
-        self.patcher2.start().side_effect = [mock_response_tx, mock_response_receipt]
+            }}
+        ]
+        self.mock_post.return_value = mock_response
 
         status = self.client.get_transaction_status("0x" + "1" * 64)
         self.assertEqual(status, {
@@ -340,13 +401,13 @@ class TestRPCClient(unittest.TestCase):
     def test_get_transaction_status_pending(self):
         """Test retrieving status of a pending transaction."""
         # Mock eth_getTransactionByHash (exists) and eth_getTransactionReceipt (None)
-        mock_response_tx = MagicMock()
-        mock_response_tx.status_code = 200
-        mock_response_tx.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": {"hash": "0x" + "1" * 64}}
-        mock_response_receipt = MagicMock()
-        mock_response_receipt.status_code = 200
-        mock_response_receipt.json.return_value = {"jsonrpc": "2.0", "id": 2, "result": None}
-        self.patcher2.start().side_effect = [mock_response_tx, mock_response_receipt]
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 2, "result": {"hash": "0x" + "1" * 64}},
+            {"jsonrpc": "2.0", "id": 3, "result": None}
+        ]
+        self.mock_post.return_value = mock_response
 
         status = self.client.get_transaction_status("0x" + "1" * 64)
         self.assertEqual(status, {
@@ -358,11 +419,14 @@ class TestRPCClient(unittest.TestCase):
 
     def test_get_transaction_status_not_found(self):
         """Test retrieving status of a non-existent transaction."""
-        # Mock eth_getTransactionByHash (None)
+        # Mock eth_getTransactionByHash (None) and eth_getTransactionReceipt (None)
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": None}
-        self.patcher2.start().return_value = mock_response
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 2, "result": None},
+            {"jsonrpc": "2.0", "id": 3, "result": None}
+        ]
+        self.mock_post.return_value = mock_response
 
         status = self.client.get_transaction_status("0x" + "1" * 64)
         self.assertEqual(status, {
@@ -384,7 +448,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x123"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         block_number = self.client.get_block_number()
         self.assertEqual(block_number, 0x123)
@@ -404,7 +468,7 @@ class TestRPCClient(unittest.TestCase):
                 "transactions": ["0x" + "1" * 64]
             }
         }
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         block_info = self.client.get_block_info(100)
         self.assertEqual(block_info, {
@@ -421,7 +485,7 @@ class TestRPCClient(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": None}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         with self.assertRaises(ValueError) as cm:
             self.client.get_block_info(100)
@@ -433,25 +497,242 @@ class TestRPCClient(unittest.TestCase):
             self.client.get_block_info(-1)
         self.assertEqual(str(cm.exception), "Block number cannot be negative")
 
+    def test_batch_results_in_order_with_item_errors(self):
+        """Test that batch returns results in request order and keeps per-item errors."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 3, "error": {"code": -32000, "message": "execution reverted"}},
+            {"jsonrpc": "2.0", "id": 2, "result": "0x123"}
+        ]
+        mock_post = self.mock_post
+        mock_post.return_value = mock_response
+        mock_post.reset_mock()
+
+        results = self.client.batch([('eth_blockNumber', []), ('eth_estimateGas', [{"to": "0x0"}])])
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(results[0], "0x123")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIn("execution reverted", str(results[1]))
+
+    def test_batch_rejected(self):
+        """Test that a batch rejected as a whole raises ValueError."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"jsonrpc": "2.0", "id": None,
+                                           "error": {"code": -32600, "message": "batch not supported"}}
+        self.mock_post.return_value = mock_response
+
+        with self.assertRaises(ValueError) as cm:
+            self.client.batch([('eth_blockNumber', [])])
+        self.assertIn("batch not supported", str(cm.exception))
+
+    def test_prepare_transaction(self):
+        """Test fetching all transaction inputs in one batched request."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"jsonrpc": "2.0", "id": 2, "result": "0x1bc16d674ec80000"},  # 2 ETH
+            {"jsonrpc": "2.0", "id": 3, "error": {"code": -32000, "message": "nonce unavailable"}},
+            {"jsonrpc": "2.0", "id": 4, "result": "0x5208"},
+            {"jsonrpc": "2.0", "id": 5, "result": "0x0"}  # Zero gas price falls back to default
+        ]
+        mock_post = self.mock_post
+        mock_post.return_value = mock_response
+        mock_post.reset_mock()
+
+        params = self.client.prepare_transaction(
+            "0x1234567890123456789012345678901234567890",
+            {"to": "0x0987654321098765432109876543210987654321", "value": "0x1"}
+        )
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(params, {
+            'balance': 2000000000000000000,
+            'nonce': None,
+            'chain_id': 11155111,
+            'gas_price': 1000000000,
+            'gas': 21000
+        })
+
     def test_get_stats(self):
         """Test retrieving RPC client statistics."""
         # Mock two successful calls
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0xaa36a7"}
-        self.patcher2.start().return_value = mock_response
+        self.mock_post.return_value = mock_response
 
         # Make two calls
         self.client.get_chain_id()
         self.client.get_block_number()
 
         stats = self.client.get_stats()
+        methods = stats.pop('methods')
+        endpoints = stats.pop('endpoints')
+        stats.pop('calls')
+        stats.pop('bytes_sent')
+        stats.pop('bytes_received')
+        self.assertGreaterEqual(stats.pop('rate_limit_wait_s'), 0.0)
         self.assertEqual(stats, {
             'total_calls': 3,  # Including initial call in __init__
             'successful_calls': 3,
             'success_rate': 100.0,
+            'hedged_calls': 0,
+            'hedge_wins': 0,
+            'coalesced_calls': 0,
+            'cache_hits': 0,
+            'cache_misses': 1,
+            'retries': 0,
+            'throttled': 0,
+            'compute_units': 10.0,  # eth_chainId is free, eth_blockNumber costs 10
             'network': 'Sepolia Testnet'
         })
+        self.assertEqual(set(methods), {'eth_chainId', 'eth_blockNumber'})
+        self.assertEqual(methods['eth_chainId']['requests'], 2)
+        self.assertEqual(methods['eth_blockNumber']['requests'], 1)
+        self.assertIsNotNone(methods['eth_blockNumber']['p50_ms'])
+        self.assertEqual(list(endpoints), ['mock-rpc-url'])
+
+    @patch('src.rpc_client.time.sleep')
+    def test_get_stats_counts_retries(self, mock_sleep):
+        """Test that retries and 429s are counted per method."""
+        mock_post = self.mock_post
+        throttled = MagicMock()
+        throttled.status_code = 429
+        throttled.headers = {}
+        throttled.content = b''
+        error = requests.exceptions.HTTPError("429 Error", response=throttled)
+        throttled.raise_for_status.side_effect = error
+        ok = MagicMock()
+        ok.content = b'{"jsonrpc": "2.0", "id": 1, "result": "0x1"}'
+        ok.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+        mock_post.side_effect = [throttled, ok]
+
+        self.client.get_block_number()
+
+        block_number = self.client.get_stats()['methods']['eth_blockNumber']
+        self.assertEqual(block_number['requests'], 2)
+        self.assertEqual(block_number['errors'], 1)
+        self.assertEqual(block_number['retries'], 1)
+        self.assertEqual(block_number['throttled'], 1)
+        self.assertEqual(block_number['bytes_received'], len(ok.content))
+
+    def test_gas_price_served_from_oracle(self):
+        """Test that a fresh gas quote is reused by get_gas_price and get_network_info."""
+        mock_post = self.mock_post
+        mock_post.return_value.json.side_effect = [
+            {"jsonrpc": "2.0", "id": 2, "result": "0x3b9aca00"},  # 1 Gwei
+            [{"jsonrpc": "2.0", "id": 3, "result": "0x123"}]
+        ]
+        mock_post.reset_mock()
+
+        self.assertEqual(self.client.get_gas_price('gwei'), 1.0)
+        self.assertEqual(self.client.get_gas_price('wei'), 1000000000)
+        self.assertLess(self.client.get_gas_price_age(), 5)
+        info = self.client.get_network_info()
+        self.assertEqual(info['gas_price_gwei'], 1.0)
+        self.assertEqual(mock_post.call_count, 2)
+        sent = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual([item['method'] for item in sent], ['eth_blockNumber'])
+
+    def test_cached_results_are_not_refetched(self):
+        """Test that a repeated cacheable call is answered from the cache."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": "0x123"}
+        mock_post = self.mock_post
+        mock_post.return_value = mock_response
+        mock_post.reset_mock()
+
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        self.assertEqual(self.client.get_block_number(), 0x123)
+        self.assertEqual(mock_post.call_count, 1)
+        stats = self.client.get_stats()
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (1, 1))
+
+    def _echo_node(self, balances):
+        """Fake session.post answering eth_getBalance from a dict, echoing request IDs."""
+        def post(url, headers=None, data=None, timeout=None):
+            request = json.loads(data)
+            response = MagicMock()
+            address = request['params'][0]
+            if address in balances:
+                response.json.return_value = {"jsonrpc": "2.0", "id": request['id'], "result": balances[address]}
+            else:
+                response.json.return_value = {"jsonrpc": "2.0", "id": request['id'],
+                                              "error": {"code": -32602, "message": "invalid address"}}
+            return response
+        return post
+
+    def test_map_calls_preserves_order_and_errors(self):
+        """Test that map_calls yields results in input order, with failed calls as exceptions."""
+        for endpoint in self.client.pool.endpoints:
+            endpoint.rate_limiter = NullRateLimiter()
+        balances = {f"0x{i:040x}": hex(i) for i in range(20)}
+        self.mock_post.side_effect = self._echo_node(balances)
+        params = [[address, '0x10'] for address in balances]
+        params.insert(5, ['0xbad', '0x10'])
+
+        results = list(self.client.map_calls('eth_getBalance', params, max_workers=4))
+
+        self.assertEqual(len(results), 21)
+        self.assertIsInstance(results[5], ValueError)
+        self.assertEqual(results[:5] + results[6:], [hex(i) for i in range(20)])
+
+    def test_concurrent_calls_get_unique_ids(self):
+        """Test that request IDs and counters stay consistent when threads share the client."""
+        for endpoint in self.client.pool.endpoints:
+            endpoint.rate_limiter = NullRateLimiter()
+        mock_post = self.mock_post
+        mock_post.side_effect = self._echo_node({f"0x{i:040x}": hex(i) for i in range(200)})
+        mock_post.reset_mock()
+        calls_before = self.client.call_count
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: self.client.get_balance(f"0x{i:040x}", 'wei'), range(200)))
+
+        ids = [json.loads(call.kwargs['data'])['id'] for call in mock_post.call_args_list]
+        self.assertEqual(len(set(ids)), 200)
+        self.assertEqual(self.client.call_count - calls_before, 200)
+
+    def test_identical_concurrent_calls_are_coalesced(self):
+        """Test that identical read-only calls in flight at the same time share one request."""
+        for endpoint in self.client.pool.endpoints:
+            endpoint.rate_limiter = NullRateLimiter()
+        answer = self._echo_node({"0x1234567890123456789012345678901234567890": "0x1bc16d674ec80000"})
+
+        def slow_post(*args, **kwargs):
+            # Hold the request until every other thread has joined it
+            deadline = time.monotonic() + 5
+            while self.client.single_flight.coalesced < 7 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return answer(*args, **kwargs)
+
+        mock_post = self.mock_post
+        mock_post.side_effect = slow_post
+        mock_post.reset_mock()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            balances = list(executor.map(
+                lambda _: self.client.get_balance("0x1234567890123456789012345678901234567890"), range(8)))
+
+        self.assertEqual(balances, [2.0] * 8)
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(self.client.get_stats()['coalesced_calls'], 7)
+
+    def test_calls_carry_their_priority(self):
+        """Test that rpc_priority reaches map_calls workers and that writes are always critical."""
+        scheduler = get_scheduler(self.client.pool.endpoints[0].rate_limiter)
+        before = dict(scheduler.dispatched)
+        self.mock_post.side_effect = self._echo_node({f"0x{i:040x}": hex(i) for i in range(3)})
+
+        with rpc_priority(BACKGROUND):
+            list(self.client.map_calls('eth_getBalance', [[f"0x{i:040x}", 'latest'] for i in range(3)]))
+            with self.assertRaises(ValueError):
+                self.client.send_raw_transaction("0xf86c")
+
+        self.assertEqual(scheduler.dispatched[BACKGROUND] - before[BACKGROUND], 3)
+        self.assertEqual(scheduler.dispatched[CRITICAL] - before[CRITICAL], 1)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
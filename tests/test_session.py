@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from eth_account import Account
+
+from src.mock_node import MockNode
+from src.session import Session
+
+PRIVATE_KEY = "33" * 32
+PASSWORD = "Session1234!"
+SENDER = Account.from_key(PRIVATE_KEY).address
+RECIPIENT = "0x0987654321098765432109876543210987654321"
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.wallet_dir = Path(self.tmp.name) / 'wallets'
+        self.wallet_dir.mkdir()
+        self.node = MockNode(accounts={SENDER: 10 ** 18}).start()
+        self.env = patch.dict(os.environ, {'RPC_URL': self.node.url})
+        self.env.start()
+        self.session = Session(wallet_dir=self.wallet_dir)
+
+    def tearDown(self):
+        self.session.close()
+        self.env.stop()
+        self.node.stop()
+        self.tmp.cleanup()
+
+    def test_managers_share_one_client(self):
+        """Test that the wallet and transaction managers use the session's RPC client and wallet store."""
+        self.assertIs(self.session.wallets.rpc_client, self.session.rpc)
+        self.assertIs(self.session.transactions.rpc_client, self.session.rpc)
+        self.assertIs(self.session.transactions.wallet_manager, self.session.wallets)
+        self.assertEqual(self.session.wallets.wallet_dir, self.wallet_dir)
+
+    def test_wallets_and_balance(self):
+        """Test the wallet operations and balance lookups, with the default wallet filled in."""
+        address = self.session.import_wallet(PRIVATE_KEY, PASSWORD)['address']
+        self.assertEqual([wallet['address'] for wallet in self.session.list_wallets()], [address])
+        with self.assertRaisesRegex(ValueError, "No default wallet set"):
+            self.session.balance()
+        self.session.use_wallet(address)
+        self.assertEqual(self.session.default_wallet(), address)
+        self.assertEqual(self.session.balance(), 10 ** 18)
+        self.assertEqual(self.session.balance(SENDER, 'ether'), 1)
+
+        info = self.session.wallet_info(password=PASSWORD)
+        self.assertEqual(info['balance']['wei'], 10 ** 18)
+        self.assertEqual(info['private_key'], PRIVATE_KEY)
+        with self.assertRaises(FileNotFoundError):
+            self.session.wallet_info(RECIPIENT)
+
+    def test_send_and_status(self):
+        """Test that a transfer returns its hash and its status can be looked up."""
+        address = self.session.import_wallet(PRIVATE_KEY, PASSWORD)['address']
+        tx_hash = self.session.send(RECIPIENT, 0.25, PASSWORD, from_address=address)
+        self.assertEqual(self.node.chain.balance(RECIPIENT), 25 * 10 ** 16)
+        self.assertEqual(self.session.tx_status(tx_hash)['status'], 'success')
+
+    def test_errors_are_raised(self):
+        """Test that bad input raises instead of printing and exiting."""
+        address = self.session.import_wallet(PRIVATE_KEY, PASSWORD)['address']
+        with self.assertRaisesRegex(ValueError, "Invalid address"):
+            self.session.balance('not-an-address')
+        with self.assertRaisesRegex(ValueError, "Amount must be positive"):
+            self.session.send(RECIPIENT, 0, PASSWORD, from_address=address)
+        with self.assertRaisesRegex(ValueError, "Invalid password"):
+            self.session.send(RECIPIENT, 0.1, "wrong-password", from_address=address)
+        self.assertEqual(self.node.chain.balance(RECIPIENT), 0)
+
+    def test_unreachable_network_raises_connection_error(self):
+        """Test that lookups on a node that cannot be reached raise ConnectionError instead of returning 'error'."""
+        self.assertEqual(self.session.tx_status("0x" + "ab" * 32)['status'], 'not_found')
+        with Session('http://127.0.0.1:1', wallet_dir=self.wallet_dir, max_retries=1) as offline:
+            with self.assertRaises(ConnectionError):
+                offline.tx_status("0x" + "ab" * 32)
+            with self.assertRaises(ConnectionError):
+                offline.balance(RECIPIENT)
+
+    def test_concurrent_operations(self):
+        """Test that threads can share one session."""
+        accounts = [f"0x{index:040x}" for index in range(1, 21)]
+        for index, account in enumerate(accounts, start=1):
+            self.node.chain.fund(account, index)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            balances = list(executor.map(self.session.balance, accounts))
+        self.assertEqual(balances, list(range(1, 21)))
+
+
+if __name__ == '__main__':
+    unittest.main()
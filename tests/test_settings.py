@@ -0,0 +1,127 @@
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.settings import atomic_write, clear_cache, load_settings, read_settings
+from src.wallet import WalletManager
+
+ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'settings.json'
+        self._write({'network': {'chain_id': 17000, 'name': 'Holesky'}, 'rpc': {'cache': {'enabled': True}}})
+
+    def tearDown(self):
+        clear_cache()
+        self.tmp.cleanup()
+
+    def _write(self, config, age=60):
+        """Write settings as a file last modified age seconds ago (old enough to be cached)."""
+        self.path.write_text(json.dumps(config))
+        modified = time.time() - age
+        os.utime(self.path, (modified, modified))
+
+    def test_reads_are_cached_until_the_file_changes(self):
+        """Test that an unchanged file is parsed once, and a changed one again."""
+        first = read_settings(self.path)
+        self.assertIs(read_settings(self.path), first)
+        self.assertIs(load_settings(self.path), load_settings(self.path))
+
+        self._write({'network': {'chain_id': 1, 'name': 'Ethereum Mainnet'}}, age=30)
+        self.assertEqual(read_settings(self.path)['network']['chain_id'], 1)
+        self.assertEqual(load_settings(self.path).network.chain_id, 1)
+
+    def test_recently_modified_files_are_not_cached(self):
+        """Test that a file written within the mtime granularity is read again on every call."""
+        self._write({'network': {'chain_id': 5}}, age=0)
+        first = read_settings(self.path)
+        self.assertIsNot(read_settings(self.path), first)
+        self.assertEqual(read_settings(self.path), first)
+
+    def test_typed_settings(self):
+        """Test that sections get their types and defaults, and unknown keys are kept."""
+        settings = load_settings(self.path)
+        self.assertEqual((settings.network.chain_id, settings.network.name), (17000, 'Holesky'))
+        self.assertEqual(settings.transaction.default_gas_limit, 21000)
+        self.assertEqual(settings.rpc, {'cache': {'enabled': True}})
+
+    def test_typed_rpc_sections(self):
+        """Test that rpc sections stay dicts of the keys set, converted to their types, with unknown keys kept."""
+        self._write({'rpc': {'retry': {'max_attempts': '3', 'jitter': 'full'}, 'hedging': {'min_delay_ms': 25},
+                             'endpoints': [{'url': '${RPC_URL}', 'weight': 2}], 'priority': {'default': 'batch'}}})
+        rpc = load_settings(self.path).rpc
+        self.assertEqual(rpc['retry'], {'max_attempts': 3, 'jitter': 'full'})
+        self.assertEqual(rpc['endpoints'], [{'url': '${RPC_URL}', 'weight': 2.0}])
+        self.assertEqual(rpc['priority'], {'default': 'batch'})
+
+        self._write({'rpc': {'retry': {'deadline': 0}, 'rate_limit': {'default': {'rate': 'fast'}},
+                             'endpoints': [{'url': 'https://node.example', 'groups': ['reads']}, {'weight': 1}]}},
+                    age=30)
+        with self.assertRaises(ValueError) as cm:
+            load_settings(self.path)
+        for problem in ('rpc.retry.deadline', 'rpc.rate_limit.default.rate', 'rpc.endpoints.0.groups.0',
+                        'rpc.endpoints.1.url'):
+            self.assertIn(problem, str(cm.exception))
+
+    def test_invalid_settings(self):
+        """Test that missing files, broken JSON and bad values raise ValueError."""
+        with self.assertRaisesRegex(ValueError, "Configuration file not found"):
+            read_settings(Path(self.tmp.name) / 'missing.json')
+        self.path.write_text("invalid json")
+        with self.assertRaisesRegex(ValueError, "Invalid JSON format"):
+            read_settings(self.path)
+        self._write({'network': {'chain_id': 'sepolia'}, 'transaction': {'default_gas_limit': -1}}, age=10)
+        with self.assertRaises(ValueError) as cm:
+            load_settings(self.path)
+        self.assertIn("network.chain_id", str(cm.exception))
+        self.assertIn("transaction.default_gas_limit", str(cm.exception))
+
+    def test_environment_overrides(self):
+        """Test that CLI_SETTINGS_* variables override single values, parsed as JSON when they can be."""
+        read_settings(self.path)
+        with patch.dict(os.environ, {'CLI_SETTINGS_NETWORK__CHAIN_ID': '11155111',
+                                     'CLI_SETTINGS_RPC__CACHE__ENABLED': 'false',
+                                     'CLI_SETTINGS_RPC__DAEMON__SOCKET': '/tmp/cli.sock'}):
+            config = read_settings(self.path)
+            self.assertEqual(config['network'], {'chain_id': 11155111, 'name': 'Holesky'})
+            self.assertEqual(config['rpc']['cache'], {'enabled': False})
+            self.assertEqual(config['rpc']['daemon'], {'socket': '/tmp/cli.sock'})
+            self.assertEqual(load_settings(self.path).network.chain_id, 11155111)
+        self.assertEqual(read_settings(self.path)['network']['chain_id'], 17000)
+        self.assertEqual(json.loads(self.path.read_text())['network']['chain_id'], 17000)
+
+    def test_atomic_write(self):
+        """Test that files are replaced whole, readable by their owner only, without leftovers."""
+        target = Path(self.tmp.name) / 'state' / 'default.txt'
+        atomic_write(target, ADDRESS)
+        atomic_write(target, ADDRESS.upper())
+        self.assertEqual(target.read_text(), ADDRESS.upper())
+        self.assertEqual(stat.S_IMODE(target.stat().st_mode), 0o600)
+        self.assertEqual(os.listdir(target.parent), ['default.txt'])
+
+    def test_default_wallet_is_state_not_settings(self):
+        """Test that choosing the default wallet writes its state file and leaves settings.json alone."""
+        wallet_dir = Path(self.tmp.name) / 'wallets'
+        wallet_dir.mkdir()
+        (wallet_dir / f"{ADDRESS}.json").write_text('{}')
+        before = self.path.read_bytes(), self.path.stat().st_mtime_ns
+        with patch('src.wallet.CONFIG_PATH', self.path):
+            manager = WalletManager(wallet_dir=wallet_dir)
+            self.assertIsNone(manager.get_default_wallet())
+            manager.set_default_wallet(ADDRESS)
+            self.assertEqual(manager.get_default_wallet(), ADDRESS)
+            self.assertEqual(manager.config['network']['chain_id'], 17000)
+        self.assertEqual((self.path.read_bytes(), self.path.stat().st_mtime_ns), before)
+        self.assertEqual((wallet_dir / 'default.txt').read_text(), ADDRESS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import threading
+import unittest
+
+from src.single_flight import SingleFlight, flight_key
+from tests.helpers import wait_for
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_flight_key_is_canonical(self):
+        """Test that key order inside params does not change the key."""
+        self.assertEqual(flight_key('eth_call', [{'to': '0x1', 'data': '0x'}, 'latest']),
+                         flight_key('eth_call', [{'data': '0x', 'to': '0x1'}, 'latest']))
+        self.assertNotEqual(flight_key('eth_getBalance', ['0x1', 'latest']),
+                            flight_key('eth_getBalance', ['0x2', 'latest']))
+
+    def _run_concurrently(self, flight, func, callers):
+        started = threading.Event()
+        outcomes = []
+
+        def leader_func():
+            started.set()
+            return func()
+
+        def call(leader):
+            try:
+                outcomes.append(flight.do('key', leader_func if leader else func))
+            except Exception as e:
+                outcomes.append(e)
+
+        leader = threading.Thread(target=call, args=(True,))
+        leader.start()
+        started.wait(5)
+        waiters = [threading.Thread(target=call, args=(False,)) for _ in range(callers - 1)]
+        for thread in waiters:
+            thread.start()
+        return leader, waiters, outcomes
+
+    def test_waiters_share_the_result(self):
+        """Test that callers arriving during a flight get its result without running func."""
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+
+        def func():
+            runs.append(1)
+            release.wait(5)
+            return 'result'
+
+        leader, waiters, outcomes = self._run_concurrently(flight, func, 5)
+        wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join()
+        self.assertEqual(outcomes, ['result'] * 5)
+        self.assertEqual(len(runs), 1)
+
+    def test_waiters_share_the_error(self):
+        """Test that an error of the shared call is raised to every caller."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise ConnectionError("down")
+
+        leader, waiters, outcomes = self._run_concurrently(flight, func, 3)
+        wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join()
+        self.assertEqual(len(outcomes), 3)
+        self.assertTrue(all(isinstance(outcome, ConnectionError) for outcome in outcomes))
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test that a finished flight is not reused."""
+        flight = SingleFlight()
+        results = iter([1, 2])
+        self.assertEqual(flight.do('key', lambda: next(results)), 1)
+        self.assertEqual(flight.do('key', lambda: next(results)), 2)
+        self.assertEqual(flight.coalesced, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -89,6 +89,13 @@ class TestTransactionManager(unittest.TestCase):
         self.mock_rpc_instance.get_balance.return_value = 2000000000000000000  # 2 ETH in wei
         self.mock_rpc_instance.get_gas_price.return_value = 1.0  # 1 Gwei
         self.mock_rpc_instance.estimate_gas.return_value = 21000
+        self.mock_rpc_instance.prepare_transaction.return_value = {
+            'balance': 2000000000000000000,  # 2 ETH in wei
+            'nonce': 5,
+            'chain_id': 11155111,
+            'gas_price': 1000000000,  # 1 Gwei in wei
+            'gas': 21000
+        }
         self.mock_rpc_instance.send_raw_transaction.return_value = "0x" + "1" * 64
         self.mock_rpc_instance.get_transaction_status.return_value = {
             'status': 'success',
@@ -217,7 +224,7 @@ class TestTransactionManager(unittest.TestCase):
 
     def test_build_transaction_insufficient_balance(self):
         """Test transaction building failure due to insufficient balance."""
-        self.mock_rpc_instance.get_balance.return_value = 500000000000000000
+        self.mock_rpc_instance.prepare_transaction.return_value['balance'] = 500000000000000000
         with self.assertRaises(ValueError) as cm:
             self.manager._build_transaction(
                 from_address="0x1234567890123456789012345678901234567890",
@@ -228,6 +235,7 @@ class TestTransactionManager(unittest.TestCase):
 
     def test_build_transaction_nonce_failure(self):
         """Test transaction building failure due to nonce fetch error."""
+        self.mock_rpc_instance.prepare_transaction.return_value['nonce'] = None
         self.mock_rpc_instance.get_nonce.side_effect = ValueError("Nonce error")
         with self.assertRaises(ValueError) as cm:
             self.manager._build_transaction(
@@ -239,7 +247,7 @@ class TestTransactionManager(unittest.TestCase):
 
     def test_build_transaction_gas_estimation_failure(self):
         """Test transaction building with fallback gas limit on estimation failure."""
-        self.mock_rpc_instance.estimate_gas.side_effect = ValueError("Gas estimation error")
+        self.mock_rpc_instance.prepare_transaction.return_value['gas'] = None
         tx = self.manager._build_transaction(
             from_address="0x1234567890123456789012345678901234567890",
             to_address="0x0987654321098765432109876543210987654321",
@@ -247,6 +255,18 @@ class TestTransactionManager(unittest.TestCase):
         )
         self.assertEqual(tx['gas'], 21000)
 
+    def test_build_transaction_nonce_fallback(self):
+        """Test transaction building refetches the nonce when the batch could not answer it."""
+        self.mock_rpc_instance.prepare_transaction.return_value['nonce'] = None
+        self.mock_rpc_instance.get_nonce.return_value = 7
+        tx = self.manager._build_transaction(
+            from_address="0x1234567890123456789012345678901234567890",
+            to_address="0x0987654321098765432109876543210987654321",
+            value_ether=1.0
+        )
+        self.assertEqual(tx['nonce'], 7)
+        self.mock_rpc_instance.prepare_transaction.assert_called_once()
+
     def test_sign_transaction_success(self):
         """Test successful transaction signing with valid inputs."""
         transaction = {
@@ -259,7 +279,7 @@ class TestTransactionManager(unittest.TestCase):
             'data': b''
         }
         private_key = "0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
-        with patch('src.transaction.Account') as mock_account:
+        with patch('eth_account.Account') as mock_account:
             mock_account.from_key.return_value.address = "0x1234567890123456789012345678901234567890"
             mock_account.sign_transaction.return_value = MagicMock(v=27, r=123, s=456)
             mock_account.recover_transaction.return_value = "0x1234567890123456789012345678901234567890"
@@ -307,7 +327,7 @@ class TestTransactionManager(unittest.TestCase):
             'chainId': 11155111,
             'data': b''
         }
-        with patch('src.transaction.Account') as mock_account:
+        with patch('eth_account.Account') as mock_account:
             mock_account.from_key.return_value.address = "0x1234567890123456789012345678901234567890"
             mock_account.sign_transaction.return_value = MagicMock(v=27, r=123, s=456)
             mock_account.recover_transaction.return_value = "0x0987654321098765432109876543210987654321"
@@ -324,6 +344,9 @@ class TestTransactionManager(unittest.TestCase):
             password="password"
         )
         self.assertEqual(tx_hash, "0x" + "1" * 64)
+        # The key lookup skips the balance, which the batched build fetches anyway
+        self.mock_wallet_instance.get_wallet_info.assert_called_once_with(
+            "0x1234567890123456789012345678901234567890", "password", include_balance=False)
 
     def test_send_transaction_invalid_wallet(self):
         """Test transaction sending failure due to invalid wallet password."""
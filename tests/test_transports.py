@@ -0,0 +1,207 @@
+import base64
+import hashlib
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from src.rate_limiter import NullRateLimiter
+from src.rpc_client import RPCClient
+from src.transports import HTTPTransport, IPCTransport, WebSocketTransport, is_ipc_url, transport_for
+
+RESULTS = {'eth_chainId': '0xaa36a7', 'eth_blockNumber': '0x10', 'eth_getBalance': '0xde0b6b3a7640000'}
+
+
+def _answer(request):
+    if isinstance(request, list):
+        return [_answer(item) for item in request]
+    return {"jsonrpc": "2.0", "id": request['id'], "result": RESULTS.get(request['method'])}
+
+
+class IPCHandler(socketserver.BaseRequestHandler):
+    """geth-style IPC: unframed JSON values in both directions."""
+
+    def handle(self):
+        self.server.connections += 1
+        decoder = json.JSONDecoder()
+        buffer = ''
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk.decode()
+            try:
+                request, end = decoder.raw_decode(buffer.lstrip())
+            except ValueError:
+                continue
+            buffer = ''
+            if self.server.drop_requests > 0:
+                self.server.drop_requests -= 1
+                return
+            # Send the answer in two writes to exercise reassembly
+            data = (json.dumps(_answer(request)) + "\n").encode()
+            self.request.sendall(data[:5])
+            self.request.sendall(data[5:])
+
+
+class WebSocketHandler(socketserver.BaseRequestHandler):
+    """Minimal RFC 6455 server: answers each text message, fragmented and preceded by a ping."""
+
+    def _recv_exact(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise ConnectionResetError
+            data += chunk
+        return data
+
+    def _send_frame(self, opcode, payload, fin=True):
+        header = bytes([(0x80 if fin else 0) | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        else:
+            header += bytes([126]) + len(payload).to_bytes(2, 'big')
+        self.request.sendall(header + payload)
+
+    def handle(self):
+        self.server.connections += 1
+        head = b''
+        while b'\r\n\r\n' not in head:
+            head += self.request.recv(1)
+        key = [line.split(':', 1)[1].strip() for line in head.decode().split('\r\n')
+               if line.lower().startswith('sec-websocket-key')][0]
+        accept = base64.b64encode(hashlib.sha1((key + '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode()).digest())
+        self.request.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                             b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        try:
+            while True:
+                first, second = self._recv_exact(2)
+                size = second & 0x7F
+                if size == 126:
+                    size = int.from_bytes(self._recv_exact(2), 'big')
+                elif size == 127:
+                    size = int.from_bytes(self._recv_exact(8), 'big')
+                mask = self._recv_exact(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(size)))
+                opcode = first & 0x0F
+                if opcode == 0x8:
+                    return
+                if opcode == 0xA:
+                    self.server.pongs += 1
+                    continue
+                self._send_frame(0x9, b'ping')
+                data = json.dumps(_answer(json.loads(payload))).encode()
+                self._send_frame(0x1, data[:10], fin=False)
+                self._send_frame(0x0, data[10:])
+        except ConnectionResetError:
+            return
+
+
+class UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    connections = 0
+    drop_requests = 0
+
+
+class TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    connections = 0
+    pongs = 0
+
+
+class TestTransportSelection(unittest.TestCase):
+    def test_scheme_picks_transport(self):
+        """Test that the URL scheme selects the transport."""
+        session = requests.Session()
+        self.assertIsInstance(transport_for("https://node.example", session, {}), HTTPTransport)
+        self.assertIsInstance(transport_for("mock-rpc-url", session, {}), HTTPTransport)
+        self.assertIsInstance(transport_for("wss://node.example/ws", session, {}), WebSocketTransport)
+        self.assertIsInstance(transport_for("ipc:///tmp/geth.ipc", session, {}), IPCTransport)
+        self.assertIsInstance(transport_for("/tmp/geth.ipc", session, {}), IPCTransport)
+        self.assertEqual(transport_for("ipc:///tmp/geth.ipc", session, {}).path, "/tmp/geth.ipc")
+        with self.assertRaises(ValueError):
+            transport_for("ftp://node.example", session, {})
+
+    def test_missing_url_is_not_ipc(self):
+        """Test that an empty or missing URL is not taken for a socket path."""
+        self.assertFalse(is_ipc_url(None))
+        self.assertFalse(is_ipc_url(''))
+
+
+class TestIPCTransport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'geth.ipc')
+        self.server = UnixServer(self.path, IPCHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = RPCClient(rpc_url=f"ipc://{self.path}", chain_id=11155111, rate_limiter=NullRateLimiter())
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_calls_reuse_one_connection(self):
+        """Test single calls (including the lazy chain ID check) over one persistent socket."""
+        self.assertEqual(self.client.get_block_number(), 0x10)
+        self.assertEqual(self.client.get_balance("0x1234567890123456789012345678901234567890", 'wei'), 10 ** 18)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_batch(self):
+        """Test that batches travel over IPC too."""
+        results = self.client.batch([('eth_blockNumber', []), ('eth_chainId', [])])
+        self.assertEqual(results, ['0x10', '0xaa36a7'])
+
+    @patch('src.rpc_client.time.sleep')
+    def test_dropped_connection_is_retried(self, mock_sleep):
+        """Test that a connection closed by the node is retried on a new one."""
+        self.client.get_chain_id()
+        self.server.drop_requests = 1
+        self.assertEqual(self.client.get_block_number(), 0x10)
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_missing_socket(self):
+        """Test that a missing socket file surfaces as a connection error."""
+        client = RPCClient(rpc_url=os.path.join(self.tmp.name, 'missing.ipc'), chain_id=11155111,
+                           rate_limiter=NullRateLimiter(), max_retries=1)
+        with self.assertRaises(ConnectionError):
+            client.get_block_number()
+        client.close()
+
+
+class TestWebSocketTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = TCPServer(('127.0.0.1', 0), WebSocketHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"ws://127.0.0.1:{self.server.server_address[1]}/"
+        self.client = RPCClient(rpc_url=url, chain_id=11155111, rate_limiter=NullRateLimiter())
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_calls_reuse_one_connection(self):
+        """Test fragmented answers and pings over one persistent WebSocket."""
+        self.assertEqual(self.client.get_block_number(), 0x10)
+        self.assertEqual(self.client.get_balance("0x1234567890123456789012345678901234567890", 'wei'), 10 ** 18)
+        self.assertEqual(self.server.connections, 1)
+        self.assertGreaterEqual(self.server.pongs, 2)
+
+    def test_batch(self):
+        """Test that batches travel over WebSocket too."""
+        results = self.client.batch([('eth_blockNumber', []), ('eth_chainId', [])])
+        self.assertEqual(results, ['0x10', '0xaa36a7'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -288,8 +288,8 @@ class TestWalletManager(unittest.TestCase):
         # Mock balance to handle multiple get_balance calls
         mock_client_instance = mock_rpc_client.return_value
         mock_client_instance.get_balance.side_effect = [
-            0.109895, 109895000000000000,  # For first get_wallet_info (with password)
-            0.109895, 109895000000000000  # For second get_wallet_info (without password)
+            109895000000000000,  # For first get_wallet_info (with password), in wei
+            109895000000000000  # For second get_wallet_info (without password), in wei
         ]
 
         # Set up a default wallet to avoid "No default wallet set" error
@@ -312,6 +312,7 @@ class TestWalletManager(unittest.TestCase):
                          f"Wallet address {info['address']} does not match {address}")
         self.assertEqual(info['balance']['ether'], 0.109895,
                          f"Balance ether {info['balance']['ether']} does not match 0.109895")
+        mock_client_instance.get_balance.assert_called_with(address, 'wei')
         self.assertIn('created_at', info, "Created_at not found in wallet info")
         self.assertFalse(info['imported'], "Wallet marked as imported")
         self.assertTrue('private_key' in info, "Private key not found")
@@ -331,10 +332,7 @@ class TestWalletManager(unittest.TestCase):
         """Test retrieving wallet info with incorrect password."""
         # Mock balance
         mock_client_instance = mock_rpc_client.return_value
-        mock_client_instance.get_balance.side_effect = [
-            0.0,  # For 'ether'
-            0     # For 'wei'
-        ]
+        mock_client_instance.get_balance.return_value = 0  # In wei
 
         # Create a wallet
         result = self.manager.generate_wallet("Parsa1382@")